@@ -0,0 +1,68 @@
+"""add recurring rules
+
+Revision ID: 30e3e1739c4c
+Revises: ee9bcbeab848
+Create Date: 2026-10-18 03:41:26.804115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '30e3e1739c4c'
+down_revision: Union[str, Sequence[str], None] = 'ee9bcbeab848'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('recurring_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('frequency', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('starts_at', sa.DateTime(), nullable=False),
+    sa.Column('until', sa.DateTime(), nullable=True),
+    sa.Column('next_index', sa.Integer(), nullable=False),
+    sa.Column('next_run', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.CheckConstraint("kind IN ('income', 'expense')", name='ck_recurring_rules_kind'),
+    sa.CheckConstraint("frequency IN ('daily', 'weekly', 'monthly', 'yearly')", name='ck_recurring_rules_frequency'),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_recurring_rules_account_id'), 'recurring_rules', ['account_id'], unique=False)
+    op.create_index(op.f('ix_recurring_rules_category_id'), 'recurring_rules', ['category_id'], unique=False)
+    op.create_index(op.f('ix_recurring_rules_next_run'), 'recurring_rules', ['next_run'], unique=False)
+    op.create_index(op.f('ix_recurring_rules_user_id'), 'recurring_rules', ['user_id'], unique=False)
+
+    op.create_table('recurring_occurrences',
+    sa.Column('rule_id', sa.Integer(), nullable=False),
+    sa.Column('date_time', sa.DateTime(), nullable=False),
+    sa.Column('tick', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['rule_id'], ['recurring_rules.id'], ),
+    sa.PrimaryKeyConstraint('rule_id', 'date_time')
+    )
+    op.create_index(op.f('ix_recurring_occurrences_tick'), 'recurring_occurrences', ['tick'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_recurring_occurrences_tick'), table_name='recurring_occurrences')
+    op.drop_table('recurring_occurrences')
+    op.drop_index(op.f('ix_recurring_rules_user_id'), table_name='recurring_rules')
+    op.drop_index(op.f('ix_recurring_rules_next_run'), table_name='recurring_rules')
+    op.drop_index(op.f('ix_recurring_rules_category_id'), table_name='recurring_rules')
+    op.drop_index(op.f('ix_recurring_rules_account_id'), table_name='recurring_rules')
+    op.drop_table('recurring_rules')
@@ -0,0 +1,55 @@
+"""add daily transaction rollup
+
+Revision ID: 56eee3423409
+Revises: 8cac1ed58c6f
+Create Date: 2026-10-18 02:46:43.271924
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '56eee3423409'
+down_revision: Union[str, Sequence[str], None] = '8cac1ed58c6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_transaction_rollup',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Numeric(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'kind', 'category_id', 'account_id')
+    )
+
+    # backfill from existing transactions, from here on TransactionService keeps it up to date
+    for table, kind in (('incomes', 'income'), ('expenses', 'expense')):
+        op.execute(f"""
+            INSERT INTO daily_transaction_rollup
+                (user_id, day, kind, category_id, account_id, total_amount, transaction_count)
+            SELECT user_id,
+                   date_time::date,
+                   '{kind}',
+                   COALESCE(category_id, 0),
+                   account_id,
+                   SUM(amount),
+                   COUNT(*)
+            FROM {table}
+            GROUP BY user_id, date_time::date, COALESCE(category_id, 0), account_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_transaction_rollup')
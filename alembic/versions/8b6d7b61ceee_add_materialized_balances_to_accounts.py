@@ -0,0 +1,41 @@
+"""add materialized balances to accounts
+
+Revision ID: 8b6d7b61ceee
+Revises: 8c0a247f9f18
+Create Date: 2026-10-18 02:27:44.343192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b6d7b61ceee'
+down_revision: Union[str, Sequence[str], None] = '8c0a247f9f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('accounts', sa.Column('current_balance', sa.Numeric(), server_default='0', nullable=False))
+    op.add_column('accounts', sa.Column('total_income', sa.Numeric(), server_default='0', nullable=False))
+    op.add_column('accounts', sa.Column('total_expense', sa.Numeric(), server_default='0', nullable=False))
+
+    # backfill from the existing transactions, from here on TransactionService keeps them up to date
+    op.execute("""
+        UPDATE accounts SET
+            total_income = COALESCE((SELECT SUM(amount) FROM incomes WHERE incomes.account_id = accounts.id), 0),
+            total_expense = COALESCE((SELECT SUM(amount) FROM expenses WHERE expenses.account_id = accounts.id), 0)
+    """)
+    op.execute("UPDATE accounts SET current_balance = initial_balance + total_income - total_expense")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('accounts', 'total_expense')
+    op.drop_column('accounts', 'total_income')
+    op.drop_column('accounts', 'current_balance')
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""add keyset pagination indexes
+
+Revision ID: 8c0a247f9f18
+Revises: f291d6138d26
+Create Date: 2026-10-18 02:25:31.179161
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c0a247f9f18'
+down_revision: Union[str, Sequence[str], None] = 'f291d6138d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_incomes_user_id_date_time_id', 'incomes', ['user_id', 'date_time', 'id'], unique=False)
+    op.create_index('ix_expenses_user_id_date_time_id', 'expenses', ['user_id', 'date_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_user_id_date_time_id', table_name='expenses')
+    op.drop_index('ix_incomes_user_id_date_time_id', table_name='incomes')
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""add monthly category spend rollup
+
+Revision ID: 8cac1ed58c6f
+Revises: 8b6d7b61ceee
+Create Date: 2026-10-18 02:33:17.186873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8cac1ed58c6f'
+down_revision: Union[str, Sequence[str], None] = '8b6d7b61ceee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monthly_category_spend',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('spent_amount', sa.Numeric(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'year', 'month', 'category_id')
+    )
+
+    # backfill from existing expenses, from here on TransactionService keeps it up to date
+    op.execute("""
+        INSERT INTO monthly_category_spend (user_id, year, month, category_id, spent_amount)
+        SELECT user_id,
+               EXTRACT(YEAR FROM date_time)::int,
+               EXTRACT(MONTH FROM date_time)::int,
+               category_id,
+               SUM(amount)
+        FROM expenses
+        WHERE category_id IS NOT NULL
+        GROUP BY user_id, EXTRACT(YEAR FROM date_time), EXTRACT(MONTH FROM date_time), category_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_category_spend')
\ No newline at end of file
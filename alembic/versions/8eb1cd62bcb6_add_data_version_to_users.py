@@ -0,0 +1,30 @@
+"""add data_version to users
+
+Revision ID: 8eb1cd62bcb6
+Revises: c80d05ee8361
+Create Date: 2026-10-18 03:14:53.478129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8eb1cd62bcb6'
+down_revision: Union[str, Sequence[str], None] = 'c80d05ee8361'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # every existing user starts at version 0, the first write moves it on
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'data_version')
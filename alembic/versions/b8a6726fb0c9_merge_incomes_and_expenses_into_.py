@@ -0,0 +1,107 @@
+"""merge incomes and expenses into transactions
+
+Revision ID: b8a6726fb0c9
+Revises: 56eee3423409
+Create Date: 2026-10-18 02:58:41.434724
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8a6726fb0c9'
+down_revision: Union[str, Sequence[str], None] = '56eee3423409'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = 'amount, category_id, description, date_time, user_id, account_id'
+# the highest id of either old table
+OLD_IDS = '''(SELECT GREATEST(
+    (SELECT COALESCE(MAX(id), 0) FROM incomes), (SELECT COALESCE(MAX(id), 0) FROM expenses)
+))'''
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('signed_amount', sa.Numeric(), sa.Computed("CASE WHEN kind = 'expense' THEN -amount ELSE amount END", persisted=True), nullable=True),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('date_time', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('legacy_id', sa.Integer(), nullable=True),
+    sa.CheckConstraint("kind IN ('income', 'expense')", name='ck_transactions_kind'),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'legacy_id')
+    )
+
+    # both kinds keep their old id in legacy_id, the API still looks them up by it. the
+    # new ids start past the highest old id of either kind, so the rows created later
+    # (known by their own id) never clash with an old one
+    op.execute(f"""
+        INSERT INTO transactions (id, legacy_id, kind, {COLUMNS})
+        SELECT id + {OLD_IDS}, id, 'income', {COLUMNS} FROM incomes
+    """)
+    op.execute(f"""
+        INSERT INTO transactions (id, legacy_id, kind, {COLUMNS})
+        SELECT id + 2 * {OLD_IDS}, id, 'expense', {COLUMNS} FROM expenses
+    """)
+    op.execute("""
+        SELECT setval(pg_get_serial_sequence('transactions', 'id'),
+                      COALESCE((SELECT MAX(id) FROM transactions), 0) + 1, false)
+    """)
+
+    op.create_index(op.f('ix_transactions_account_id'), 'transactions', ['account_id'], unique=False)
+    op.create_index(op.f('ix_transactions_category_id'), 'transactions', ['category_id'], unique=False)
+    op.create_index(op.f('ix_transactions_date_time'), 'transactions', ['date_time'], unique=False)
+    op.create_index(op.f('ix_transactions_user_id'), 'transactions', ['user_id'], unique=False)
+    op.create_index('ix_transactions_user_id_kind_date_time_id', 'transactions', ['user_id', 'kind', 'date_time', 'id'], unique=False)
+    op.create_index('ix_transactions_user_id_date_time_id', 'transactions', ['user_id', 'date_time', 'id'], unique=False)
+
+    op.drop_table('incomes')
+    op.drop_table('expenses')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, kind in (('incomes', 'income'), ('expenses', 'expense')):
+        op.create_table(table,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('date_time', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.execute(f"""
+            INSERT INTO {table} (id, {COLUMNS})
+            SELECT COALESCE(legacy_id, id), {COLUMNS} FROM transactions WHERE kind = '{kind}'
+        """)
+        op.execute(f"""
+            SELECT setval(pg_get_serial_sequence('{table}', 'id'),
+                          COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)
+        """)
+        op.create_index(op.f(f'ix_{table}_account_id'), table, ['account_id'], unique=False)
+        op.create_index(op.f(f'ix_{table}_category_id'), table, ['category_id'], unique=False)
+        op.create_index(op.f(f'ix_{table}_date_time'), table, ['date_time'], unique=False)
+        op.create_index(op.f(f'ix_{table}_user_id'), table, ['user_id'], unique=False)
+        op.create_index(f'ix_{table}_user_id_date_time_id', table, ['user_id', 'date_time', 'id'], unique=False)
+
+    op.drop_table('transactions')
@@ -0,0 +1,31 @@
+"""optionally partition transactions by month
+
+Revision ID: c80d05ee8361
+Revises: ccb8bb0f0d41
+Create Date: 2026-10-18 03:04:56.119958
+
+"""
+from typing import Sequence, Union
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c80d05ee8361'
+down_revision: Union[str, Sequence[str], None] = 'ccb8bb0f0d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# partitioning used to happen here behind PARTITION_TRANSACTIONS, so turning it on later
+# meant downgrading past every newer revision. it is now
+# `python -m app.commands.partition_transactions --convert` (and --unpartition), which
+# runs at any head. a table this revision already partitioned stays partitioned
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    pass
@@ -0,0 +1,45 @@
+"""composite indexes for hot query shapes
+
+Revision ID: ccb8bb0f0d41
+Revises: b8a6726fb0c9
+Create Date: 2026-10-18 03:02:41.344578
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ccb8bb0f0d41'
+down_revision: Union[str, Sequence[str], None] = 'b8a6726fb0c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # per account sums (balance, reconcile) become index only scans
+    op.create_index('ix_transactions_account_id_kind', 'transactions', ['account_id', 'kind'], unique=False, postgresql_include=['amount', 'signed_amount'])
+    op.create_index('ix_transfers_user_id_date_time_id', 'transfers', ['user_id', 'date_time', 'id'], unique=False)
+
+    # prefixes of the composite indexes, or never used without user_id in front
+    op.drop_index(op.f('ix_transactions_account_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_user_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_date_time'), table_name='transactions')
+    op.drop_index(op.f('ix_transfers_user_id'), table_name='transfers')
+    op.drop_index(op.f('ix_transfers_date_time'), table_name='transfers')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_transfers_date_time'), 'transfers', ['date_time'], unique=False)
+    op.create_index(op.f('ix_transfers_user_id'), 'transfers', ['user_id'], unique=False)
+    op.create_index(op.f('ix_transactions_date_time'), 'transactions', ['date_time'], unique=False)
+    op.create_index(op.f('ix_transactions_user_id'), 'transactions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_transactions_account_id'), 'transactions', ['account_id'], unique=False)
+
+    op.drop_index('ix_transfers_user_id_date_time_id', table_name='transfers')
+    op.drop_index('ix_transactions_account_id_kind', table_name='transactions')
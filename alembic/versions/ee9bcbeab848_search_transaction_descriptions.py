@@ -0,0 +1,71 @@
+"""search transaction descriptions
+
+Revision ID: ee9bcbeab848
+Revises: 8eb1cd62bcb6
+Create Date: 2026-10-18 03:22:07.519347
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee9bcbeab848'
+down_revision: Union[str, Sequence[str], None] = '8eb1cd62bcb6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# SQLite stand in for the PostgreSQL indexes, same statements as app.models.TRANSACTIONS_FTS_DDL
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id')",
+    "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN"
+    " INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);"
+    " END",
+    "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN"
+    " INSERT INTO transactions_fts (transactions_fts, rowid, description)"
+    " VALUES ('delete', old.id, old.description);"
+    " END",
+    "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF description ON transactions"
+    " BEGIN"
+    " INSERT INTO transactions_fts (transactions_fts, rowid, description)"
+    " VALUES ('delete', old.id, old.description);"
+    " INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);"
+    " END",
+    # index the rows already there
+    "INSERT INTO transactions_fts (transactions_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # on a partitioned transactions table both indexes cascade to every partition
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(
+            "CREATE INDEX ix_transactions_description_fts ON transactions"
+            " USING gin (to_tsvector('simple', coalesce(description, '')))"
+        )
+        op.execute(
+            'CREATE INDEX ix_transactions_description_trgm ON transactions'
+            ' USING gin (description gin_trgm_ops)'
+        )
+    else:
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # pg_trgm stays, other objects may have come to depend on it
+        op.execute('DROP INDEX ix_transactions_description_trgm')
+        op.execute('DROP INDEX ix_transactions_description_fts')
+    else:
+        for trigger in ('insert', 'delete', 'update'):
+            op.execute(f'DROP TRIGGER transactions_fts_{trigger}')
+        op.execute('DROP TABLE transactions_fts')
@@ -0,0 +1,52 @@
+"""create the tables from the models and stamp the database at the newest revision
+
+usage:
+    DATABASE_URL=sqlite:///./budget.db python -m app.commands.create_schema
+
+for local SQLite databases, the migrations only run on PostgreSQL. deployments keep
+using alembic upgrade head. a database already at an older revision is left alone
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Engine
+from sqlmodel import SQLModel
+from app import models  # for its tables, create_all needs them on SQLModel.metadata
+from app.database import SCHEMA_REVISION, engine
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+def create_schema(bind: Engine = engine) -> None:
+    """create_all then alembic stamp head, in one transaction"""
+    with bind.begin() as connection:
+        context = MigrationContext.configure(connection)
+        current = context.get_current_heads()
+        if current and current != (SCHEMA_REVISION,):
+            raise RuntimeError(
+                f"database schema is at {', '.join(current)}, run alembic upgrade head"
+            )
+
+        SQLModel.metadata.create_all(connection)
+        context.stamp(ScriptDirectory(str(ALEMBIC_DIR)), "head")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args(argv)
+
+    try:
+        create_schema()
+    except RuntimeError as e:
+        print(f"SCHEMA - {e}")
+        return 1
+
+    print(f"SCHEMA - {engine.url.render_as_string()} is at {SCHEMA_REVISION}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
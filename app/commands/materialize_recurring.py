@@ -0,0 +1,41 @@
+"""post every due recurring occurrence now, catching up on all missed periods
+
+usage:
+    python -m app.commands.materialize_recurring
+    python -m app.commands.materialize_recurring --batch-size 2000
+
+the workers' scheduler does the same on its own, this is for catching up right after
+downtime, or for running the scheduler from cron with RECURRING_SCHEDULER=false.
+safe while workers are running: occurrences are claimed once, whoever gets there first
+"""
+
+import argparse
+import sys
+from app.core.recurring_scheduler import run_tick
+from app.services.v1.recurring_service import RECURRING_BATCH_SIZE
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=RECURRING_BATCH_SIZE,
+        help="rules per tick (one transaction each)",
+    )
+    args = parser.parse_args(argv)
+
+    total_rules = total_posted = 0
+    while True:
+        rules, posted = run_tick(args.batch_size)
+        total_rules += rules
+        total_posted += posted
+        if rules < args.batch_size:
+            break
+
+    print(f"RECURRING - {total_posted} transaction(s) posted of {total_rules} rule(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""create the monthly transactions partitions for the coming months
+
+usage:
+    python -m app.commands.partition_transactions                   # PARTITION_MONTHS_AHEAD months
+    python -m app.commands.partition_transactions --months-ahead 6
+    python -m app.commands.partition_transactions --convert         # partition the table first
+    python -m app.commands.partition_transactions --unpartition     # back to a plain table
+
+PostgreSQL only. --convert and --unpartition copy the whole table in one transaction
+(writes wait) and do nothing when it already is that way. run it from cron (daily is
+plenty) once converted so a month never starts without its partition
+"""
+
+import argparse
+import sys
+from sqlmodel import Session
+from app.database import engine
+from app.services.v1 import PartitionService
+from app.services.v1.partition_service import PARTITION_MONTHS_AHEAD
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=PARTITION_MONTHS_AHEAD,
+        help="future months to keep a partition ready for",
+    )
+    conversion = parser.add_mutually_exclusive_group()
+    conversion.add_argument(
+        "--convert",
+        action="store_true",
+        help="rebuild transactions partitioned by month when it is not yet",
+    )
+    conversion.add_argument(
+        "--unpartition",
+        action="store_true",
+        help="rebuild transactions as a plain table",
+    )
+    args = parser.parse_args(argv)
+
+    with Session(engine) as session:
+        service = PartitionService(session)
+        try:
+            if args.unpartition:
+                service.convert(partitioned=False)
+                print("PARTITION - transactions is a plain table")
+                return 0
+
+            created = []
+            if args.convert:
+                created = service.convert(months_ahead=args.months_ahead)
+            created += service.ensure_months_ahead(args.months_ahead)
+        except ValueError as e:
+            print(f"PARTITION - {e}")
+            return 1
+
+        for name in created:
+            print(f"PARTITION - created {name}")
+        print(f"PARTITION - {len(created)} partition(s) created")
+
+        # rows outside every monthly partition, harmless but they skip pruning
+        unpartitioned = service.count_unpartitioned_rows()
+        if unpartitioned:
+            print(f"PARTITION - {unpartitioned} row(s) in the default partition")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
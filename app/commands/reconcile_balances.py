@@ -0,0 +1,41 @@
+"""recompute every account balance from its transactions and report drift
+
+usage:
+    python -m app.commands.reconcile_balances          # report only
+    python -m app.commands.reconcile_balances --fix    # also correct the stored balances
+"""
+
+import argparse
+import sys
+from sqlmodel import Session
+from app.database import engine
+from app.services.v1 import AccountService
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--fix", action="store_true", help="write the recomputed balances back"
+    )
+    args = parser.parse_args(argv)
+
+    with Session(engine) as session:
+        drifted = AccountService(session).reconcile_balances(fix=args.fix)
+
+        # still inside the session, --fix commits expire the loaded accounts
+        for account, stored, expected in drifted:
+            print(
+                f"BALANCE - account {account.id} ({account.name}) user {account.user_id}: "
+                f"stored {stored} expected {expected} drift {stored - expected}"
+            )
+
+    print(
+        f"BALANCE - {len(drifted)} account(s) drifted{' (fixed)' if args.fix else ''}"
+    )
+
+    # non zero exit so cron/CI can alert on drift when not fixing
+    return 1 if drifted and not args.fix else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
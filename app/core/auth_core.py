@@ -1,25 +1,62 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import ExpiredSignatureError, JWTError, jwt
 from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
 from decouple import config
-from sqlmodel import Session, select
-from app.database import get_session
+from sqlalchemy import event
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_db_session, is_write, replica_router, run_in_session
 from app.models import User
+from app.repositories.user_repository import UserRepository
+from app.core.cache import TTLCache
 
 SECRET_JWT_KEY = config("JWT_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# how long a resolved user is trusted before checking the users table again, this is also
+# the longest a deleted account can keep using its token on another worker
+PRINCIPAL_CACHE_TTL = config("PRINCIPAL_CACHE_TTL", default=60, cast=float)
+PRINCIPAL_CACHE_SIZE = config("PRINCIPAL_CACHE_SIZE", default=10_000, cast=int)
 
 # check authorization header and extract the token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 
-# creating access token for the user tied to their username then add a jwt key and expiration
-def create_access_token(username: str) -> str:
-    data = {"sub": username}
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    data["exp"] = expire
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """the authenticated user, detached from any session so it can be cached"""
+
+    id: int
+    username: str
+
+
+principal_cache: TTLCache[Principal] = TTLCache(
+    maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.delete(user_id)
+
+
+# drop the cached principal whenever the user row is renamed or deleted through the ORM
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    invalidate_principal(target.id)
+
+
+# creating access token for the user tied to their id (plus username) then add a jwt key and expiration
+def create_access_token(user_id: int, username: str) -> str:
+    data = {"sub": str(user_id), "username": username}
+    issued_at = datetime.now(timezone.utc)
+    # iat also keeps the first reads of a fresh token on the primary (see route_request)
+    data["iat"] = issued_at
+    data["exp"] = issued_at + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # imported on first use, jose pulls in its crypto backends and slows every cold start
+    from jose import jwt
+
     token = jwt.encode(data, SECRET_JWT_KEY, algorithm=ALGORITHM)
 
     return token
@@ -27,18 +64,23 @@ def create_access_token(username: str) -> str:
 
 # get current user and authenticate it verify token for validity and expiration
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)
-) -> User:
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    session: Session | AsyncSession = Depends(get_db_session),
+) -> Principal:
+    from jose import ExpiredSignatureError, JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_JWT_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
+        user_id = int(payload.get("sub"))
 
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    except (TypeError, ValueError):
+        # missing subject or a token from before ids were used as subject
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     except ExpiredSignatureError:
         raise HTTPException(
@@ -54,8 +96,15 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    statement = select(User).where(User.username == username)
-    user = session.exec(statement).first()
+    # only a verified token opens a write window, their next reads stay on the primary
+    if is_write(request):
+        replica_router.record_write(str(user_id))
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = await run_in_session(session, lambda s: UserRepository(s).get_by_id(user_id))
 
     # if user doesnt exist on database but has a valid token still reject or invalidate it (for deleted account)
     if user is None:
@@ -65,4 +114,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    principal = Principal(id=user.id, username=user.username)
+    principal_cache.set(user_id, principal)
+
+    return principal
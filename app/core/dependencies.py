@@ -1,38 +1,114 @@
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlmodel import Session
-from app.database import get_session
-from app.core.auth_core import get_current_user
-from app.models import User
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import get_db_session, run_in_session
+from app.core.auth_core import Principal, get_current_user
+from app.core.etag import VersionedResponse
+from app.repositories.user_repository import UserRepository
+from app.services.async_service import AsyncService
 from app.services.v1 import (
     AuthService,
     CategoryService,
     AccountService,
     TransactionService,
+    TransferService,
+    BudgetService,
+    ImportService,
+    ExportService,
+    BatchService,
+    ReportService,
+    RecurringService,
 )
 
-DatabaseSessionDep = Annotated[Session, Depends(get_session)]
-UserAuthenticationDep = Annotated[User, Depends(get_current_user)]
+DatabaseSessionDep = Annotated[Session | AsyncSession, Depends(get_db_session)]
+UserAuthenticationDep = Annotated[Principal, Depends(get_current_user)]
 
 
-def _get_auth_service(session: DatabaseSessionDep) -> AuthService:
-    return AuthService(session)
+# one primary key lookup, all a 304 costs besides authentication
+async def _get_versioned_response(
+    request: Request, current_user: UserAuthenticationDep, session: DatabaseSessionDep
+) -> VersionedResponse:
+    version = await run_in_session(
+        session, lambda s: UserRepository(s).get_data_version(current_user.id)
+    )
+    return VersionedResponse(request, current_user.id, version or 0)
 
 
-def _get_category_service(session: DatabaseSessionDep) -> CategoryService:
-    return CategoryService(session)
+VersionedResponseDep = Annotated[VersionedResponse, Depends(_get_versioned_response)]
 
 
-def _get_account_service(session: DatabaseSessionDep) -> AccountService:
-    return AccountService(session)
+def _get_auth_service(session: DatabaseSessionDep) -> AsyncService[AuthService]:
+    return AsyncService(AuthService, session)
 
 
-def _get_transaction_service(session: DatabaseSessionDep) -> TransactionService:
-    return TransactionService(session)
+def _get_category_service(
+    session: DatabaseSessionDep,
+) -> AsyncService[CategoryService]:
+    return AsyncService(CategoryService, session)
 
 
-# SERVICES dependencies
-AuthServiceDep = Annotated[AuthService, Depends(_get_auth_service)]
-CategoryServiceDep = Annotated[CategoryService, Depends(_get_category_service)]
-AccountServiceDep = Annotated[AccountService, Depends(_get_account_service)]
-TransactionServiceDep = Annotated[TransactionService, Depends(_get_transaction_service)]
+def _get_account_service(session: DatabaseSessionDep) -> AsyncService[AccountService]:
+    return AsyncService(AccountService, session)
+
+
+def _get_transaction_service(
+    session: DatabaseSessionDep,
+) -> AsyncService[TransactionService]:
+    return AsyncService(TransactionService, session)
+
+
+def _get_transfer_service(
+    session: DatabaseSessionDep,
+) -> AsyncService[TransferService]:
+    return AsyncService(TransferService, session)
+
+
+def _get_budget_service(session: DatabaseSessionDep) -> AsyncService[BudgetService]:
+    return AsyncService(BudgetService, session)
+
+
+def _get_import_service(session: DatabaseSessionDep) -> AsyncService[ImportService]:
+    return AsyncService(ImportService, session)
+
+
+def _get_export_service(session: DatabaseSessionDep) -> AsyncService[ExportService]:
+    return AsyncService(ExportService, session)
+
+
+def _get_batch_service(session: DatabaseSessionDep) -> AsyncService[BatchService]:
+    return AsyncService(BatchService, session)
+
+
+def _get_report_service(session: DatabaseSessionDep) -> AsyncService[ReportService]:
+    return AsyncService(ReportService, session)
+
+
+def _get_recurring_service(
+    session: DatabaseSessionDep,
+) -> AsyncService[RecurringService]:
+    return AsyncService(RecurringService, session)
+
+
+# SERVICES dependencies (methods are awaitable, see AsyncService)
+AuthServiceDep = Annotated[AsyncService[AuthService], Depends(_get_auth_service)]
+CategoryServiceDep = Annotated[
+    AsyncService[CategoryService], Depends(_get_category_service)
+]
+AccountServiceDep = Annotated[
+    AsyncService[AccountService], Depends(_get_account_service)
+]
+TransactionServiceDep = Annotated[
+    AsyncService[TransactionService], Depends(_get_transaction_service)
+]
+TransferServiceDep = Annotated[
+    AsyncService[TransferService], Depends(_get_transfer_service)
+]
+BudgetServiceDep = Annotated[AsyncService[BudgetService], Depends(_get_budget_service)]
+ImportServiceDep = Annotated[AsyncService[ImportService], Depends(_get_import_service)]
+ExportServiceDep = Annotated[AsyncService[ExportService], Depends(_get_export_service)]
+BatchServiceDep = Annotated[AsyncService[BatchService], Depends(_get_batch_service)]
+ReportServiceDep = Annotated[AsyncService[ReportService], Depends(_get_report_service)]
+RecurringServiceDep = Annotated[
+    AsyncService[RecurringService], Depends(_get_recurring_service)
+]
@@ -0,0 +1,89 @@
+from functools import lru_cache
+from typing import Any
+from decouple import config
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.core.cache import TTLCache
+
+# serialized bodies kept per worker, 0 turns the cache off (ETags and 304s still work)
+RESPONSE_CACHE_SIZE = config("RESPONSE_CACHE_SIZE", default=0, cast=int)
+# the key carries the data version so entries never go stale, the ttl only frees memory
+RESPONSE_CACHE_TTL = config("RESPONSE_CACHE_TTL", default=300, cast=float)
+
+response_cache: TTLCache[bytes] = TTLCache(
+    maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL
+)
+
+
+def make_etag(user_id: int, version: int) -> str:
+    return f'"{user_id}-{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match check, weak comparison (a W/ prefix is ignored) as the RFC asks"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+class VersionedResponse:
+    """conditional GET for a response that only changes with the user's data_version
+
+    every service write bumps users.data_version, so (user, version) is a strong ETag
+    for anything computed from the user's rows
+    """
+
+    def __init__(self, request: Request, user_id: int, version: int):
+        self.etag = make_etag(user_id, version)
+        self.key = (user_id, request.url.path, request.url.query, version)
+        self.if_none_match = request.headers.get("if-none-match")
+
+    def cached(self) -> Response | None:
+        """304 when the client copy is current, the stored body when this worker has one
+
+        None means the handler has to query and call respond(). the ETag says nothing
+        about which ids the user has, a handler for one resource checks it exists first
+        """
+        if etag_matches(self.if_none_match, self.etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=self._headers()
+            )
+
+        body = response_cache.get(self.key)
+        if body is not None:
+            return self._response(body)
+
+        return None
+
+    def respond(self, content: Any, response_model: Any = None) -> Response:
+        """serialize like FastAPI would (through response_model), remember and send it"""
+        if response_model is not None:
+            adapter = _adapter(response_model)
+            content = adapter.dump_python(
+                adapter.validate_python(content, from_attributes=True), mode="json"
+            )
+
+        body = JSONResponse(jsonable_encoder(content)).body
+        response_cache.set(self.key, body)
+
+        return self._response(body)
+
+    # PRIVATE helper methods
+    def _headers(self) -> dict[str, str]:
+        # per user data, a shared cache must not store it and clients must revalidate
+        return {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+
+    def _response(self, body: bytes) -> Response:
+        return Response(body, media_type="application/json", headers=self._headers())
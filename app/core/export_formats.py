@@ -0,0 +1,177 @@
+import csv
+import io
+import json
+from decimal import Context, Decimal
+from importlib.util import find_spec
+from typing import Iterable, Iterator
+from sqlalchemy import DateTime, Integer, Numeric
+from sqlalchemy.types import TypeEngine
+
+# every writer turns batches of rows into chunks of bytes, one chunk per batch, so
+# nothing ever holds more than one batch of the export. column_types are the SQL types
+# of the columns, the text formats write Decimals as str so they are exact regardless
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    return value.isoformat()
+
+
+def write_csv(
+    columns: tuple[str, ...],
+    batches: Iterable[list],
+    column_types: dict[str, TypeEngine] | None = None,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            ]
+            for row in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    # header only export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def write_ndjson(
+    columns: tuple[str, ...],
+    batches: Iterable[list],
+    column_types: dict[str, TypeEngine] | None = None,
+) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in batch
+        ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """write only file that hands back whatever the parquet writer wrote since last drain"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def decimal_digits(sql_type: Numeric) -> tuple[int, int]:
+    """(precision, scale) of a NUMERIC column as declared
+
+    an unbounded NUMERIC (what the models use) gets the widest decimal128 and the scale
+    SQLAlchemy reads it back with, decimal_return_scale or 10 when that is not set
+    """
+    precision = sql_type.precision or 38
+    scale = sql_type.scale
+    if scale is None:
+        scale = sql_type.decimal_return_scale or 10
+    return precision, scale
+
+
+def _parquet_type(sql_type: TypeEngine | None):
+    import pyarrow
+
+    if isinstance(sql_type, Integer):
+        return pyarrow.int64()
+    if isinstance(sql_type, DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(sql_type, Numeric):
+        precision, scale = decimal_digits(sql_type)
+        if precision > 38:
+            return pyarrow.decimal256(precision, scale)
+        return pyarrow.decimal128(precision, scale)
+    return pyarrow.string()
+
+
+def _fit_to_scale(field):
+    """rounds Decimals to the column's scale (half even), None when field is no decimal
+
+    an unbounded NUMERIC can hold more fractional digits than its parquet type, pyarrow
+    raises on those instead of rounding and the response is already streaming by then
+    """
+    import pyarrow
+
+    if not pyarrow.types.is_decimal(field.type):
+        return None
+
+    exponent = Decimal(1).scaleb(-field.type.scale)
+    context = Context(prec=field.type.precision)
+    return lambda value: (
+        value.quantize(exponent, context=context)
+        if isinstance(value, Decimal)
+        else value
+    )
+
+
+def write_parquet(
+    columns: tuple[str, ...],
+    batches: Iterable[list],
+    column_types: dict[str, TypeEngine] | None = None,
+) -> Iterator[bytes]:
+    """one row group per batch, the footer goes out last, typed from column_types"""
+    # pyarrow takes longer to import than the rest of the app, only parquet exports pay it
+    import pyarrow
+    import pyarrow.parquet
+
+    column_types = column_types or {}
+    schema = pyarrow.schema(
+        [(column, _parquet_type(column_types.get(column))) for column in columns]
+    )
+
+    fits = [_fit_to_scale(field) for field in schema]
+
+    sink = _ChunkSink()
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            table = pyarrow.Table.from_arrays(
+                [
+                    pyarrow.array(
+                        [fit(row[index]) if fit else row[index] for row in batch],
+                        type=field.type,
+                    )
+                    for index, (field, fit) in enumerate(zip(schema, fits))
+                ],
+                schema=schema,
+            )
+            writer.write_table(table)
+            yield sink.drain()
+
+    yield sink.drain()
+
+
+# format -> (writer, media type)
+EXPORT_FORMATS = {
+    "csv": (write_csv, "text/csv"),
+    "ndjson": (write_ndjson, "application/x-ndjson"),
+    "parquet": (write_parquet, "application/vnd.apache.parquet"),
+}
+
+
+# parquet is optional, the export endpoint answers 501 for it without pyarrow
+def parquet_available() -> bool:
+    return find_spec("pyarrow") is not None
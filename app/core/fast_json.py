@@ -0,0 +1,15 @@
+from typing import Any
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def json_rows_response(
+    rows: list[dict[str, Any]], headers: dict[str, str] | None = None
+) -> Response:
+    """a JSON list of rows built from trusted database values, no per row model
+
+    pydantic-core encodes them with the same serializer a response_model uses, so
+    Decimal (as a string) and datetime (ISO 8601, UTC as Z) come out byte for byte
+    the same, without building and validating a model per row and again on the way out
+    """
+    return Response(to_json(rows), media_type="application/json", headers=headers)
@@ -0,0 +1,267 @@
+import asyncio
+import time
+from bisect import bisect_left
+from decouple import config
+from prometheus_client import REGISTRY, Gauge, Histogram
+from prometheus_client.core import (
+    CounterMetricFamily,
+    GaugeMetricFamily,
+    HistogramMetricFamily,
+)
+from prometheus_client.registry import Collector
+from prometheus_client.utils import floatToGoString
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.password_core import queue_depth
+from app.database import (
+    DB_N_PLUS_ONE_THRESHOLD,
+    RequestQueries,
+    pool_stats,
+    request_queries,
+)
+
+# seconds between two event loop lag samples
+EVENT_LOOP_LAG_INTERVAL = config("EVENT_LOOP_LAG_INTERVAL", default=0.5, cast=float)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+DB_SECONDS_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up a sleeping task, blocking calls make it grow",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds", "The latest event loop lag sample"
+)
+
+
+def route_label(scope: Scope) -> str:
+    """the route template (/api/v1/expenses/{expense_id}), never the raw path"""
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def server_timing(queries: RequestQueries) -> str:
+    return (
+        f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} statements",'
+        f" db-slowest;dur={queries.slowest_seconds * 1000:.2f}"
+    )
+
+
+class RouteHistogram:
+    """bucket counts and a sum, observed from the event loop thread only so no lock
+
+    prometheus_client histograms lock and look up their labels on every observe, that
+    alone cost tens of microseconds per request. these are turned into metric families
+    when /metrics is scraped
+    """
+
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # one count per bucket plus +Inf, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            result.append((floatToGoString(bound), total))
+        return result
+
+
+class RouteStats:
+    __slots__ = ("seconds", "size", "statements", "db_seconds", "n_plus_one")
+
+    def __init__(self):
+        self.seconds = RouteHistogram(DURATION_BUCKETS)
+        self.size = RouteHistogram(SIZE_BUCKETS)
+        self.statements = RouteHistogram(STATEMENT_BUCKETS)
+        self.db_seconds = RouteHistogram(DB_SECONDS_BUCKETS)
+        self.n_plus_one = 0
+
+
+# (method, route template) -> numbers of its requests
+route_stats: dict[tuple[str, str], RouteStats] = {}
+requests_in_flight = 0
+
+
+class MetricsMiddleware:
+    """latency, response size, in flight count and the SQL of every request
+
+    the SQL numbers go back as a Server-Timing header too, and repeated statements
+    (probable N+1s) are printed. statements of a streamed body run after the headers
+    left, they only show up in the histograms. everything is observed once per request
+    after the last byte, the per message work is a type check and a length
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global requests_in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        queries = RequestQueries()
+        token = request_queries.set(queries)
+        size = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", server_timing(queries).encode("latin-1")),
+                ]
+            await send(message)
+
+        requests_in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            requests_in_flight -= 1
+            request_queries.reset(token)
+            self._observe(scope, queries, time.perf_counter() - started, size)
+
+    # PRIVATE helper methods
+    def _observe(
+        self, scope: Scope, queries: RequestQueries, seconds: float, size: int
+    ) -> None:
+        key = (scope["method"], route_label(scope))
+        stats = route_stats.get(key)
+        if stats is None:
+            stats = route_stats[key] = RouteStats()
+        stats.seconds.observe(seconds)
+        stats.size.observe(size)
+        stats.statements.observe(queries.count)
+        stats.db_seconds.observe(queries.seconds)
+
+        # only worth looking for repeats once a request sent that many statements
+        if queries.count < DB_N_PLUS_ONE_THRESHOLD:
+            return
+        repeated = queries.repeated(DB_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            stats.n_plus_one += 1
+        for statement, count in repeated:
+            print(
+                f"SQL - probable N+1 on {key[0]} {key[1]}: {count} x"
+                f" {' '.join(statement.split())}"
+            )
+
+
+class ScrapeTimeCollector(Collector):
+    """the request numbers above, connection pool and bcrypt pool, read when scraped"""
+
+    def collect(self):
+        yield from self._route_families()
+        yield GaugeMetricFamily(
+            "http_requests_in_flight",
+            "Requests being served right now",
+            value=requests_in_flight,
+        )
+        stats = pool_stats()
+        yield CounterMetricFamily(
+            "db_pool_checkouts",
+            "Connections handed out by the pool",
+            value=stats["checkouts"],
+        )
+        yield CounterMetricFamily(
+            "db_pool_checkout_wait_seconds",
+            "Time spent waiting for a pool connection",
+            value=stats["checkout_wait_seconds"],
+        )
+        yield GaugeMetricFamily(
+            "db_pool_checkout_max_wait_seconds",
+            "Longest wait for a pool connection",
+            value=stats["checkout_max_wait_seconds"],
+        )
+        for name in ("size", "checked_out", "checked_in", "overflow"):
+            if name in stats:
+                yield GaugeMetricFamily(
+                    f"db_pool_{name}", f"Connection pool {name}", value=stats[name]
+                )
+        yield GaugeMetricFamily(
+            "password_hash_queue_depth",
+            "Password hashes running or waiting for a bcrypt thread",
+            value=queue_depth(),
+        )
+
+    # PRIVATE helper methods
+    def _route_families(self):
+        families = {
+            "seconds": HistogramMetricFamily(
+                "http_request_duration_seconds",
+                "Time from the request arriving to the last body byte sent",
+                labels=["method", "route"],
+            ),
+            "size": HistogramMetricFamily(
+                "http_response_size_bytes",
+                "Response body size",
+                labels=["method", "route"],
+            ),
+            "statements": HistogramMetricFamily(
+                "http_request_db_statements",
+                "SQL statements sent per request",
+                labels=["method", "route"],
+            ),
+            "db_seconds": HistogramMetricFamily(
+                "http_request_db_seconds",
+                "Time spent in SQL statements per request",
+                labels=["method", "route"],
+            ),
+        }
+        n_plus_one = CounterMetricFamily(
+            "http_request_db_n_plus_one",
+            "Requests that sent one statement DB_N_PLUS_ONE_THRESHOLD times or more",
+            labels=["method", "route"],
+        )
+        # a copy, a request may add a route while the families are built
+        for labels, stats in list(route_stats.items()):
+            for name, family in families.items():
+                histogram = getattr(stats, name)
+                family.add_metric(labels, histogram.cumulative(), histogram.sum)
+            n_plus_one.add_metric(labels, stats.n_plus_one)
+        yield from families.values()
+        yield n_plus_one
+
+
+REGISTRY.register(ScrapeTimeCollector())
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL) -> None:
+    """sleep interval and record how much later than asked the loop woke us up
+
+    a sync DB call or bcrypt hash running on the loop shows up here as lag
+    """
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(time.perf_counter() - started - interval, 0.0)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+from decouple import config
+
+DEFAULT_PAGE_SIZE = config("DEFAULT_PAGE_SIZE", default=50, cast=int)
+MAX_PAGE_SIZE = config("MAX_PAGE_SIZE", default=500, cast=int)
+
+
+# cursors are opaque to clients, it is just the (date_time, id) of the last row they saw
+def encode_cursor(date_time: datetime, row_id: int) -> str:
+    raw = json.dumps([date_time.isoformat(), row_id], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_time, row_id = json.loads(base64.urlsafe_b64decode(padded))
+
+        return datetime.fromisoformat(date_time), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+# search pages are ordered by rank first, their cursor carries it in front
+def encode_search_cursor(rank: float, date_time: datetime, row_id: int) -> str:
+    raw = json.dumps([rank, date_time.isoformat(), row_id], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, date_time, row_id = json.loads(base64.urlsafe_b64decode(padded))
+
+        return float(rank), datetime.fromisoformat(date_time), int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import bcrypt
+from decouple import config
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+# bcrypt cost factor, changing it makes existing hashes get upgraded on the next login
+BCRYPT_ROUNDS = config("BCRYPT_ROUNDS", default=12, cast=int)
+# threads doing bcrypt work (bcrypt releases the GIL so threads run in parallel)
+PASSWORD_POOL_SIZE = config("PASSWORD_POOL_SIZE", default=2, cast=int)
+# hashes allowed to wait for a free thread before we start rejecting with 503. each login
+# takes a database connection before and after its hash, so pool + queue stays under the
+# DB pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) and anyio's 40 threadpool threads
+PASSWORD_QUEUE_LIMIT = config("PASSWORD_QUEUE_LIMIT", default=8, cast=int)
+
+_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_POOL_SIZE, thread_name_prefix="bcrypt"
+)
+_lock = threading.Lock()
+_in_flight = 0
+
+
+class PasswordHasherBusyError(Exception):
+    """too many password hashes are already queued, caller should retry later"""
+
+
+def queue_depth() -> int:
+    """hashes submitted but not finished yet (running + waiting)"""
+    return _in_flight
+
+
+def _release(_: Future) -> None:
+    global _in_flight
+    with _lock:
+        _in_flight -= 1
+
+
+def _submit(fn, *args) -> Future:
+    global _in_flight
+    with _lock:
+        if _in_flight >= PASSWORD_POOL_SIZE + PASSWORD_QUEUE_LIMIT:
+            raise PasswordHasherBusyError("Server is busy, please try again shortly")
+        _in_flight += 1
+
+    future = _executor.submit(fn, *args)
+    future.add_done_callback(_release)
+
+    return future
+
+
+def _run_in_pool(fn, *args):
+    future = _submit(fn, *args)
+
+    # inside AsyncSession.run_sync we are on the event loop (in a greenlet) so await the
+    # future there, otherwise we are already on a threadpool worker and can just block
+    if in_greenlet():
+        return await_only(asyncio.wrap_future(future))
+
+    return future.result()
+
+
+async def _await_in_pool(fn, *args):
+    return await asyncio.wrap_future(_submit(fn, *args))
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def hash_password(password: str) -> str:
+    hashed = _run_in_pool(_hash, password.encode("utf-8"), BCRYPT_ROUNDS)
+
+    return hashed.decode("utf-8")
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    return _run_in_pool(
+        bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8")
+    )
+
+
+# the router side ones, awaited on the event loop with no session open: a request waiting
+# for bcrypt holds neither a database connection nor a threadpool thread
+async def hash_password_async(password: str) -> str:
+    hashed = await _await_in_pool(_hash, password.encode("utf-8"), BCRYPT_ROUNDS)
+
+    return hashed.decode("utf-8")
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await _await_in_pool(
+        bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8")
+    )
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """true when the hash was made with a different cost than BCRYPT_ROUNDS"""
+    # bcrypt hashes look like $2b$12$<salt+hash>, the second field is the cost
+    try:
+        rounds = int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+
+    return rounds != BCRYPT_ROUNDS
@@ -0,0 +1,60 @@
+import calendar
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+# RRULE FREQ values a recurring rule accepts, INTERVAL is the rule's interval
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+
+def utc_naive(date_time: datetime) -> datetime:
+    """the UTC wall time, the form rule times are stored and compared in"""
+    if date_time.tzinfo is not None:
+        date_time = date_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return date_time
+
+
+def _add_months(date_time: datetime, months: int) -> datetime:
+    index = date_time.year * 12 + date_time.month - 1 + months
+    year, month = index // 12, index % 12 + 1
+    day = min(date_time.day, calendar.monthrange(year, month)[1])
+    return date_time.replace(year=year, month=month, day=day)
+
+
+def occurrence(
+    starts_at: datetime, frequency: str, interval: int, index: int
+) -> datetime:
+    """the index-th occurrence, 0 is starts_at itself
+
+    always counted from starts_at, so a rule on the 31st is back on the 31st after a
+    short month. unlike RFC 5545, which skips months without that day, the day is
+    clamped to the last day of the month (rent due on the 31st still posts in February)
+    """
+    steps = index * interval
+    if frequency == "daily":
+        return starts_at + timedelta(days=steps)
+    if frequency == "weekly":
+        return starts_at + timedelta(weeks=steps)
+    if frequency == "monthly":
+        return _add_months(starts_at, steps)
+    if frequency == "yearly":
+        return _add_months(starts_at, 12 * steps)
+    raise ValueError(f"Frequency must be one of {', '.join(FREQUENCIES)}")
+
+
+def due_occurrences(
+    starts_at: datetime,
+    frequency: str,
+    interval: int,
+    first_index: int,
+    now: datetime,
+    until: datetime | None = None,
+    limit: int | None = None,
+) -> Iterator[tuple[int, datetime]]:
+    """(index, date_time) from first_index on, up to now and until, at most limit of them"""
+    index = first_index
+    while limit is None or index - first_index < limit:
+        date_time = occurrence(starts_at, frequency, interval, index)
+        if date_time > now or (until is not None and date_time > until):
+            return
+        yield index, date_time
+        index += 1
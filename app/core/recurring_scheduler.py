@@ -0,0 +1,43 @@
+import asyncio
+from decouple import config
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+from app.database import engine
+from app.services.v1 import RecurringService
+from app.services.v1.recurring_service import RECURRING_BATCH_SIZE
+
+# every worker runs one, they split the due rules between them (see RecurringService)
+RECURRING_SCHEDULER = config("RECURRING_SCHEDULER", default=True, cast=bool)
+# seconds between two ticks while nothing is left to catch up
+RECURRING_TICK_SECONDS = config("RECURRING_TICK_SECONDS", default=60, cast=float)
+
+
+def run_tick(batch_size: int = RECURRING_BATCH_SIZE) -> tuple[int, int]:
+    """(rules taken, transactions posted) of one tick in its own session"""
+    with Session(engine) as session:
+        return RecurringService(session).materialize_due(batch_size=batch_size)
+
+
+async def run_recurring_scheduler(
+    interval: float = RECURRING_TICK_SECONDS, batch_size: int = RECURRING_BATCH_SIZE
+) -> None:
+    """post due recurring occurrences every interval seconds
+
+    a full batch means more rules are due (a catch up after downtime, or a rule many
+    periods behind), then the next tick follows right away. the tick runs on the
+    threadpool, the event loop only waits for it
+    """
+    while True:
+        try:
+            rules, posted = await run_in_threadpool(run_tick, batch_size)
+        except Exception as e:
+            # anything, the scheduler must outlive one bad tick. the tick rolled back,
+            # its rules are still due and the next tick retries them
+            print(f"RECURRING - tick failed: {type(e).__name__}: {e}")
+            rules = 0
+        else:
+            if posted:
+                print(f"RECURRING - posted {posted} transaction(s) of {rules} rule(s)")
+
+        if rules < batch_size:
+            await asyncio.sleep(interval)
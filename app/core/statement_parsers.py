@@ -0,0 +1,161 @@
+import csv
+import re
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator, NamedTuple
+
+
+class ParsedRow(NamedTuple):
+    """one transaction read from an uploaded statement, either data or an error for that line"""
+
+    line: int
+    data: dict | None = None
+    error: str | None = None
+
+
+# everything here reads the input line by line, nothing holds the whole file in memory
+
+
+def _parse_amount(value: str) -> Decimal:
+    try:
+        amount = Decimal(value.strip().replace(",", ""))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount {value!r}")
+    # NaN and Infinity parse fine but are no amount
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount {value!r}")
+
+    return amount
+
+
+def _signed_row(amount: Decimal, date_time: datetime, description: str | None) -> dict:
+    """bank statements sign the amount, negative means money out"""
+    return {
+        "type": "expense" if amount < 0 else "income",
+        "amount": abs(amount),
+        "date_time": date_time,
+        "description": description or None,
+    }
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    """header row required, columns: amount, date_time and optionally type, description,
+    category_id, account_id. without a type column the sign of amount decides"""
+    reader = csv.DictReader(lines)
+
+    for row in reader:
+        line = reader.line_num
+        try:
+            amount = _parse_amount(row.get("amount") or "")
+            date_time = datetime.fromisoformat((row.get("date_time") or "").strip())
+            transaction_type = (row.get("type") or "").strip().lower()
+
+            if transaction_type:
+                if transaction_type not in ("income", "expense"):
+                    raise ValueError(f"Invalid type {transaction_type!r}")
+                data = {
+                    "type": transaction_type,
+                    "amount": amount,
+                    "date_time": date_time,
+                    "description": row.get("description") or None,
+                }
+            else:
+                data = _signed_row(amount, date_time, row.get("description"))
+
+            for key in ("category_id", "account_id"):
+                value = (row.get(key) or "").strip()
+                data[key] = int(value) if value else None
+
+        except ValueError as e:
+            yield ParsedRow(line, error=str(e))
+            continue
+
+        yield ParsedRow(line, data=data)
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+def _parse_ofx_date(value: str) -> datetime:
+    # YYYYMMDD[HHMMSS[.XXX]][[+-]offset:TZ], we keep the wall clock part as UTC
+    digits = re.match(r"\d+", value.strip())
+    if digits is None or len(digits.group()) < 8:
+        raise ValueError(f"Invalid date {value!r}")
+
+    stamp = digits.group().ljust(14, "0")[:14]
+
+    return datetime.strptime(stamp, "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+
+
+def parse_ofx(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    """reads the <STMTTRN> blocks of an OFX 1.x (SGML) or 2.x (XML) statement"""
+    current: dict | None = None
+    start_line = 0
+
+    for line_number, line in enumerate(lines, start=1):
+        for closing, tag, value in _OFX_TAG.findall(line):
+            tag = tag.upper()
+
+            if tag == "STMTTRN" and not closing:
+                current, start_line = {}, line_number
+            elif tag == "STMTTRN" and closing and current is not None:
+                try:
+                    amount = _parse_amount(current.get("TRNAMT", ""))
+                    date_time = _parse_ofx_date(current.get("DTPOSTED", ""))
+                except ValueError as e:
+                    yield ParsedRow(start_line, error=str(e))
+                else:
+                    description = current.get("NAME") or current.get("MEMO")
+                    yield ParsedRow(
+                        start_line, data=_signed_row(amount, date_time, description)
+                    )
+                current = None
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+def _parse_qif_date(value: str) -> datetime:
+    # QIF dates are M/D/YYYY or M/D'YY depending on the exporter
+    value = value.strip().replace("'", "/").replace(" ", "")
+    for date_format in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+
+    raise ValueError(f"Invalid date {value!r}")
+
+
+def parse_qif(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    """reads QIF bank records, one field per line and ^ ends the record"""
+    current: dict = {}
+    start_line = 1
+
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+
+        code, value = line[0], line[1:]
+
+        if code != "^":
+            if not current:
+                start_line = line_number
+            current[code] = value
+            continue
+
+        try:
+            amount = _parse_amount(current.get("T") or current.get("U") or "")
+            date_time = _parse_qif_date(current.get("D", ""))
+        except ValueError as e:
+            yield ParsedRow(start_line, error=str(e))
+        else:
+            description = current.get("P") or current.get("M")
+            yield ParsedRow(
+                start_line, data=_signed_row(amount, date_time, description)
+            )
+
+        current = {}
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qif": parse_qif}
@@ -1,10 +1,559 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from uuid import uuid4
+from fastapi import Request
 from sqlmodel import create_engine, Session
-from decouple import config
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
+from decouple import Csv, config
 
-engine = create_engine(config("DATABASE_URL"))
+DATABASE_URL = config("DATABASE_URL")
+# serve requests through the async drivers (asyncpg / aiosqlite) instead of psycopg2
+DATABASE_ASYNC = config("DATABASE_ASYNC", default=False, cast=bool)
+
+# connection pool, per worker process (the async engine gets its own pool of the same size)
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+# seconds a request waits for a free connection before failing
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=30, cast=float)
+# seconds before a connection is replaced, -1 keeps them forever
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=1800, cast=int)
+# test each connection on checkout so connections killed by a failover are replaced
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=True, cast=bool)
+# PostgreSQL statement_timeout in milliseconds, 0 means no limit
+DB_STATEMENT_TIMEOUT_MS = config("DB_STATEMENT_TIMEOUT_MS", default=0, cast=int)
+# DATABASE_URL points at PgBouncer in transaction pooling mode
+DB_PGBOUNCER = config("DB_PGBOUNCER", default=False, cast=bool)
+
+# statements slower than this (milliseconds) are printed, 0 turns it off
+DB_SLOW_STATEMENT_MS = config("DB_SLOW_STATEMENT_MS", default=500, cast=float)
+# the same statement this many times in one request is reported as a probable N+1
+DB_N_PLUS_ONE_THRESHOLD = config("DB_N_PLUS_ONE_THRESHOLD", default=5, cast=int)
+
+# comma separated read replica URLs for GET/HEAD requests, empty sends every query to the primary
+DATABASE_REPLICA_URLS = config("DATABASE_REPLICA_URLS", default="", cast=Csv())
+# a replica further behind than this (seconds) is skipped until it catches up
+DB_REPLICA_MAX_LAG_SECONDS = config("DB_REPLICA_MAX_LAG_SECONDS", default=5, cast=float)
+# seconds between two health/lag checks of every replica
+DB_REPLICA_CHECK_INTERVAL = config("DB_REPLICA_CHECK_INTERVAL", default=5, cast=float)
+
+# compare the database's alembic revision with SCHEMA_REVISION when a worker starts
+DB_SCHEMA_CHECK = config("DB_SCHEMA_CHECK", default=True, cast=bool)
+
+# the newest alembic revision, the schema this code is written against. a test keeps it
+# equal to the head of alembic/versions, so a new migration has to bump it
+SCHEMA_REVISION = "30e3e1739c4c"
+
+# sync driver -> async driver used when DATABASE_ASYNC is on
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+_wait_lock = threading.Lock()
+_checkouts = 0
+_wait_seconds = 0.0
+_max_wait_seconds = 0.0
+
+
+def _record_wait(seconds: float) -> None:
+    global _checkouts, _wait_seconds, _max_wait_seconds
+    with _wait_lock:
+        _checkouts += 1
+        _wait_seconds += seconds
+        _max_wait_seconds = max(_max_wait_seconds, seconds)
+
+
+class _TimedCheckout:
+    """times every checkout, waiting for a free slot and opening a new connection included"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _record_wait(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine/create_async_engine keyword arguments from the DB_* settings"""
+    parsed = make_url(url)
+    # an in-memory SQLite database lives in its one connection, keep SQLAlchemy's pool
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    ):
+        return {}
+
+    options = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    if parsed.get_backend_name() != "postgresql":
+        return options
+
+    connect_args = {}
+    if DB_PGBOUNCER and is_async:
+        # each transaction may land on another server connection, so asyncpg must not
+        # keep prepared statements around or reuse their names
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+    if DB_STATEMENT_TIMEOUT_MS and not DB_PGBOUNCER:
+        # set once per connection at startup, PgBouncer does not forward these
+        # (see _set_local_statement_timeout)
+        if is_async:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)
+            }
+        else:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def pool_stats() -> dict[str, float]:
+    """gauges of the pool serving requests (the async one when DATABASE_ASYNC is on)
+
+    the checkout count and wait times add up every engine of this process
+    """
+    pool = (async_engine or engine).pool
+    stats = {
+        "checkouts": _checkouts,
+        "checkout_wait_seconds": _wait_seconds,
+        "checkout_max_wait_seconds": _max_wait_seconds,
+    }
+    if isinstance(pool, QueuePool):
+        stats |= {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    return stats
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+# only built when enabled so the async drivers stay optional
+async_engine = None
+if DATABASE_ASYNC:
+    ASYNC_DATABASE_URL = config(
+        "ASYNC_DATABASE_URL", default=to_async_url(DATABASE_URL)
+    )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True)
+    )
+
+
+# 0 when the replica replayed everything it received, otherwise the age of the last replayed
+# transaction (NULL on a primary, counted as no lag)
+_REPLICATION_LAG_SQL = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    """one read replica, its engines and the outcome of the last health check"""
+
+    def __init__(self, url: str):
+        self.url = url
+        # the sync engine also runs the health checks in async mode
+        self.engine = create_engine(url, **engine_options(url))
+        self.async_engine = None
+        if DATABASE_ASYNC:
+            async_url = to_async_url(url)
+            self.async_engine = create_async_engine(
+                async_url, **engine_options(async_url, is_async=True)
+            )
+        # unknown until the first check, reads stay on the primary meanwhile
+        self.healthy = False
+        self.lag_seconds: float | None = None
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as connection:
+                lag = 0.0
+                if connection.dialect.name == "postgresql":
+                    lag = connection.exec_driver_sql(_REPLICATION_LAG_SQL).scalar()
+                self.lag_seconds = float(lag or 0)
+                self.healthy = True
+        except (SQLAlchemyError, OSError):
+            self.healthy = False
+            self.lag_seconds = None
+
+    def usable(self, max_lag_seconds: float) -> bool:
+        return self.healthy and self.lag_seconds <= max_lag_seconds
+
+
+class ReplicaRouter:
+    """round robin over the replicas that are up and not too far behind
+
+    a user who wrote recently reads from the primary until every usable replica is sure to
+    have the write: the allowed lag plus one check interval (the lag may grow in between).
+    writes are recorded by get_current_user, once the token is verified
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        max_lag_seconds: float = DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = DB_REPLICA_CHECK_INTERVAL,
+        max_writers: int = 100_000,
+    ):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.sticky_seconds = max_lag_seconds + check_interval
+        self._next = itertools.count()
+        # user id -> monotonic time of their last write, per worker process. oldest write
+        # first, so the ones whose window is over are always at the front
+        self._last_writes: OrderedDict[str, float] = OrderedDict()
+        self.max_writers = max_writers
+        self._lock = threading.Lock()
+        self._checker: threading.Thread | None = None
+
+    def start(self) -> None:
+        """run the health checks in a daemon thread, started lazily (after any fork)"""
+        if self._checker is not None or not self.replicas:
+            return
+        with self._lock:
+            if self._checker is None:
+                self._checker = threading.Thread(
+                    target=self._check_forever, name="replica-check", daemon=True
+                )
+                self._checker.start()
+
+    def _check_forever(self) -> None:
+        while True:
+            self.check()
+            time.sleep(self.check_interval)
+
+    def check(self) -> None:
+        for replica in self.replicas:
+            replica.check()
+
+    def record_write(self, user_id: str, now: float | None = None) -> None:
+        if not self.replicas:
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_writes[user_id] = now
+            self._last_writes.move_to_end(user_id)
+            # forget the users whose window is over, each one once. past max_writers the
+            # oldest go early, they just read from a replica a bit sooner
+            while self._last_writes:
+                at = next(iter(self._last_writes.values()))
+                if (
+                    now - at < self.sticky_seconds
+                    and len(self._last_writes) <= self.max_writers
+                ):
+                    break
+                self._last_writes.popitem(last=False)
+
+    def wrote_recently(self, user_id: str, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        at = self._last_writes.get(user_id)
+        return at is not None and now - at < self.sticky_seconds
+
+    def pick(self) -> Replica | None:
+        """the next usable replica, None falls back to the primary"""
+        usable = [
+            replica for replica in self.replicas if replica.usable(self.max_lag_seconds)
+        ]
+        if not usable:
+            return None
+        return usable[next(self._next) % len(usable)]
+
+
+replica_router = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+READ_METHODS = ("GET", "HEAD")
+# neither reads nor writes user data, served by the primary without opening a write window
+NEUTRAL_METHODS = ("OPTIONS",)
+
+
+def is_write(request: Request) -> bool:
+    return request.method not in READ_METHODS + NEUTRAL_METHODS
+
+
+def _token_claims(request: Request) -> dict:
+    """claims of the bearer token without checking it, get_current_user still does that
+
+    only used to route reads, a forged token gets no further than a 401 and never
+    opens a write window
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return {}
+    # jose (and its crypto backends) is only loaded once a token shows up
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.get_unverified_claims(token)
+    except JWTError:
+        return {}
+
+
+def route_request(request: Request, router: ReplicaRouter = replica_router):
+    """the replica serving this request, None for the primary
+
+    writes always go to the primary and keep the user there for a while (record_write,
+    see is_write), so is a fresh token (a just registered user may not have reached the
+    replicas yet)
+    """
+    router.start()
+    if request.method not in READ_METHODS:
+        return None
+
+    claims = _token_claims(request)
+    user_id = claims.get("sub")
+    if user_id is not None and router.wrote_recently(user_id):
+        return None
+    issued_at = claims.get("iat")
+    if isinstance(issued_at, (int, float)) and time.time() - issued_at < (
+        router.sticky_seconds
+    ):
+        return None
+
+    return router.pick()
+
+
+# behind PgBouncer a session level SET would leak to other clients, so the timeout is
+# set per transaction instead (one extra statement per transaction)
+@event.listens_for(Session, "after_begin")
+def _set_local_statement_timeout(session, transaction, connection):
+    if (
+        DB_STATEMENT_TIMEOUT_MS
+        and DB_PGBOUNCER
+        and connection.dialect.name == "postgresql"
+    ):
+        connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}"
+        )
+
+
+class RequestQueries:
+    """statements sent while serving one request, filled by the engine hooks below"""
+
+    __slots__ = ("count", "seconds", "slowest_seconds", "slowest_statement", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: str | None = None
+        # statement text -> times sent, parameters are bound separately so the same
+        # text means the same shape
+        self.shapes: dict[str, int] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement] = self.shapes.get(statement, 0) + 1
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def repeated(
+        self, threshold: int = DB_N_PLUS_ONE_THRESHOLD
+    ) -> list[tuple[str, int]]:
+        """statements sent at least threshold times, probable N+1s"""
+        return [
+            (statement, n) for statement, n in self.shapes.items() if n >= threshold
+        ]
+
+
+# set by the instrumentation middleware for the length of a request, the threadpool and
+# run_sync hops copy the context so the hooks see it wherever the statement runs
+request_queries: ContextVar[RequestQueries | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+# on the Engine class, so the primary, the replicas and the async engines are all timed
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["statement_started"].pop()
+
+    queries = request_queries.get()
+    if queries is not None:
+        queries.record(statement, seconds)
+
+    if DB_SLOW_STATEMENT_MS and seconds * 1000 >= DB_SLOW_STATEMENT_MS:
+        print(
+            f"SQL - slow statement ({seconds * 1000:.1f} ms): {' '.join(statement.split())}"
+        )
+
+
+# a failed statement never reaches after_cursor_execute, drop its start time
+@event.listens_for(Engine, "handle_error")
+def _drop_statement_timer(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("statement_started"):
+        connection.info["statement_started"].pop()
+
+
+def check_schema_revision(bind: Engine = engine) -> None:
+    """one SELECT on alembic_version, raises when the schema is not SCHEMA_REVISION
+
+    tables are never created here, migrations run once per deploy (alembic upgrade head)
+    and not in every worker that boots
+    """
+    try:
+        with bind.connect() as connection:
+            revisions = set(
+                connection.execute(
+                    text("SELECT version_num FROM alembic_version")
+                ).scalars()
+            )
+    except SQLAlchemyError:
+        revisions = set()
+
+    if revisions != {SCHEMA_REVISION}:
+        found = ", ".join(sorted(revisions)) or "no alembic_version"
+        raise RuntimeError(
+            f"database schema is at {found}, this code expects {SCHEMA_REVISION},"
+            " run alembic upgrade head"
+        )
 
 
 # automatically open the database connection session and then automatically close it after using it
+# expire_on_commit is off (like the async one) so rows committed by the service stay readable in the router
 def get_session():
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+# async version, expire_on_commit is off so returned models can still be read outside the session greenlet
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+# GET/HEAD requests on a replica when there is a usable one, everything else on the primary
+def get_routed_session(request: Request):
+    replica = route_request(request)
+    bind = engine if replica is None else replica.engine
+    with Session(bind, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_routed_async_session(request: Request):
+    replica = route_request(request)
+    bind = async_engine if replica is None else replica.async_engine
+    async with AsyncSession(bind, expire_on_commit=False) as session:
         yield session
+
+
+# the session dependency every router uses, picked once by config (without replicas the
+# plain primary session, no routing at all)
+if DATABASE_REPLICA_URLS:
+    get_db_session = get_routed_async_session if DATABASE_ASYNC else get_routed_session
+else:
+    get_db_session = get_async_session if DATABASE_ASYNC else get_session
+
+
+async def run_in_session(session: Session | AsyncSession, fn, *args, **kwargs):
+    """run sync ORM code (repositories/services) without blocking the event loop"""
+    if isinstance(session, AsyncSession):
+        # runs on the async driver through a greenlet, no thread involved
+        return await session.run_sync(
+            lambda sync_session: fn(sync_session, *args, **kwargs)
+        )
+
+    return await run_in_threadpool(fn, session, *args, **kwargs)
+
+
+def iterate_off_loop(iterator):
+    """iterate a CPU heavy or blocking iterator (parsing an upload) from sync ORM code
+
+    inside AsyncSession.run_sync that code runs on the event loop, so every next() is
+    sent to a worker thread and awaited. on the sync driver it is already on one
+    """
+    if not in_greenlet():
+        yield from iterator
+        return
+
+    done = object()
+    while (item := await_only(run_in_threadpool(next, iterator, done))) is not done:
+        yield item
+
+
+async def release_connection(session: Session | AsyncSession) -> None:
+    """end the session's transaction so its connection goes back to the pool
+
+    for slow work between two service calls that needs no database (bcrypt), the next
+    call checks a connection out again. loaded rows stay readable, detached
+    """
+    if isinstance(session, AsyncSession):
+        await session.close()
+        return
+
+    await run_in_threadpool(session.close)
+
+
+async def iterate_in_session(session: Session | AsyncSession, fn, *args, **kwargs):
+    """async iterate a sync generator that reads from the session (streamed exports)
+
+    every step is its own hop, a threadpool call on the sync driver or a run_sync on the
+    async one, so only the current item is ever held and the event loop stays free
+    """
+    if isinstance(session, AsyncSession):
+        iterator = await session.run_sync(
+            lambda sync_session: iter(fn(sync_session, *args, **kwargs))
+        )
+        done = object()
+        while (
+            item := await session.run_sync(lambda _: next(iterator, done))
+        ) is not done:
+            yield item
+        return
+
+    async for item in iterate_in_threadpool(fn(session, *args, **kwargs)):
+        yield item
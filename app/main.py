@@ -1,7 +1,11 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Response
 from sqlmodel import SQLModel
 from contextlib import asynccontextmanager
-from app.database import engine
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.database import DB_SCHEMA_CHECK, check_schema_revision, pool_stats
+from app.core.metrics import MetricsMiddleware, monitor_event_loop_lag
+from app.core.recurring_scheduler import RECURRING_SCHEDULER, run_recurring_scheduler
 from app.routers.v1 import (
     auth_router,
     balance_router,
@@ -9,6 +13,14 @@ from app.routers.v1 import (
     expense_router,
     income_router,
     account_router,
+    transfer_router,
+    budget_router,
+    import_router,
+    export_router,
+    batch_router,
+    report_router,
+    transaction_router,
+    recurring_router,
 )
 
 
@@ -16,9 +28,16 @@ from app.routers.v1 import (
 async def lifespan(app: FastAPI):
     print("SERVER - Server running...")
     print(f"Models registered: {SQLModel.metadata.tables.keys()}")
-    SQLModel.metadata.create_all(engine)
-    print("DATABASE - All database tables created")
+    # the schema comes from alembic upgrade head, a worker only checks it is current
+    if DB_SCHEMA_CHECK:
+        check_schema_revision()
+        print("DATABASE - Schema is up to date")
+    background = [asyncio.create_task(monitor_event_loop_lag())]
+    if RECURRING_SCHEDULER:
+        background.append(asyncio.create_task(run_recurring_scheduler()))
     yield
+    for task in background:
+        task.cancel()
     print("SERVER - Shutting down...")
 
 
@@ -29,14 +48,37 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# latency, size and SQL per request (Server-Timing header, histograms per route)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(auth_router.router, prefix="/api/v1")
 app.include_router(income_router.router, prefix="/api/v1")
 app.include_router(expense_router.router, prefix="/api/v1")
 app.include_router(category_router.router, prefix="/api/v1")
 app.include_router(balance_router.router, prefix="/api/v1")
 app.include_router(account_router.router, prefix="/api/v1")
+app.include_router(transfer_router.router, prefix="/api/v1")
+app.include_router(budget_router.router, prefix="/api/v1")
+app.include_router(import_router.router, prefix="/api/v1")
+app.include_router(export_router.router, prefix="/api/v1")
+app.include_router(batch_router.router, prefix="/api/v1")
+app.include_router(report_router.router, prefix="/api/v1")
+app.include_router(transaction_router.router, prefix="/api/v1")
+app.include_router(recurring_router.router, prefix="/api/v1")
 
 
 @app.get("/")
 async def root():
     return {"message": "Budgeting App v0.1"}
+
+
+# liveness plus connection pool gauges, answered without touching the database
+@app.get("/health")
+async def health():
+    return {"status": "ok", "database_pool": pool_stats()}
+
+
+# Prometheus exposition, the numbers of this worker process
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,7 +1,8 @@
-from sqlmodel import Field, SQLModel, Relationship, UniqueConstraint
-from datetime import datetime, timezone
+from sqlmodel import Field, SQLModel, Relationship, UniqueConstraint, Index
+from sqlalchemy import DDL, CheckConstraint, Column, Computed, Numeric, event, text
+from datetime import date, datetime, timezone
 from decimal import Decimal
-import bcrypt
+from app.core.password_core import hash_password, verify_password
 
 
 class User(SQLModel, table=True):
@@ -10,26 +11,22 @@ class User(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     username: str = Field(index=True, unique=True)
     password_hash: str
+    # bumped by every write to the user's data, the ETag of their cached GET responses
+    data_version: int = Field(default=0)
 
-    incomes: list["Income"] = Relationship(back_populates="user")
-    expenses: list["Expense"] = Relationship(back_populates="user")
+    transactions: list["Transaction"] = Relationship(back_populates="user")
     categories: list["Category"] = Relationship(back_populates="user")
     accounts: list["Account"] = Relationship(back_populates="user")
     transfers: list["Transfer"] = Relationship(back_populates="user")
     budgets: list["Budget"] = Relationship(back_populates="user")
 
-    # hash password and store it
+    # hash password and store it (runs on the bounded bcrypt pool)
     def set_password(self, password: str):
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode("utf-8"), salt).decode(
-            "utf-8"
-        )
+        self.password_hash = hash_password(password)
 
     # verify if password matches the hash
     def verify_password(self, password: str) -> bool:
-        return bcrypt.checkpw(
-            password.encode("utf-8"), self.password_hash.encode("utf-8")
-        )
+        return verify_password(password, self.password_hash)
 
 
 class Category(SQLModel, table=True):
@@ -42,8 +39,7 @@ class Category(SQLModel, table=True):
     user_id: int = Field(foreign_key="users.id", index=True)
 
     user: User = Relationship(back_populates="categories")
-    incomes: list["Income"] = Relationship(back_populates="category")
-    expenses: list["Expense"] = Relationship(back_populates="category")
+    transactions: list["Transaction"] = Relationship(back_populates="category")
     budgets: list["Budget"] = Relationship(back_populates="category")
 
 
@@ -54,11 +50,14 @@ class Account(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     name: str = Field(index=True)
     initial_balance: Decimal = Field(default=Decimal("0.00"))
+    # maintained on every income/expense write (see TransactionService), never summed on read
+    current_balance: Decimal = Field(default=Decimal("0.00"))
+    total_income: Decimal = Field(default=Decimal("0.00"))
+    total_expense: Decimal = Field(default=Decimal("0.00"))
     user_id: int = Field(foreign_key="users.id", index=True)
 
     user: User = Relationship(back_populates="accounts")
-    incomes: list["Income"] = Relationship(back_populates="account")
-    expenses: list["Expense"] = Relationship(back_populates="account")
+    transactions: list["Transaction"] = Relationship(back_populates="account")
     transfers_out: list["Transfer"] = Relationship(
         back_populates="from_account",
         sa_relationship_kwargs={"foreign_keys": "[Transfer.from_account_id]"},
@@ -85,18 +84,47 @@ class Budget(SQLModel, table=True):
     category: Category = Relationship(back_populates="budgets")
 
 
+# running total of expenses per (user, category, month), kept up to date by TransactionService
+# so budgets never have to SUM the expenses in the transactions table
+class MonthlyCategorySpend(SQLModel, table=True):
+    __tablename__ = "monthly_category_spend"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    year: int = Field(primary_key=True)
+    month: int = Field(primary_key=True)
+    category_id: int = Field(foreign_key="categories.id", primary_key=True)
+    spent_amount: Decimal = Field(default=Decimal("0.00"))
+
+
+# per day totals of incomes and expenses by category and account, kept up to date by
+# TransactionService like MonthlyCategorySpend. reports aggregate these rows, never the transactions
+class DailyTransactionRollup(SQLModel, table=True):
+    __tablename__ = "daily_transaction_rollup"
+
+    user_id: int = Field(foreign_key="users.id", primary_key=True)
+    day: date = Field(primary_key=True)
+    kind: str = Field(primary_key=True)
+    # part of the primary key so it cant be NULL, 0 means uncategorised (hence no foreign key)
+    category_id: int = Field(primary_key=True)
+    account_id: int = Field(primary_key=True)
+    total_amount: Decimal = Field(default=Decimal("0.00"))
+    transaction_count: int = Field(default=0)
+
+
 class Transfer(SQLModel, table=True):
     __tablename__ = "transfers"
+    # keyset pagination walks (user_id, date_time, id) newest first, it also serves user_id lookups
+    __table_args__ = (
+        Index("ix_transfers_user_id_date_time_id", "user_id", "date_time", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     amount: Decimal = Field(gt=0)
     from_account_id: int = Field(foreign_key="accounts.id", index=True)
     to_account_id: int = Field(foreign_key="accounts.id", index=True)
     description: str | None = Field(default=None)
-    date_time: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc), index=True
-    )
-    user_id: int = Field(foreign_key="users.id", index=True)
+    date_time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    user_id: int = Field(foreign_key="users.id")
 
     user: User = Relationship(back_populates="transfers")
     from_account: Account = Relationship(
@@ -109,41 +137,160 @@ class Transfer(SQLModel, table=True):
     )
 
 
-class Income(SQLModel, table=True):
-    __tablename__ = "incomes"
+DESCRIPTION_TSVECTOR = "to_tsvector('simple', coalesce(description, ''))"
+
+
+# incomes and expenses share one table, kind says which. amount stays positive like the
+# API shows it, signed_amount is computed by the database (+ for incomes, - for expenses)
+# so a balance or a timeline is a single scan of a single table
+class Transaction(SQLModel, table=True):
+    __tablename__ = "transactions"
+    __table_args__ = (
+        CheckConstraint("kind IN ('income', 'expense')", name="ck_transactions_kind"),
+        # the id a row had in incomes/expenses before the merge, see public_id
+        UniqueConstraint("kind", "legacy_id"),
+        # the per kind lists walk (user_id, kind, date_time, id) newest first
+        Index(
+            "ix_transactions_user_id_kind_date_time_id",
+            "user_id",
+            "kind",
+            "date_time",
+            "id",
+        ),
+        # timelines over both kinds walk (user_id, date_time, id)
+        Index("ix_transactions_user_id_date_time_id", "user_id", "date_time", "id"),
+        # per account sums read only the index on PostgreSQL (INCLUDE), it also serves
+        # account_id lookups
+        Index(
+            "ix_transactions_account_id_kind",
+            "account_id",
+            "kind",
+            postgresql_include=["amount", "signed_amount"],
+        ),
+        # description search on PostgreSQL, words through the tsvector expression (the
+        # search query builds the same expression so the planner matches it) and fuzzy or
+        # partial words through trigrams. SQLite gets transactions_fts below instead
+        Index(
+            "ix_transactions_description_fts",
+            text(DESCRIPTION_TSVECTOR),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_transactions_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
+    kind: str = Field()
     amount: Decimal = Field(gt=0)
+    signed_amount: Decimal | None = Field(
+        default=None,
+        sa_column=Column(
+            Numeric,
+            Computed(
+                "CASE WHEN kind = 'expense' THEN -amount ELSE amount END",
+                persisted=True,
+            ),
+        ),
+    )
     category_id: int | None = Field(
         default=None, foreign_key="categories.id", index=True
     )
     description: str | None = Field(default=None)
-    date_time: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc), index=True
-    )
-    user_id: int = Field(foreign_key="users.id", index=True)
-    account_id: int = Field(foreign_key="accounts.id", index=True)
+    # user_id, date_time and account_id lead the composite indexes above
+    date_time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    user_id: int = Field(foreign_key="users.id")
+    account_id: int = Field(foreign_key="accounts.id")
+    # set by the merge migration only, None for rows created since (and once converted)
+    legacy_id: int | None = Field(default=None)
 
-    user: User = Relationship(back_populates="incomes")
-    category: Category | None = Relationship(back_populates="incomes")
-    account: Account = Relationship(back_populates="incomes")
+    user: User = Relationship(back_populates="transactions")
+    category: Category | None = Relationship(back_populates="transactions")
+    account: Account = Relationship(back_populates="transactions")
 
+    # the id /incomes and /expenses show and take. merged rows keep their old per kind
+    # id, every other row uses its own id (all above the old ones, see the migration)
+    @property
+    def public_id(self) -> int:
+        return self.legacy_id if self.legacy_id is not None else self.id
 
-class Expense(SQLModel, table=True):
-    __tablename__ = "expenses"
+
+# an income or expense that repeats RRULE style (FREQ, INTERVAL and an optional UNTIL).
+# next_index/next_run are the first occurrence not posted yet, next_run is None once the
+# rule is past until. the scheduler posts every rule whose next_run has come
+class RecurringRule(SQLModel, table=True):
+    __tablename__ = "recurring_rules"
+    __table_args__ = (
+        CheckConstraint(
+            "kind IN ('income', 'expense')", name="ck_recurring_rules_kind"
+        ),
+        CheckConstraint(
+            "frequency IN ('daily', 'weekly', 'monthly', 'yearly')",
+            name="ck_recurring_rules_frequency",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
+    kind: str = Field()
     amount: Decimal = Field(gt=0)
     category_id: int | None = Field(
         default=None, foreign_key="categories.id", index=True
     )
+    account_id: int = Field(foreign_key="accounts.id", index=True)
     description: str | None = Field(default=None)
-    date_time: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc), index=True
-    )
+    frequency: str = Field()
+    interval: int = Field(default=1, ge=1)
+    # UTC, like transactions.date_time
+    starts_at: datetime
+    until: datetime | None = Field(default=None)
+    next_index: int = Field(default=0)
+    next_run: datetime | None = Field(default=None, index=True)
     user_id: int = Field(foreign_key="users.id", index=True)
-    account_id: int = Field(foreign_key="accounts.id", index=True)
 
-    user: User = Relationship(back_populates="expenses")
-    category: Category | None = Relationship(back_populates="expenses")
-    account: Account = Relationship(back_populates="expenses")
+
+# one row per posted occurrence, the primary key is the idempotency key: a restarted or
+# second scheduler claiming the same occurrence inserts nothing. tick marks the rows
+# claimed by one run so the transactions are inserted from exactly those
+class RecurringOccurrence(SQLModel, table=True):
+    __tablename__ = "recurring_occurrences"
+
+    rule_id: int = Field(foreign_key="recurring_rules.id", primary_key=True)
+    date_time: datetime = Field(primary_key=True)
+    tick: str = Field(index=True)
+
+
+# SQLite has no tsvector or trigram index, an FTS5 table over the descriptions stands in.
+# it stores no text of its own (content=transactions), triggers keep its index in step
+TRANSACTIONS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE transactions_fts USING fts5("
+    "description, content='transactions', content_rowid='id')",
+    "CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN"
+    " INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);"
+    " END",
+    "CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN"
+    " INSERT INTO transactions_fts (transactions_fts, rowid, description)"
+    " VALUES ('delete', old.id, old.description);"
+    " END",
+    "CREATE TRIGGER transactions_fts_update AFTER UPDATE OF description ON transactions"
+    " BEGIN"
+    " INSERT INTO transactions_fts (transactions_fts, rowid, description)"
+    " VALUES ('delete', old.id, old.description);"
+    " INSERT INTO transactions_fts (rowid, description) VALUES (new.id, new.description);"
+    " END",
+)
+
+# alembic creates the same objects, these cover create_all (tests, benchmarks)
+for statement in TRANSACTIONS_FTS_DDL:
+    event.listen(
+        Transaction.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
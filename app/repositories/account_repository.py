@@ -1,6 +1,7 @@
-from sqlmodel import Session, select, func
+from sqlmodel import Session, select, func, update, case
 from decimal import Decimal
-from app.models import Account
+from app.models import Account, Transaction, Transfer
+from app.repositories.unit_of_work import commit
 
 
 class AccountRepository:
@@ -17,6 +18,19 @@ class AccountRepository:
         )
         return self.session.exec(statement).first()
 
+    def lock_by_ids_and_user(
+        self, account_ids: list[int], user_id: int
+    ) -> dict[int, Account]:
+        """SELECT ... FOR UPDATE, always in id order so concurrent transfers cant deadlock"""
+        statement = (
+            select(Account)
+            .where(Account.id.in_(account_ids), Account.user_id == user_id)
+            .order_by(Account.id)
+            .with_for_update()
+        )
+
+        return {account.id: account for account in self.session.exec(statement).all()}
+
     def get_total_initial_balance_by_user(self, user_id: int) -> Decimal:
         statement = select(func.sum(Account.initial_balance)).where(
             Account.user_id == user_id
@@ -25,14 +39,140 @@ class AccountRepository:
 
         return result or Decimal("0")
 
+    def get_total_current_balance_by_user(self, user_id: int) -> Decimal:
+        statement = select(func.sum(Account.current_balance)).where(
+            Account.user_id == user_id
+        )
+        result = self.session.exec(statement).first()
+
+        return result or Decimal("0")
+
+    def get_income_and_expense_totals_by_user(
+        self, user_id: int
+    ) -> tuple[Decimal, Decimal]:
+        statement = select(
+            func.sum(Account.total_income), func.sum(Account.total_expense)
+        ).where(Account.user_id == user_id)
+        total_income, total_expense = self.session.exec(statement).one()
+
+        return total_income or Decimal("0"), total_expense or Decimal("0")
+
+    def apply_balance_delta(
+        self,
+        account_id: int,
+        income_delta: Decimal = Decimal("0"),
+        expense_delta: Decimal = Decimal("0"),
+        transfer_delta: Decimal = Decimal("0"),
+    ) -> None:
+        """atomic in-place increment, does not commit so it lands in the caller's transaction"""
+        statement = (
+            update(Account)
+            .where(Account.id == account_id)
+            .values(
+                total_income=Account.total_income + income_delta,
+                total_expense=Account.total_expense + expense_delta,
+                current_balance=Account.current_balance
+                + income_delta
+                - expense_delta
+                + transfer_delta,
+            )
+        )
+        self.session.exec(statement)
+
+    def apply_balance_deltas(self, deltas) -> None:
+        """apply_balance_delta for every (account_id, income, expense) row of a SELECT
+
+        one UPDATE ... FROM, does not commit. the rows are locked first in id order (as
+        lock_by_ids_and_user does), the UPDATE alone locks them in whatever order the
+        join produces and two of these could deadlock
+        """
+        deltas = deltas.subquery()
+        account_id, income_delta, expense_delta = deltas.c
+        self.session.exec(
+            select(Account.id)
+            .where(Account.id.in_(select(account_id)))
+            .order_by(Account.id)
+            .with_for_update()
+        ).all()
+        statement = (
+            update(Account)
+            .where(Account.id == account_id)
+            .values(
+                total_income=Account.total_income + income_delta,
+                total_expense=Account.total_expense + expense_delta,
+                current_balance=Account.current_balance + income_delta - expense_delta,
+            )
+        )
+        self.session.exec(statement)
+
+    def get_recomputed_balances(
+        self,
+    ) -> list[tuple[Account, Decimal, Decimal, Decimal, Decimal]]:
+        """every account with income, expense, transfer in and transfer out totals summed from scratch
+
+        one statement, each source is grouped once and joined back by account id
+        """
+        # incomes and expenses come out of one pass over the transactions table
+        transaction_totals = (
+            select(
+                Transaction.account_id,
+                func.sum(
+                    case((Transaction.kind == "income", Transaction.amount), else_=0)
+                ).label("income"),
+                func.sum(
+                    case((Transaction.kind == "expense", Transaction.amount), else_=0)
+                ).label("expense"),
+            )
+            .group_by(Transaction.account_id)
+            .subquery()
+        )
+        transfer_in_totals = (
+            select(
+                Transfer.to_account_id.label("account_id"),
+                func.sum(Transfer.amount).label("total"),
+            )
+            .group_by(Transfer.to_account_id)
+            .subquery()
+        )
+        transfer_out_totals = (
+            select(
+                Transfer.from_account_id.label("account_id"),
+                func.sum(Transfer.amount).label("total"),
+            )
+            .group_by(Transfer.from_account_id)
+            .subquery()
+        )
+        statement = (
+            select(
+                Account,
+                func.coalesce(transaction_totals.c.income, 0),
+                func.coalesce(transaction_totals.c.expense, 0),
+                func.coalesce(transfer_in_totals.c.total, 0),
+                func.coalesce(transfer_out_totals.c.total, 0),
+            )
+            .outerjoin(
+                transaction_totals, transaction_totals.c.account_id == Account.id
+            )
+            .outerjoin(
+                transfer_in_totals, transfer_in_totals.c.account_id == Account.id
+            )
+            .outerjoin(
+                transfer_out_totals, transfer_out_totals.c.account_id == Account.id
+            )
+            .order_by(Account.id)
+            # the stored totals are compared with the sums, both as of this statement
+            .execution_options(populate_existing=True)
+        )
+
+        return self.session.exec(statement).all()
+
     def save(self, account: Account) -> Account:
         """insert or update account"""
         self.session.add(account)
-        self.session.commit()
-        self.session.refresh(account)
+        commit(self.session, account)
 
         return account
 
     def delete(self, account: Account) -> None:
         self.session.delete(account)
-        self.session.commit()
+        commit(self.session)
@@ -0,0 +1,88 @@
+from sqlmodel import Session, select, func, and_
+from decimal import Decimal
+from app.models import Budget, Category, MonthlyCategorySpend
+from app.repositories.unit_of_work import commit
+
+
+class BudgetRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _with_category_and_spent(self):
+        # spent comes from the monthly rollup, one indexed row per budget
+        return (
+            select(
+                Budget,
+                Category.name,
+                func.coalesce(MonthlyCategorySpend.spent_amount, 0),
+            )
+            .join(Category, Budget.category_id == Category.id)
+            .outerjoin(
+                MonthlyCategorySpend,
+                and_(
+                    MonthlyCategorySpend.user_id == Budget.user_id,
+                    MonthlyCategorySpend.year == Budget.year,
+                    MonthlyCategorySpend.month == Budget.month,
+                    MonthlyCategorySpend.category_id == Budget.category_id,
+                ),
+            )
+        )
+
+    def get_all_by_user_and_month_with_spent(
+        self, user_id: int, year: int, month: int
+    ) -> list[tuple[Budget, str, Decimal]]:
+        statement = (
+            self._with_category_and_spent()
+            .where(
+                Budget.user_id == user_id,
+                Budget.year == year,
+                Budget.month == month,
+            )
+            .order_by(Category.name)
+        )
+
+        return self.session.exec(statement).all()
+
+    def get_by_id_and_user_with_spent(
+        self, budget_id: int, user_id: int
+    ) -> tuple[Budget, str, Decimal] | None:
+        statement = self._with_category_and_spent().where(
+            Budget.id == budget_id,
+            Budget.user_id == user_id,
+        )
+
+        return self.session.exec(statement).first()
+
+    def get_by_id_and_user(self, budget_id: int, user_id: int) -> Budget | None:
+        statement = select(Budget).where(
+            Budget.id == budget_id,
+            Budget.user_id == user_id,
+        )
+
+        return self.session.exec(statement).first()
+
+    def exists_for_month(
+        self, user_id: int, category_id: int, year: int, month: int
+    ) -> bool:
+        statement = select(Budget.id).where(
+            Budget.user_id == user_id,
+            Budget.category_id == category_id,
+            Budget.year == year,
+            Budget.month == month,
+        )
+        return self.session.exec(statement).first() is not None
+
+    def exists_by_category(self, category_id: int) -> bool:
+        statement = select(Budget.id).where(Budget.category_id == category_id)
+        return self.session.exec(statement).first() is not None
+
+    def save(self, budget: Budget) -> Budget:
+        """insert or update budget"""
+        self.session.add(budget)
+        commit(self.session, budget)
+
+        return budget
+
+    def delete(self, budget: Budget) -> None:
+        self.session.delete(budget)
+        commit(self.session)
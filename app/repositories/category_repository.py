@@ -1,5 +1,6 @@
 from sqlmodel import Session, select
 from app.models import Category
+from app.repositories.unit_of_work import commit
 
 
 class CategoryRepository:
@@ -23,11 +24,10 @@ class CategoryRepository:
     def save(self, category: Category) -> Category:
         """insert or update category"""
         self.session.add(category)
-        self.session.commit()
-        self.session.refresh(category)
+        commit(self.session, category)
 
         return category
 
     def delete(self, category: Category) -> None:
         self.session.delete(category)
-        self.session.commit()
+        commit(self.session)
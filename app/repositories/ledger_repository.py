@@ -0,0 +1,107 @@
+from sqlmodel import Session, func, select, union_all, literal, null
+from sqlalchemy.orm import aliased
+from datetime import datetime
+from typing import Iterator
+from sqlalchemy.types import TypeEngine
+from app.models import Transaction, Transfer, Category, Account
+
+FromAccount = aliased(Account)
+ToAccount = aliased(Account)
+
+LEDGER_COLUMNS = (
+    "kind",
+    "id",
+    "date_time",
+    "amount",
+    "description",
+    "category_name",
+    "account_name",
+    "to_account_name",
+)
+
+
+class LedgerRepository:
+    """read side that merges incomes, expenses and transfers into one timeline"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def stream_by_user(
+        self,
+        user_id: int,
+        batch_size: int,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> Iterator[list[tuple]]:
+        """oldest first, yields lists of batch_size rows (LEDGER_COLUMNS order)
+
+        yield_per keeps only one batch in memory, on PostgreSQL it also turns on a
+        server side cursor so the database streams instead of sending the full result
+        """
+        ledger = union_all(
+            self._transactions(user_id, date_from, date_to),
+            self._transfers(user_id, date_from, date_to),
+        ).subquery()
+        statement = (
+            select(*(ledger.c[column] for column in LEDGER_COLUMNS))
+            .order_by(ledger.c.date_time, ledger.c.kind, ledger.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        yield from self.session.exec(statement).partitions()
+
+    def column_types(self) -> dict[str, TypeEngine]:
+        """the SQL type of every LEDGER_COLUMNS column, as the models declare it"""
+        ledger = union_all(
+            self._transactions(None, None, None), self._transfers(None, None, None)
+        ).subquery()
+        return {column: ledger.c[column].type for column in LEDGER_COLUMNS}
+
+    # PRIVATE helper methods
+    def _transactions(self, user_id, date_from, date_to):
+        statement = (
+            select(
+                Transaction.kind,
+                # the id /incomes and /expenses know it by (Transaction.public_id)
+                func.coalesce(Transaction.legacy_id, Transaction.id).label("id"),
+                Transaction.date_time,
+                Transaction.amount,
+                Transaction.description,
+                Category.name.label("category_name"),
+                Account.name.label("account_name"),
+                null().label("to_account_name"),
+            )
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .outerjoin(Account, Transaction.account_id == Account.id)
+            .where(Transaction.user_id == user_id)
+        )
+
+        return _date_range(statement, Transaction, date_from, date_to)
+
+    def _transfers(self, user_id, date_from, date_to):
+        statement = (
+            select(
+                literal("transfer").label("kind"),
+                Transfer.id,
+                Transfer.date_time,
+                Transfer.amount,
+                Transfer.description,
+                null().label("category_name"),
+                FromAccount.name.label("account_name"),
+                ToAccount.name.label("to_account_name"),
+            )
+            .join(FromAccount, Transfer.from_account_id == FromAccount.id)
+            .join(ToAccount, Transfer.to_account_id == ToAccount.id)
+            .where(Transfer.user_id == user_id)
+        )
+
+        return _date_range(statement, Transfer, date_from, date_to)
+
+
+def _date_range(statement, model, date_from, date_to):
+    if date_from is not None:
+        statement = statement.where(model.date_time >= date_from)
+    if date_to is not None:
+        statement = statement.where(model.date_time < date_to)
+
+    return statement
@@ -0,0 +1,220 @@
+from datetime import date, datetime
+from sqlmodel import Session, text
+from app.models import Transaction
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+# constraints backed by an index, their names are unique per schema like index names
+PRIMARY_KEY = "transactions_pkey"
+LEGACY_ID_KEY = "transactions_kind_legacy_id_key"
+# everything but the generated signed_amount, the partition it lands in computes it again
+_COPY_COLUMNS = ", ".join(
+    column.name for column in Transaction.__table__.columns if column.computed is None
+)
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    """first day of day's month, moved offset months"""
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition(start: date) -> tuple[str, date, date]:
+    """(name, from, to) of the partition holding the month that begins on start"""
+    return (
+        f"{PARENT_TABLE}_y{start.year}m{start.month:02d}",
+        start,
+        month_start(start, 1),
+    )
+
+
+def months_to_cover(
+    first: date | None, last: date | None, today: date, months_ahead: int
+) -> list[date]:
+    """month starts from the oldest row's month up to months_ahead months past the newest
+    row or today, whichever is later"""
+    month = month_start(first or today)
+    end = month_start(max(last or today, today), months_ahead + 1)
+    months = []
+    while month < end:
+        months.append(month)
+        month = month_start(month, 1)
+
+    return months
+
+
+def _create_partition(name: str, date_from: date, date_to: date):
+    return text(
+        f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE}"
+        f" FOR VALUES FROM ('{date_from.isoformat()}') TO ('{date_to.isoformat()}')"
+    )
+
+
+class PartitionRepository:
+    """monthly range partitions of transactions on date_time
+
+    only PostgreSQL and only once rebuild() converted the table (partition_transactions
+    --convert), everywhere else transactions is a plain table
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def supports_partitioning(self) -> bool:
+        return self.session.get_bind().dialect.name == "postgresql"
+
+    def is_partitioned(self) -> bool:
+        if not self.supports_partitioning():
+            return False
+
+        statement = text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass(:table))"
+        )
+        return self.session.exec(statement, params={"table": PARENT_TABLE}).scalar()
+
+    def get_partition_names(self) -> set[str]:
+        statement = text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE pg_inherits.inhparent = to_regclass(:table)"
+        )
+        rows = self.session.exec(statement, params={"table": PARENT_TABLE})
+        return set(rows.scalars())
+
+    def count_default_rows(
+        self, date_from: date | None = None, date_to: date | None = None
+    ) -> int:
+        """rows that fell into the DEFAULT partition (no monthly partition for them yet)"""
+        statement = f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE true"
+        if date_from is not None:
+            statement += " AND date_time >= :date_from"
+        if date_to is not None:
+            statement += " AND date_time < :date_to"
+
+        return self.session.exec(
+            text(statement), params={"date_from": date_from, "date_to": date_to}
+        ).scalar()
+
+    def create_month(self, name: str, date_from: date, date_to: date) -> None:
+        """add one monthly partition, does not commit
+
+        PostgreSQL refuses a new partition while the DEFAULT partition holds rows of its
+        range, those are moved over: detach the default, create, re-route the rows, attach
+        """
+        bounds = {"date_from": date_from, "date_to": date_to}
+        create = _create_partition(name, date_from, date_to)
+
+        if not self.count_default_rows(date_from, date_to):
+            self.session.exec(create)
+            return
+
+        self.session.exec(
+            text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+        )
+        self.session.exec(create)
+        self.session.exec(
+            text(
+                f"INSERT INTO {PARENT_TABLE} ({_COPY_COLUMNS})"
+                f" SELECT {_COPY_COLUMNS} FROM {DEFAULT_PARTITION}"
+                " WHERE date_time >= :date_from AND date_time < :date_to"
+            ),
+            params=bounds,
+        )
+        self.session.exec(
+            text(
+                f"DELETE FROM {DEFAULT_PARTITION}"
+                " WHERE date_time >= :date_from AND date_time < :date_to"
+            ),
+            params=bounds,
+        )
+        self.session.exec(
+            text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+            )
+        )
+
+    def get_date_range(self) -> tuple[datetime | None, datetime | None]:
+        statement = text(f"SELECT min(date_time), max(date_time) FROM {PARENT_TABLE}")
+        return tuple(self.session.exec(statement).one())
+
+    def rebuild(self, partitions: list[tuple[str, date, date]] | None) -> None:
+        """copy transactions into a new table, does not commit
+
+        partitioned by month on date_time into partitions (plus the DEFAULT one), or plain
+        when partitions is None. columns, defaults, checks, foreign keys and indexes come
+        from the table as it is, so any revision can be rebuilt. a partitioned table needs
+        date_time in its primary key and unique constraints, there the key is (id,
+        date_time) and date_time joins (kind, legacy_id), legacy ids are only written by
+        the merge migration so they stay unique. ids keep coming from the same sequence.
+        the table stays locked until the caller commits
+        """
+        old = f"{PARENT_TABLE}_old"
+        params = {"table": PARENT_TABLE}
+        # read before the rename, the definitions name the table they are on
+        indexes = self.session.exec(
+            text(
+                "SELECT indexname, indexdef FROM pg_indexes"
+                " WHERE schemaname = current_schema() AND tablename = :table"
+                " AND indexname NOT IN (SELECT conname FROM pg_constraint"
+                " WHERE conrelid = to_regclass(:table))"
+            ),
+            params=params,
+        ).all()
+        foreign_keys = self.session.exec(
+            text(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint"
+                " WHERE conrelid = to_regclass(:table) AND contype = 'f'"
+            ),
+            params=params,
+        ).all()
+
+        self.session.exec(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {old}"))
+        # free the index names for the new table
+        for name in (PRIMARY_KEY, LEGACY_ID_KEY):
+            self.session.exec(
+                text(f"ALTER TABLE {old} RENAME CONSTRAINT {name} TO {name}_old")
+            )
+        for name, _ in indexes:
+            self.session.exec(text(f"DROP INDEX {name}"))
+
+        key = ", date_time" if partitions is not None else ""
+        partition_by = (
+            " PARTITION BY RANGE (date_time)" if partitions is not None else ""
+        )
+        self.session.exec(
+            text(
+                f"CREATE TABLE {PARENT_TABLE} ("
+                f"LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED,"
+                f" CONSTRAINT {PRIMARY_KEY} PRIMARY KEY (id{key}),"
+                f" CONSTRAINT {LEGACY_ID_KEY} UNIQUE (kind, legacy_id{key})"
+                f"){partition_by}"
+            )
+        )
+        for name, definition in foreign_keys:
+            self.session.exec(
+                text(f"ALTER TABLE {PARENT_TABLE} ADD CONSTRAINT {name} {definition}")
+            )
+        if partitions is not None:
+            for name, date_from, date_to in partitions:
+                self.session.exec(_create_partition(name, date_from, date_to))
+            self.session.exec(
+                text(
+                    f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"
+                )
+            )
+
+        # the old table would take the sequence with it
+        self.session.exec(
+            text(f"ALTER SEQUENCE {PARENT_TABLE}_id_seq OWNED BY {PARENT_TABLE}.id")
+        )
+        self.session.exec(
+            text(
+                f"INSERT INTO {PARENT_TABLE} ({_COPY_COLUMNS})"
+                f" SELECT {_COPY_COLUMNS} FROM {old}"
+            )
+        )
+        # on a partitioned table each one is created on every partition
+        for _, definition in indexes:
+            self.session.exec(text(definition.replace(" ON ONLY ", " ON ")))
+        self.session.exec(text(f"DROP TABLE {old}"))
@@ -0,0 +1,187 @@
+from datetime import datetime
+from sqlmodel import Session, select, delete, update, func, case, cast, extract
+from sqlalchemy import Date, Integer
+from app.models import RecurringRule, RecurringOccurrence, Category, Account
+from app.repositories.unit_of_work import commit
+from app.repositories.upsert import dialect_insert
+
+
+class RecurringRepository:
+    """recurring rules and the occurrences they already posted
+
+    the claimed_* selects read the occurrences claimed by one scheduler tick joined with
+    their rules, the other repositories insert/update from them in one statement each
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_all_by_user_with_category_and_account(
+        self, user_id: int
+    ) -> list[tuple[RecurringRule, str | None, str | None]]:
+        statement = (
+            self._with_category_and_account()
+            .where(RecurringRule.user_id == user_id)
+            .order_by(RecurringRule.id)
+        )
+        return self.session.exec(statement).all()
+
+    def get_by_id_and_user_with_category_and_account(
+        self, rule_id: int, user_id: int
+    ) -> tuple[RecurringRule, str | None, str | None] | None:
+        statement = self._with_category_and_account().where(
+            RecurringRule.id == rule_id, RecurringRule.user_id == user_id
+        )
+        return self.session.exec(statement).first()
+
+    def get_by_id_and_user(self, rule_id: int, user_id: int) -> RecurringRule | None:
+        statement = select(RecurringRule).where(
+            RecurringRule.id == rule_id, RecurringRule.user_id == user_id
+        )
+        return self.session.exec(statement).first()
+
+    def exists_by_category(self, category_id: int) -> bool:
+        statement = select(RecurringRule.id).where(
+            RecurringRule.category_id == category_id
+        )
+        return self.session.exec(statement).first() is not None
+
+    def exists_by_account(self, account_id: int) -> bool:
+        statement = select(RecurringRule.id).where(
+            RecurringRule.account_id == account_id
+        )
+        return self.session.exec(statement).first() is not None
+
+    def lock_due(self, now: datetime, limit: int) -> list[RecurringRule]:
+        """the longest overdue rules of every user, locked for this transaction
+
+        on PostgreSQL rules another scheduler holds are skipped rather than waited for,
+        so several workers split the due rules between them
+        """
+        statement = (
+            select(RecurringRule)
+            .where(RecurringRule.next_run <= now)
+            .order_by(RecurringRule.next_run, RecurringRule.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return self.session.exec(statement).all()
+
+    def claim(self, occurrences: list[dict]) -> None:
+        """one multi row INSERT, occurrences posted before (by anyone) are left alone"""
+        if not occurrences:
+            return
+        statement = dialect_insert(
+            self.session, RecurringOccurrence
+        ).on_conflict_do_nothing(index_elements=["rule_id", "date_time"])
+        self.session.exec(statement, params=occurrences)
+
+    def advance(self, positions: list[dict]) -> None:
+        """next_index/next_run of many rules, one executemany UPDATE by primary key"""
+        if positions:
+            self.session.exec(update(RecurringRule), params=positions)
+
+    def claimed_transactions(self, tick: str):
+        """the transactions rows of a tick's claims, in TRANSACTION_COLUMNS order"""
+        return self._claimed(
+            tick,
+            RecurringRule.kind,
+            RecurringRule.amount,
+            RecurringRule.category_id,
+            RecurringRule.account_id,
+            RecurringRule.description,
+            RecurringOccurrence.date_time,
+            RecurringRule.user_id,
+        )
+
+    def claimed_balance_deltas(self, tick: str):
+        """(account_id, income, expense) of a tick's claims"""
+        return self._claimed(
+            tick,
+            RecurringRule.account_id,
+            func.sum(self._kind_amount("income")),
+            func.sum(self._kind_amount("expense")),
+        ).group_by(RecurringRule.account_id)
+
+    def claimed_spend(self, tick: str):
+        """(user_id, category_id, year, month, spent) of a tick's categorised expenses"""
+        year = cast(extract("year", RecurringOccurrence.date_time), Integer)
+        month = cast(extract("month", RecurringOccurrence.date_time), Integer)
+        return (
+            self._claimed(
+                tick,
+                RecurringRule.user_id,
+                RecurringRule.category_id,
+                year,
+                month,
+                func.sum(RecurringRule.amount),
+            )
+            .where(
+                RecurringRule.kind == "expense", RecurringRule.category_id.is_not(None)
+            )
+            .group_by(RecurringRule.user_id, RecurringRule.category_id, year, month)
+        )
+
+    def claimed_report(self, tick: str):
+        """(user_id, day, kind, category_id, account_id, total, count) of a tick's claims"""
+        day = self._day(RecurringOccurrence.date_time)
+        category_id = func.coalesce(RecurringRule.category_id, 0)
+        return self._claimed(
+            tick,
+            RecurringRule.user_id,
+            day,
+            RecurringRule.kind,
+            category_id,
+            RecurringRule.account_id,
+            func.sum(RecurringRule.amount),
+            func.count(),
+        ).group_by(
+            RecurringRule.user_id,
+            day,
+            RecurringRule.kind,
+            category_id,
+            RecurringRule.account_id,
+        )
+
+    def claimed_user_ids(self, tick: str):
+        return self._claimed(tick, RecurringRule.user_id).distinct()
+
+    def save(self, rule: RecurringRule) -> RecurringRule:
+        """insert or update rule"""
+        self.session.add(rule)
+        commit(self.session, rule)
+
+        return rule
+
+    def delete(self, rule: RecurringRule) -> None:
+        """the rule and its occurrence keys, the transactions it posted stay"""
+        self.session.exec(
+            delete(RecurringOccurrence).where(RecurringOccurrence.rule_id == rule.id)
+        )
+        self.session.delete(rule)
+        commit(self.session)
+
+    # PRIVATE helper methods
+    def _with_category_and_account(self):
+        return (
+            select(RecurringRule, Category.name, Account.name)
+            .outerjoin(Category, RecurringRule.category_id == Category.id)
+            .outerjoin(Account, RecurringRule.account_id == Account.id)
+        )
+
+    def _claimed(self, tick: str, *columns):
+        return (
+            select(*columns)
+            .select_from(RecurringOccurrence)
+            .join(RecurringRule, RecurringRule.id == RecurringOccurrence.rule_id)
+            .where(RecurringOccurrence.tick == tick)
+        )
+
+    def _kind_amount(self, kind: str):
+        return case((RecurringRule.kind == kind, RecurringRule.amount), else_=0)
+
+    def _day(self, column):
+        # the UTC day, sqlite has no DATE type and keeps the 'YYYY-MM-DD' text date() gives
+        if self.session.get_bind().dialect.name == "postgresql":
+            return cast(column, Date)
+        return func.date(column)
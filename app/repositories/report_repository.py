@@ -0,0 +1,153 @@
+from sqlmodel import Session, select, delete, func, cast, null, Date
+from datetime import date
+from decimal import Decimal
+from app.models import DailyTransactionRollup, Category, Account
+from app.repositories.upsert import dialect_insert
+
+Rollup = DailyTransactionRollup
+
+# sqlite has no date_trunc, these date() modifiers give the same bucket start (weeks start monday)
+_SQLITE_BUCKETS = {
+    "week": ("-6 days", "weekday 1"),
+    "month": ("start of month",),
+    "year": ("start of year",),
+}
+
+
+class ReportRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(
+        self,
+        user_id: int,
+        kind: str,
+        day: date,
+        category_id: int,
+        account_id: int,
+        amount_delta: Decimal,
+        count_delta: int,
+    ) -> None:
+        """upsert increment, does not commit so it lands in the caller's transaction"""
+        statement = dialect_insert(self.session, Rollup).values(
+            user_id=user_id,
+            day=day,
+            kind=kind,
+            category_id=category_id,
+            account_id=account_id,
+            total_amount=amount_delta,
+            transaction_count=count_delta,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "day", "kind", "category_id", "account_id"],
+            set_={
+                "total_amount": Rollup.total_amount + statement.excluded.total_amount,
+                "transaction_count": Rollup.transaction_count
+                + statement.excluded.transaction_count,
+            },
+        )
+        self.session.exec(statement)
+
+    def add_from(self, rows) -> None:
+        """add for every (user_id, day, kind, category_id, account_id, total, count) row
+        of a SELECT, one statement"""
+        statement = dialect_insert(self.session, Rollup).from_select(
+            [
+                "user_id",
+                "day",
+                "kind",
+                "category_id",
+                "account_id",
+                "total_amount",
+                "transaction_count",
+            ],
+            rows,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "day", "kind", "category_id", "account_id"],
+            set_={
+                "total_amount": Rollup.total_amount + statement.excluded.total_amount,
+                "transaction_count": Rollup.transaction_count
+                + statement.excluded.transaction_count,
+            },
+        )
+        self.session.exec(statement)
+
+    def get_series_by_user(
+        self,
+        user_id: int,
+        bucket: str,
+        kind: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        by_category: bool = False,
+        by_account: bool = False,
+    ) -> list[tuple]:
+        """(bucket, kind, category_id, category_name, account_id, account_name, total, count)
+
+        category/account columns are None unless grouped by them, oldest bucket first
+        """
+        bucket_column = self._bucket(bucket).label("bucket")
+        group_by = [bucket_column, Rollup.kind]
+
+        if by_category:
+            category_columns = [func.nullif(Rollup.category_id, 0), Category.name]
+            group_by += [Rollup.category_id, Category.name]
+        else:
+            category_columns = [null(), null()]
+
+        if by_account:
+            account_columns = [Rollup.account_id, Account.name]
+            group_by += [Rollup.account_id, Account.name]
+        else:
+            account_columns = [null(), null()]
+
+        statement = select(
+            bucket_column,
+            Rollup.kind,
+            *category_columns,
+            *account_columns,
+            func.sum(Rollup.total_amount),
+            func.sum(Rollup.transaction_count),
+        ).where(Rollup.user_id == user_id)
+        if by_category:
+            statement = statement.outerjoin(Category, Rollup.category_id == Category.id)
+        if by_account:
+            statement = statement.outerjoin(Account, Rollup.account_id == Account.id)
+        if kind is not None:
+            statement = statement.where(Rollup.kind == kind)
+        if date_from is not None:
+            statement = statement.where(Rollup.day >= date_from)
+        if date_to is not None:
+            statement = statement.where(Rollup.day < date_to)
+
+        statement = (
+            statement.group_by(*group_by)
+            # rows whose transactions were all deleted/moved
+            .having(func.sum(Rollup.transaction_count) > 0).order_by(*group_by)
+        )
+
+        return self.session.exec(statement).all()
+
+    # user_id leads the primary key, with it these are an index range instead of a full scan
+    def delete_by_category(self, category_id: int, user_id: int) -> None:
+        statement = delete(Rollup).where(
+            Rollup.user_id == user_id, Rollup.category_id == category_id
+        )
+        self.session.exec(statement)
+
+    def delete_by_account(self, account_id: int, user_id: int) -> None:
+        statement = delete(Rollup).where(
+            Rollup.user_id == user_id, Rollup.account_id == account_id
+        )
+        self.session.exec(statement)
+
+    # PRIVATE helper methods
+    def _bucket(self, bucket: str):
+        if bucket == "day":
+            return Rollup.day
+
+        if self.session.get_bind().dialect.name == "postgresql":
+            return cast(func.date_trunc(bucket, Rollup.day), Date)
+
+        return func.date(Rollup.day, *_SQLITE_BUCKETS[bucket])
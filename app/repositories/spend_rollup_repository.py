@@ -0,0 +1,64 @@
+from sqlmodel import Session, select, delete
+from decimal import Decimal
+from app.models import MonthlyCategorySpend
+from app.repositories.upsert import dialect_insert
+
+
+class SpendRollupRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_spent(
+        self, user_id: int, category_id: int, year: int, month: int
+    ) -> Decimal:
+        statement = select(MonthlyCategorySpend.spent_amount).where(
+            MonthlyCategorySpend.user_id == user_id,
+            MonthlyCategorySpend.year == year,
+            MonthlyCategorySpend.month == month,
+            MonthlyCategorySpend.category_id == category_id,
+        )
+        result = self.session.exec(statement).first()
+
+        return result or Decimal("0")
+
+    def add_spend(
+        self, user_id: int, category_id: int, year: int, month: int, delta: Decimal
+    ) -> None:
+        """upsert increment, does not commit so it lands in the caller's transaction"""
+        statement = dialect_insert(self.session, MonthlyCategorySpend).values(
+            user_id=user_id,
+            category_id=category_id,
+            year=year,
+            month=month,
+            spent_amount=delta,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "year", "month", "category_id"],
+            set_={
+                "spent_amount": MonthlyCategorySpend.spent_amount
+                + statement.excluded.spent_amount
+            },
+        )
+        self.session.exec(statement)
+
+    def add_spend_from(self, rows) -> None:
+        """add_spend for every (user_id, category_id, year, month, spent) row of a SELECT"""
+        statement = dialect_insert(self.session, MonthlyCategorySpend).from_select(
+            ["user_id", "category_id", "year", "month", "spent_amount"], rows
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "year", "month", "category_id"],
+            set_={
+                "spent_amount": MonthlyCategorySpend.spent_amount
+                + statement.excluded.spent_amount
+            },
+        )
+        self.session.exec(statement)
+
+    # user_id leads the primary key, with it this is an index range instead of a full scan
+    def delete_by_category(self, category_id: int, user_id: int) -> None:
+        statement = delete(MonthlyCategorySpend).where(
+            MonthlyCategorySpend.user_id == user_id,
+            MonthlyCategorySpend.category_id == category_id,
+        )
+        self.session.exec(statement)
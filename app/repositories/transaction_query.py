@@ -0,0 +1,177 @@
+import re
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import Float, cast, column, func, literal, literal_column, table, tuple_
+from sqlalchemy.orm import aliased
+from sqlmodel import select, and_, null, or_
+from sqlmodel.sql.expression import SelectOfScalar, Select
+from app.models import Transaction, Transfer, Category, Account
+
+# SQLite only, see TRANSACTIONS_FTS_DDL in app.models
+transactions_fts = table("transactions_fts", column("rowid"))
+
+
+def by_public_id(transaction_id: int):
+    """the row a /incomes or /expenses id points to (Transaction.public_id), only
+    unique within one kind"""
+    return or_(
+        Transaction.legacy_id == transaction_id,
+        and_(Transaction.legacy_id.is_(None), Transaction.id == transaction_id),
+    )
+
+
+# shared WHERE/ORDER BY building for the income and expense list queries
+def filter_transactions(
+    statement: Select | SelectOfScalar,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    account_id: int | None = None,
+    category_id: int | None = None,
+    min_amount: Decimal | None = None,
+    max_amount: Decimal | None = None,
+) -> Select | SelectOfScalar:
+    if date_from is not None:
+        statement = statement.where(Transaction.date_time >= date_from)
+    if date_to is not None:
+        statement = statement.where(Transaction.date_time < date_to)
+    if account_id is not None:
+        statement = statement.where(Transaction.account_id == account_id)
+    if category_id is not None:
+        statement = statement.where(Transaction.category_id == category_id)
+    if min_amount is not None:
+        statement = statement.where(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        statement = statement.where(Transaction.amount <= max_amount)
+
+    return statement
+
+
+def keyset_page(
+    statement: Select | SelectOfScalar,
+    model: type[Transaction] | type[Transfer],
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+) -> Select | SelectOfScalar:
+    """newest first, resuming strictly after the (date_time, id) of the previous page"""
+    if after is not None:
+        statement = statement.where(
+            tuple_(model.date_time, model.id) < tuple_(*after),
+            # implied by the row comparison, but a plain bound on date_time is what lets
+            # PostgreSQL skip the partitions newer than the cursor
+            model.date_time <= after[0],
+        )
+
+    return statement.order_by(model.date_time.desc(), model.id.desc()).limit(limit)
+
+
+def search_transactions(
+    statement: Select, dialect: str, query: str
+) -> tuple[Select, object]:
+    """rows whose description matches query, plus the rank expression (higher is better)
+
+    PostgreSQL matches whole words through the tsvector index and misspelled or partial
+    words through the trigram index, the rank adds both scores. SQLite matches every word
+    as a prefix through transactions_fts and ranks by bm25
+    """
+    if dialect == "postgresql":
+        # the expression of ix_transactions_description_fts with its constants inlined,
+        # bound parameters in their place would keep the planner from using the index
+        document = func.to_tsvector(
+            literal_column("'simple'"),
+            func.coalesce(Transaction.description, literal_column("''")),
+        )
+        ts_query = func.websearch_to_tsquery(literal_column("'simple'"), query)
+        # ts_rank + word_similarity is a float4, the cursor brings it back as a float8
+        # literal and the boundary row would no longer compare equal to itself
+        rank = cast(
+            func.ts_rank(document, ts_query)
+            + func.word_similarity(query, Transaction.description),
+            Float(53),
+        )
+        return (
+            statement.where(
+                or_(
+                    document.op("@@")(ts_query),
+                    literal(query).op("<%")(Transaction.description),
+                )
+            ),
+            rank,
+        )
+
+    words = re.findall(r"\w+", query)
+    # every word quoted (no FTS5 syntax gets through) and matched as a prefix
+    match = " ".join(f'"{word}"*' for word in words)
+    rank = -func.bm25(literal_column("transactions_fts"))
+    return (
+        statement.join(
+            transactions_fts, transactions_fts.c.rowid == Transaction.id
+        ).where(literal_column("transactions_fts").op("MATCH")(match)),
+        rank,
+    )
+
+
+def ranked_page(
+    statement: Select,
+    rank,
+    limit: int,
+    after: tuple[float, datetime, int] | None = None,
+) -> Select:
+    """best rank first, newest first among equal ranks, resuming after the previous page"""
+    if after is not None:
+        statement = statement.where(
+            tuple_(rank, Transaction.date_time, Transaction.id)
+            < tuple_(cast(after[0], Float(53)), after[1], after[2])
+        )
+
+    return statement.order_by(
+        rank.desc(), Transaction.date_time.desc(), Transaction.id.desc()
+    ).limit(limit)
+
+
+def update_target(
+    transaction_id: int,
+    user_id: int,
+    category_id: int | None = None,
+    account_id: int | None = None,
+) -> Select:
+    """everything an update needs in one statement
+
+    (transaction, category name, account name, new category type, new category name,
+    new account name). the new_* columns are NULL when that id was not given or does not
+    belong to the user. the transaction row is locked so concurrent updates of the same
+    row apply their balance effects one after the other
+    """
+    NewCategory = aliased(Category)
+    NewAccount = aliased(Account)
+
+    new_category_columns = (
+        (NewCategory.type, NewCategory.name)
+        if category_id is not None
+        else (null(), null())
+    )
+    new_account_columns = (NewAccount.name,) if account_id is not None else (null(),)
+
+    statement = (
+        select(
+            Transaction,
+            Category.name,
+            Account.name,
+            *new_category_columns,
+            *new_account_columns,
+        )
+        .outerjoin(Category, Transaction.category_id == Category.id)
+        .outerjoin(Account, Transaction.account_id == Account.id)
+    )
+    if category_id is not None:
+        statement = statement.outerjoin(
+            NewCategory,
+            and_(NewCategory.id == category_id, NewCategory.user_id == user_id),
+        )
+    if account_id is not None:
+        statement = statement.outerjoin(
+            NewAccount, and_(NewAccount.id == account_id, NewAccount.user_id == user_id)
+        )
+
+    return statement.where(
+        by_public_id(transaction_id), Transaction.user_id == user_id
+    ).with_for_update(of=Transaction)
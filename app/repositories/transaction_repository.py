@@ -0,0 +1,197 @@
+from sqlmodel import Session, select, func, insert
+from datetime import datetime
+from decimal import Decimal
+from app.models import Transaction, Category, Account
+from app.repositories.transaction_query import (
+    by_public_id,
+    filter_transactions,
+    keyset_page,
+    ranked_page,
+    search_transactions,
+    update_target,
+)
+from app.repositories.unit_of_work import commit
+
+# what insert_from_select expects its SELECT to return, in this order
+TRANSACTION_COLUMNS = (
+    "kind",
+    "amount",
+    "category_id",
+    "account_id",
+    "description",
+    "date_time",
+    "user_id",
+)
+
+
+class TransactionRepository:
+    """incomes and expenses, both live in the transactions table
+
+    with kind None it sees every row (in-use checks, net balances). IncomeRepository and
+    ExpenseRepository pin the kind so the per type endpoints only ever see their own rows.
+    the *_by_id_and_user lookups take a public_id, which is only unique within a kind
+    """
+
+    kind: str | None = None
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def exists_by_category(self, category_id: int) -> bool:
+        statement = self._scoped(select(Transaction.id)).where(
+            Transaction.category_id == category_id
+        )
+        return self.session.exec(statement).first() is not None
+
+    def exists_by_account(self, account_id: int) -> bool:
+        statement = self._scoped(select(Transaction.id)).where(
+            Transaction.account_id == account_id
+        )
+        return self.session.exec(statement).first() is not None
+
+    def get_all_by_user(self, user_id: int) -> list[Transaction]:
+        statement = self._scoped(select(Transaction)).where(
+            Transaction.user_id == user_id
+        )
+        return self.session.exec(statement).all()
+
+    def get_total_balance_across_accounts_by_user(self, user_id: int) -> Decimal:
+        statement = self._scoped(select(func.sum(self._total_column()))).where(
+            Transaction.user_id == user_id
+        )
+        result = self.session.exec(statement).first()
+
+        return result or Decimal("0")
+
+    def get_total_balance_by_account(self, account_id: int) -> Decimal:
+        statement = self._scoped(select(func.sum(self._total_column()))).where(
+            Transaction.account_id == account_id
+        )
+        result = self.session.exec(statement).first()
+
+        return result or Decimal("0")
+
+    def get_page_by_user_with_category_and_account(
+        self,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        **filters,
+    ) -> list[tuple[Transaction, str | None, str | None]]:
+        statement = self._scoped(
+            select(Transaction, Category.name, Account.name)
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .outerjoin(Account, Transaction.account_id == Account.id)
+            .where(Transaction.user_id == user_id)
+        )
+        statement = filter_transactions(statement, **filters)
+        statement = keyset_page(statement, Transaction, limit, after)
+
+        return self.session.exec(statement).all()
+
+    def search_page_by_user(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        after: tuple[float, datetime, int] | None = None,
+        **filters,
+    ) -> list[tuple[Transaction, str | None, str | None, float]]:
+        """(transaction, category name, account name, rank), best match first"""
+        statement = self._scoped(
+            select(Transaction, Category.name, Account.name)
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .outerjoin(Account, Transaction.account_id == Account.id)
+            .where(Transaction.user_id == user_id)
+        )
+        statement, rank = search_transactions(
+            statement, self.session.get_bind().dialect.name, query
+        )
+        statement = filter_transactions(statement.add_columns(rank), **filters)
+        statement = ranked_page(statement, rank, limit, after)
+
+        return self.session.exec(statement).all()
+
+    def lock_by_id_and_user(
+        self, transaction_id: int, user_id: int
+    ) -> Transaction | None:
+        """SELECT ... FOR UPDATE, a concurrent update/delete of the row waits here
+
+        populate_existing so the effects taken back are the locked row's, not a copy the
+        session loaded earlier
+        """
+        statement = (
+            self._scoped(select(Transaction))
+            .where(by_public_id(transaction_id), Transaction.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+
+        return self.session.exec(statement).first()
+
+    def get_by_id_and_user_with_category_and_account(
+        self, transaction_id: int, user_id: int
+    ) -> tuple[Transaction, str | None, str | None] | None:
+        statement = self._scoped(
+            select(Transaction, Category.name, Account.name)
+            .outerjoin(Category, Transaction.category_id == Category.id)
+            .outerjoin(Account, Transaction.account_id == Account.id)
+            .where(Transaction.user_id == user_id, by_public_id(transaction_id))
+        )
+        return self.session.exec(statement).first()
+
+    def bulk_insert(self, rows: list[dict]) -> None:
+        """one multi row INSERT for the whole batch (each row carries its kind), does not commit"""
+        if rows:
+            self.session.exec(insert(Transaction), params=rows)
+
+    def insert_from_select(self, rows) -> int:
+        """INSERT ... SELECT, rows yields TRANSACTION_COLUMNS. does not commit, returns
+        the number of rows inserted"""
+        result = self.session.exec(
+            insert(Transaction).from_select(TRANSACTION_COLUMNS, rows)
+        )
+        return result.rowcount
+
+    def get_update_target(
+        self,
+        transaction_id: int,
+        user_id: int,
+        category_id: int | None = None,
+        account_id: int | None = None,
+    ) -> (
+        tuple[Transaction, str | None, str | None, str | None, str | None, str | None]
+        | None
+    ):
+        """see update_target, one round trip for the whole PATCH lookup/validation
+
+        populate_existing like lock_by_id_and_user, the old values taken back are the
+        locked row's
+        """
+        statement = self._scoped(
+            update_target(transaction_id, user_id, category_id, account_id)
+        ).execution_options(populate_existing=True)
+        return self.session.exec(statement).first()
+
+    def save(self, transaction: Transaction) -> Transaction:
+        """insert or update transaction"""
+        self.session.add(transaction)
+        commit(self.session, transaction)
+
+        return transaction
+
+    def delete(self, transaction: Transaction) -> None:
+        self.session.delete(transaction)
+        commit(self.session)
+
+    # PRIVATE helper methods
+    def _scoped(self, statement):
+        if self.kind is not None:
+            statement = statement.where(Transaction.kind == self.kind)
+        return statement
+
+    def _total_column(self):
+        # one kind adds up its amounts, both kinds net out through the signed column
+        if self.kind is not None:
+            return Transaction.amount
+        return Transaction.signed_amount
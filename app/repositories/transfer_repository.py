@@ -0,0 +1,84 @@
+from sqlmodel import Session, select, or_
+from sqlalchemy.orm import aliased
+from datetime import datetime
+from app.models import Transfer, Account
+from app.repositories.transaction_query import keyset_page
+from app.repositories.unit_of_work import commit
+
+FromAccount = aliased(Account)
+ToAccount = aliased(Account)
+
+
+class TransferRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def exists_by_account(self, account_id: int) -> bool:
+        statement = select(Transfer.id).where(
+            or_(
+                Transfer.from_account_id == account_id,
+                Transfer.to_account_id == account_id,
+            )
+        )
+        return self.session.exec(statement).first() is not None
+
+    def get_page_by_user_with_accounts(
+        self,
+        user_id: int,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+    ) -> list[tuple[Transfer, str | None, str | None]]:
+        statement = (
+            select(Transfer, FromAccount.name, ToAccount.name)
+            .outerjoin(FromAccount, Transfer.from_account_id == FromAccount.id)
+            .outerjoin(ToAccount, Transfer.to_account_id == ToAccount.id)
+            .where(Transfer.user_id == user_id)
+        )
+        statement = keyset_page(statement, Transfer, limit, after)
+
+        return self.session.exec(statement).all()
+
+    def get_by_id_and_user(self, transfer_id: int, user_id: int) -> Transfer | None:
+        statement = select(Transfer).where(
+            Transfer.id == transfer_id,
+            Transfer.user_id == user_id,
+        )
+
+        return self.session.exec(statement).first()
+
+    def lock_by_id_and_user(self, transfer_id: int, user_id: int) -> Transfer | None:
+        """SELECT ... FOR UPDATE, a concurrent update/delete of the transfer waits here
+
+        populate_existing so the amounts reversed are the locked row's, not a copy the
+        session loaded earlier
+        """
+        statement = (
+            select(Transfer)
+            .where(Transfer.id == transfer_id, Transfer.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+
+        return self.session.exec(statement).first()
+
+    def get_by_id_and_user_with_accounts(
+        self, transfer_id: int, user_id: int
+    ) -> tuple[Transfer, str | None, str | None] | None:
+        statement = (
+            select(Transfer, FromAccount.name, ToAccount.name)
+            .outerjoin(FromAccount, Transfer.from_account_id == FromAccount.id)
+            .outerjoin(ToAccount, Transfer.to_account_id == ToAccount.id)
+            .where(Transfer.user_id == user_id, Transfer.id == transfer_id)
+        )
+        return self.session.exec(statement).first()
+
+    def save(self, transfer: Transfer) -> Transfer:
+        """insert or update transfer"""
+        self.session.add(transfer)
+        commit(self.session, transfer)
+
+        return transfer
+
+    def delete(self, transfer: Transfer) -> None:
+        self.session.delete(transfer)
+        commit(self.session)
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from typing import Iterator
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session as OrmSession
+from sqlmodel import Session, SQLModel
+
+_DEPTH_KEY = "unit_of_work_depth"
+# set once the session's transaction wrote something, cleared when it ends
+_WRITES_KEY = "unit_of_work_writes"
+
+
+# every session, the sync side of the async ones included
+@event.listens_for(OrmSession, "do_orm_execute")
+def _note_write_statement(state: ORMExecuteState) -> None:
+    # INSERT/UPDATE/DELETE and anything else that is not an ORM select (text, DDL)
+    if not state.is_select:
+        state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(OrmSession, "before_flush")
+def _note_flush(session: OrmSession, flush_context, instances) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_rollback")
+def _clear_writes(session: OrmSession) -> None:
+    session.info.pop(_WRITES_KEY, None)
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """everything written inside commits once, when the outermost block exits
+
+    while one is open repository save/delete only flush (ids still get assigned), so a
+    service can stage several writes and nested units (a service calling another, a
+    batch of operations) join the outer one. any exception rolls the whole unit back.
+    a unit that only read skips the COMMIT, the session's connection goes back to the
+    pool (which rolls back) when the request ends
+    """
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+
+    try:
+        yield session
+    except BaseException:
+        session.info[_DEPTH_KEY] = depth
+        if depth == 0:
+            session.rollback()
+        raise
+
+    session.info[_DEPTH_KEY] = depth
+    if depth == 0 and has_writes(session):
+        session.commit()
+
+
+def has_writes(session: Session) -> bool:
+    """something was written (or is waiting to be flushed) since the last commit"""
+    return session.info.get(_WRITES_KEY, False) or bool(
+        session.new or session.dirty or session.deleted
+    )
+
+
+def in_unit_of_work(session: Session) -> bool:
+    return session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def commit(session: Session, instance: SQLModel | None = None) -> None:
+    """end of a repository write, a real commit only when no unit of work is open"""
+    if in_unit_of_work(session):
+        session.flush()
+        return
+
+    session.commit()
+    if instance is not None:
+        session.refresh(instance)
@@ -0,0 +1,10 @@
+from sqlmodel import Session, SQLModel
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(session: Session, model: type[SQLModel]):
+    """INSERT that supports ON CONFLICT for the database the session is bound to"""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+
+    return sqlite.insert(model)
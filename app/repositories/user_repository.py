@@ -1,19 +1,70 @@
-from sqlmodel import Session, select
+from contextlib import contextmanager
+from typing import Iterator
+from sqlmodel import Session, select, update
 from app.models import User
+from app.repositories.unit_of_work import commit
+
+# set while deferred_data_versions is open, the users whose bump is still due
+_DEFERRED_KEY = "deferred_data_versions"
 
 
 class UserRepository:
     def __init__(self, session: Session):
         self.session = session
 
+    def get_by_id(self, user_id: int) -> User | None:
+        return self.session.get(User, user_id)
+
     def get_by_username(self, username: str) -> User | None:
         statement = select(User).where(User.username == username)
         return self.session.exec(statement).first()
 
+    def get_data_version(self, user_id: int) -> int | None:
+        statement = select(User.data_version).where(User.id == user_id)
+        return self.session.exec(statement).first()
+
+    def bump_data_version(self, user_id: int) -> None:
+        """the user's data changed, does not commit (it rides on the write's commit)"""
+        deferred = self.session.info.get(_DEFERRED_KEY)
+        if deferred is not None:
+            deferred.add(user_id)
+            return
+
+        statement = (
+            update(User)
+            .where(User.id == user_id)
+            .values(data_version=User.data_version + 1)
+        )
+        self.session.exec(statement)
+
+    def bump_data_versions(self, user_ids) -> None:
+        """bump_data_version for every user id a SELECT returns, does not commit"""
+        statement = (
+            update(User)
+            .where(User.id.in_(user_ids))
+            .values(data_version=User.data_version + 1)
+        )
+        self.session.exec(statement)
+
+    @contextmanager
+    def deferred_data_versions(self) -> Iterator[None]:
+        """bump_data_version inside only notes the user, each is bumped once on exit
+
+        for several writes in one unit of work: the users row is then locked once,
+        after every account, like a single write does. nothing is bumped on an exception
+        """
+        self.session.info[_DEFERRED_KEY] = deferred = set()
+        try:
+            yield
+        finally:
+            self.session.info.pop(_DEFERRED_KEY, None)
+
+        if deferred:
+            self.bump_data_versions(sorted(deferred))
+
     def save(self, user: User) -> User:
         """insert or update user"""
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        commit(self.session, user)
 
         return user
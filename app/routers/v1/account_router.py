@@ -1,20 +1,125 @@
-from fastapi import APIRouter
-from app.core.dependencies import UserAuthenticationDep, AccountServiceDep
-from app.schemas.v1.account_schema import AccountResponse
+from fastapi import APIRouter, HTTPException, Response, status
+from app.core.dependencies import (
+    UserAuthenticationDep,
+    AccountServiceDep,
+    VersionedResponseDep,
+)
+from app.schemas.v1.account_schema import (
+    AccountCreateRequest,
+    AccountPatchRequest,
+    AccountResponse,
+    AccountCreateResponse,
+)
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 
 @router.get("/", response_model=list[AccountResponse])
 async def get_my_accounts(
-    current_user: UserAuthenticationDep, account_service: AccountServiceDep
-):
-    return account_service.list_by_user(current_user.id)
+    current_user: UserAuthenticationDep,
+    account_service: AccountServiceDep,
+    versioned: VersionedResponseDep,
+) -> Response:
+    if (cached := versioned.cached()) is not None:
+        return cached
+
+    accounts = await account_service.list_by_user(current_user.id)
+
+    return versioned.respond(
+        [_account_response(account) for account in accounts], list[AccountResponse]
+    )
 
 
 @router.get("/balance")
 async def get_total_balance(
-    current_user: UserAuthenticationDep, account_service: AccountServiceDep
+    current_user: UserAuthenticationDep,
+    account_service: AccountServiceDep,
+    versioned: VersionedResponseDep,
+):
+    if (cached := versioned.cached()) is not None:
+        return cached
+
+    total_balance = await account_service.total_balance_on_all_accounts(current_user.id)
+
+    return versioned.respond({"total_balance": total_balance})
+
+
+@router.get("/{account_id}/balance")
+async def get_account_balance(
+    current_user: UserAuthenticationDep,
+    account_service: AccountServiceDep,
+    versioned: VersionedResponseDep,
+    account_id: int,
 ):
-    balance = account_service.account_balance(current_user.id)
-    return
+    # the ETag only covers the user's data, an id they dont have must still be a 404
+    try:
+        balance = await account_service.account_balance(account_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    if (cached := versioned.cached()) is not None:
+        return cached
+
+    return versioned.respond({"account_id": account_id, "balance": balance})
+
+
+@router.post(
+    "/", response_model=AccountCreateResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_account(
+    current_user: UserAuthenticationDep,
+    account_service: AccountServiceDep,
+    account_data: AccountCreateRequest,
+) -> AccountCreateResponse:
+    try:
+        created_account = await account_service.create(
+            name=account_data.name,
+            initial_balance=account_data.initial_balance,
+            user_id=current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return AccountCreateResponse(created_item=_account_response(created_account))
+
+
+@router.patch("/{account_id}", response_model=AccountResponse)
+async def update_account(
+    current_user: UserAuthenticationDep,
+    account_service: AccountServiceDep,
+    account_id: int,
+    account_data: AccountPatchRequest,
+) -> AccountResponse:
+    try:
+        updated_account = await account_service.update(
+            account_id=account_id, user_id=current_user.id, name=account_data.name
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return _account_response(updated_account)
+
+
+@router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_account(
+    current_user: UserAuthenticationDep,
+    account_service: AccountServiceDep,
+    account_id: int,
+) -> None:
+    try:
+        await account_service.delete(account_id=account_id, user_id=current_user.id)
+    except ValueError as e:
+        if "not found" in str(e):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        else:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+def _account_response(account) -> AccountResponse:
+    return AccountResponse(
+        id=account.id,
+        user_id=account.user_id,
+        name=account.name,
+        initial_balance=account.initial_balance,
+        total_balance=account.current_balance,
+    )
@@ -1,6 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from app.core.auth_core import create_access_token
 from app.core.dependencies import UserAuthenticationDep, AuthServiceDep
+from app.core.password_core import (
+    PasswordHasherBusyError,
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+)
 from app.schemas.v1.auth_schema import (
     UserCreateRequest,
     UserResponse,
@@ -19,9 +26,17 @@ async def register_user(
 ) -> UserCreateResponse:
 
     try:
-        registered_user = auth_service.register_user(
+        # hashed before the session is used, the wait for bcrypt holds no connection
+        password_hash = await hash_password_async(user_data.password)
+        registered_user = await auth_service.register_user(
             username=user_data.username,
-            password=user_data.password,
+            password_hash=password_hash,
+        )
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -39,7 +54,17 @@ async def login(
 ) -> LoginResponse:
 
     try:
-        access_token = auth_service.login(form_data.username, form_data.password)
+        user = await auth_service.get_login_user(form_data.username)
+        # the read is done, the connection goes back to the pool while bcrypt runs
+        await auth_service.release_connection()
+        if not await verify_password_async(form_data.password, user.password_hash):
+            raise ValueError("Invalid username or password")
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,6 +72,17 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # cost factor changed since this hash was made, upgrade it while we have the plain password
+    if needs_rehash(user.password_hash):
+        try:
+            password_hash = await hash_password_async(form_data.password)
+            await auth_service.update_password_hash(user.id, password_hash)
+        except PasswordHasherBusyError:
+            # not worth failing a good login over, try again next time
+            pass
+
+    access_token = create_access_token(user_id=user.id, username=user.username)
+
     return LoginResponse(access_token=access_token, token_type="bearer")
 
 
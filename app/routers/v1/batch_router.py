@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException, status
+from pydantic import ValidationError
+from app.core.dependencies import UserAuthenticationDep, BatchServiceDep
+from app.schemas.v1.batch_schema import BatchRequest, BatchResponse, BatchResult
+from app.schemas.v1.income_schema import IncomeCreateRequest, IncomeUpdateRequest
+from app.schemas.v1.expense_schema import ExpenseCreateRequest, ExpenseUpdateRequest
+from app.schemas.v1.transfer_schema import TransferCreateRequest, TransferPatchRequest
+from app.schemas.v1.category_schema import CategoryCreateRequest, CategoryUpdateRequest
+from app.schemas.v1.account_schema import AccountCreateRequest, AccountPatchRequest
+from app.schemas.v1.budget_schema import BudgetCreateRequest, BudgetPatchRequest
+from app.services.v1.batch_service import BatchOperationError
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+# resource -> (POST body, PATCH body), the same schemas the single endpoints use
+_BODY_SCHEMAS = {
+    "incomes": (IncomeCreateRequest, IncomeUpdateRequest),
+    "expenses": (ExpenseCreateRequest, ExpenseUpdateRequest),
+    "transfers": (TransferCreateRequest, TransferPatchRequest),
+    "categories": (CategoryCreateRequest, CategoryUpdateRequest),
+    "accounts": (AccountCreateRequest, AccountPatchRequest),
+    "budgets": (BudgetCreateRequest, BudgetPatchRequest),
+}
+
+
+@router.post("/", response_model=BatchResponse)
+async def apply_batch(
+    current_user: UserAuthenticationDep,
+    batch_service: BatchServiceDep,
+    batch_data: BatchRequest,
+) -> BatchResponse:
+    operations = []
+    for index, operation in enumerate(batch_data.operations):
+        if (operation.method == "POST") != (operation.id is None):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail={
+                    "index": index,
+                    "error": "id is required for PATCH/DELETE and not allowed for POST",
+                },
+            )
+
+        body = {}
+        if operation.method != "DELETE":
+            create_schema, patch_schema = _BODY_SCHEMAS[operation.resource]
+            try:
+                if operation.method == "POST":
+                    body = create_schema.model_validate(operation.body).model_dump()
+                else:
+                    body = patch_schema.model_validate(operation.body).model_dump(
+                        exclude_none=True
+                    )
+            except ValidationError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                    detail={
+                        "index": index,
+                        "error": e.errors(include_url=False, include_context=False),
+                    },
+                )
+
+        operations.append((operation.method, operation.resource, operation.id, body))
+
+    try:
+        ids = await batch_service.apply(current_user.id, operations)
+    except BatchOperationError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            status_code = status.HTTP_404_NOT_FOUND
+        elif any(
+            word in error.lower()
+            for word in ("invalid category", "already exists", "cannot")
+        ):
+            status_code = status.HTTP_409_CONFLICT
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+        raise HTTPException(
+            status_code=status_code, detail={"index": e.index, "error": error}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return BatchResponse(
+        results=[
+            BatchResult(
+                index=index,
+                method=operation.method,
+                resource=operation.resource,
+                id=item_id,
+            )
+            for index, (operation, item_id) in enumerate(
+                zip(batch_data.operations, ids)
+            )
+        ]
+    )
@@ -0,0 +1,133 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core.dependencies import UserAuthenticationDep, BudgetServiceDep
+from app.schemas.v1.budget_schema import (
+    BudgetCreateRequest,
+    BudgetPatchRequest,
+    BudgetListResponse,
+    BudgetDetailResponse,
+    BudgetCreateResponse,
+)
+
+router = APIRouter(prefix="/budgets", tags=["budgets"])
+
+
+@router.get("/", response_model=list[BudgetListResponse])
+async def get_budgets(
+    current_user: UserAuthenticationDep,
+    budget_service: BudgetServiceDep,
+    year: int | None = Query(default=None, ge=2000, le=2100),
+    month: int | None = Query(default=None, ge=1, le=12),
+) -> list[BudgetListResponse]:
+    # defaults to the current (UTC) month
+    now = datetime.now(timezone.utc)
+    budgets = await budget_service.list_by_user(
+        current_user.id, year or now.year, month or now.month
+    )
+
+    return [
+        BudgetListResponse(
+            id=budget.id,
+            category_name=category_name,
+            limit_amount=budget.limit_amount,
+            spent_amount=spent,
+            remaining=budget.limit_amount - Decimal(spent),
+        )
+        for budget, category_name, spent in budgets
+    ]
+
+
+@router.get("/{budget_id}", response_model=BudgetDetailResponse)
+async def get_budget(
+    current_user: UserAuthenticationDep,
+    budget_service: BudgetServiceDep,
+    budget_id: int,
+) -> BudgetDetailResponse:
+    try:
+        budget, category_name, spent = await budget_service.get_detail_by_id_and_user(
+            budget_id, current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return _detail_response(budget, category_name, spent)
+
+
+@router.post(
+    "/", response_model=BudgetCreateResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_budget(
+    current_user: UserAuthenticationDep,
+    budget_service: BudgetServiceDep,
+    budget_data: BudgetCreateRequest,
+) -> BudgetCreateResponse:
+    try:
+        budget, category_name, spent = await budget_service.create(
+            category_id=budget_data.category_id,
+            limit_amount=budget_data.limit_amount,
+            month=budget_data.month,
+            year=budget_data.year,
+            user_id=current_user.id,
+        )
+    except ValueError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
+        elif "invalid category" in error.lower() or "already exists" in error.lower():
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    return BudgetCreateResponse(
+        created_item=_detail_response(budget, category_name, spent)
+    )
+
+
+@router.patch("/{budget_id}", response_model=BudgetDetailResponse)
+async def update_budget(
+    current_user: UserAuthenticationDep,
+    budget_service: BudgetServiceDep,
+    budget_id: int,
+    budget_data: BudgetPatchRequest,
+) -> BudgetDetailResponse:
+    try:
+        budget, category_name, spent = await budget_service.update(
+            budget_id=budget_id,
+            user_id=current_user.id,
+            limit_amount=budget_data.limit_amount,
+        )
+    except ValueError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    return _detail_response(budget, category_name, spent)
+
+
+@router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_budget(
+    current_user: UserAuthenticationDep,
+    budget_service: BudgetServiceDep,
+    budget_id: int,
+) -> None:
+    try:
+        await budget_service.delete(budget_id=budget_id, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+def _detail_response(budget, category_name: str, spent) -> BudgetDetailResponse:
+    return BudgetDetailResponse(
+        id=budget.id,
+        user_id=budget.user_id,
+        category_id=budget.category_id,
+        category_name=category_name,
+        limit_amount=budget.limit_amount,
+        month=budget.month,
+        year=budget.year,
+        spent_amount=spent,
+        remaining=budget.limit_amount - Decimal(spent),
+    )
@@ -1,5 +1,9 @@
-from fastapi import APIRouter, HTTPException, status
-from app.core.dependencies import UserAuthenticationDep, CategoryServiceDep
+from fastapi import APIRouter, HTTPException, Response, status
+from app.core.dependencies import (
+    UserAuthenticationDep,
+    CategoryServiceDep,
+    VersionedResponseDep,
+)
 from app.schemas.v1.category_schema import (
     CategoryCreateRequest,
     CategoryUpdateRequest,
@@ -12,9 +16,16 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.get("/", response_model=list[CategoryResponse])
 async def get_categories(
-    current_user: UserAuthenticationDep, category_service: CategoryServiceDep
-) -> list[CategoryResponse]:
-    return category_service.list_by_user(current_user.id)
+    current_user: UserAuthenticationDep,
+    category_service: CategoryServiceDep,
+    versioned: VersionedResponseDep,
+) -> Response:
+    if (cached := versioned.cached()) is not None:
+        return cached
+
+    categories = await category_service.list_by_user(current_user.id)
+
+    return versioned.respond(categories, list[CategoryResponse])
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
@@ -24,7 +35,7 @@ async def get_category(
     category_id: int,
 ) -> CategoryResponse:
     try:
-        return category_service.get_by_id_and_user(category_id, current_user.id)
+        return await category_service.get_by_id_and_user(category_id, current_user.id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -39,7 +50,7 @@ async def create_category(
 ) -> CategoryCreateResponse:
 
     try:
-        created_category = category_service.create(
+        created_category = await category_service.create(
             name=category_data.name,
             type=category_data.type,
             user_id=current_user.id,
@@ -65,7 +76,7 @@ async def update_category(
     category_data: CategoryUpdateRequest,
 ) -> CategoryResponse:
     try:
-        updated_category = category_service.update(
+        updated_category = await category_service.update(
             category_id=category_id,
             user_id=current_user.id,
             name=category_data.name,
@@ -88,7 +99,7 @@ async def delete_category(
 ) -> None:
 
     try:
-        category_service.delete(category_id=category_id, user_id=current_user.id)
+        await category_service.delete(category_id=category_id, user_id=current_user.id)
     except ValueError as e:
         if "not found" in str(e):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
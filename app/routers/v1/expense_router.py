@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from app.core.dependencies import UserAuthenticationDep, TransactionServiceDep
+from app.core.fast_json import json_rows_response
 from app.schemas.v1.expense_schema import (
     ExpenseCreateRequest,
     ExpenseUpdateRequest,
@@ -7,26 +9,42 @@ from app.schemas.v1.expense_schema import (
     ExpenseDetailResponse,
     ExpenseCreateResponse,
 )
+from app.schemas.v1.transaction_schema import TransactionListQuery
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
 
 @router.get("/", response_model=list[ExpenseListResponse])
 async def get_expenses(
-    current_user: UserAuthenticationDep, transaction_service: TransactionServiceDep
-) -> list[ExpenseListResponse]:
-    expenses = transaction_service.list_by_user("expense", current_user.id)
-
-    return [
-        ExpenseListResponse(
-            id=expense.id,
-            amount=expense.amount,
-            category_name=category_name if category_name else "Uncategorized",
-            account_name=account_name if account_name else "Cash",
-            date_time=expense.date_time,
+    current_user: UserAuthenticationDep,
+    transaction_service: TransactionServiceDep,
+    query: Annotated[TransactionListQuery, Query()],
+) -> Response:
+    try:
+        expenses, next_cursor = await transaction_service.list_by_user(
+            "expense", current_user.id, **query.model_dump()
         )
-        for expense, category_name, account_name in expenses
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # body stays a plain list, the next page is advertised in a header
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+
+    # rows go straight to JSON in the ExpenseListResponse shape (still the documented
+    # response_model), one model per row would be built and validated twice
+    return json_rows_response(
+        [
+            {
+                "id": expense.public_id,
+                "amount": expense.amount,
+                "category_name": category_name if category_name else "Uncategorized",
+                "account_name": account_name if account_name else "Cash",
+                "date_time": expense.date_time,
+            }
+            for expense, category_name, account_name in expenses
+        ],
+        headers,
+    )
 
 
 @router.get("/{expense_id}", response_model=ExpenseDetailResponse)
@@ -37,7 +55,7 @@ async def get_expense(
 ) -> ExpenseDetailResponse:
     try:
         expense, category_name, account_name = (
-            transaction_service.get_detail_by_id_and_user(
+            await transaction_service.get_detail_by_id_and_user(
                 transaction_type="expense",
                 transaction_id=expense_id,
                 user_id=current_user.id,
@@ -47,7 +65,7 @@ async def get_expense(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
     return ExpenseDetailResponse(
-        id=expense.id,
+        id=expense.public_id,
         amount=expense.amount,
         category_id=expense.category_id or 0,
         category_name=category_name if category_name else "Uncategorized",
@@ -67,13 +85,14 @@ async def create_expense(
     expense_data: ExpenseCreateRequest,
 ) -> ExpenseCreateResponse:
     try:
-        created_expense, category_name, account_name = transaction_service.create(
+        created_expense, category_name, account_name = await transaction_service.create(
             transaction_type="expense",
             amount=expense_data.amount,
             category_id=expense_data.category_id,
             account_id=expense_data.account_id,
             description=expense_data.description,
             user_id=current_user.id,
+            date_time=expense_data.date_time,
         )
     except ValueError as e:
         error = str(e)
@@ -85,8 +104,8 @@ async def create_expense(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
     return ExpenseCreateResponse(
-        expense=ExpenseDetailResponse(
-            id=created_expense.id,
+        created_item=ExpenseDetailResponse(
+            id=created_expense.public_id,
             amount=created_expense.amount,
             category_id=created_expense.category_id,
             category_name=category_name if category_name else "Uncategorized",
@@ -108,10 +127,13 @@ async def update_expense(
     try:
         update_data = expense_data.model_dump(exclude_none=True)
 
-        updated_transaction, category_name, account_name = transaction_service.update(
-            transaction_id=expense_id,
-            user_id=current_user.id,
-            **update_data,
+        updated_transaction, category_name, account_name = (
+            await transaction_service.update(
+                transaction_type="expense",
+                transaction_id=expense_id,
+                user_id=current_user.id,
+                **update_data,
+            )
         )
     except ValueError as e:
         error = str(e)
@@ -121,7 +143,7 @@ async def update_expense(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
     return ExpenseDetailResponse(
-        id=updated_transaction.id,
+        id=updated_transaction.public_id,
         amount=updated_transaction.amount,
         category_id=updated_transaction.category_id,
         category_name=category_name if category_name else "Uncategorized",
@@ -139,7 +161,7 @@ async def delete_expense(
     expense_id: int,
 ) -> None:
     try:
-        transaction_service.delete(
+        await transaction_service.delete(
             transaction_type="expense",
             transaction_id=expense_id,
             user_id=current_user.id,
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from app.core.dependencies import UserAuthenticationDep, ExportServiceDep
+from app.core.export_formats import EXPORT_FORMATS, parquet_available
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.get("/ledger", response_class=StreamingResponse)
+async def export_ledger(
+    current_user: UserAuthenticationDep,
+    export_service: ExportServiceDep,
+    file_format: Literal["csv", "ndjson", "parquet"] = Query(
+        default="csv", alias="format"
+    ),
+    date_from: datetime | None = Query(default=None),
+    date_to: datetime | None = Query(default=None),
+) -> StreamingResponse:
+    # checked up front, once the stream starts the status code is already sent
+    if file_format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export needs pyarrow installed on the server",
+        )
+
+    _, media_type = EXPORT_FORMATS[file_format]
+    chunks = export_service.stream(
+        "export_ledger",
+        file_format=file_format,
+        user_id=current_user.id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="ledger.{file_format}"'},
+    )
@@ -0,0 +1,58 @@
+import io
+from typing import Literal
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, status
+from app.core.dependencies import UserAuthenticationDep, ImportServiceDep
+from app.schemas.v1.import_schema import ImportResponse, ImportRowError
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+@router.post("/transactions", response_model=ImportResponse)
+async def import_transactions(
+    current_user: UserAuthenticationDep,
+    import_service: ImportServiceDep,
+    file: UploadFile = File(...),
+    file_format: Literal["csv", "ofx", "qif"] | None = Query(
+        default=None, alias="format"
+    ),
+    account_id: int | None = Query(default=None),
+    income_category_id: int | None = Query(default=None),
+    expense_category_id: int | None = Query(default=None),
+) -> ImportResponse:
+    # no ?format= means go by the file extension
+    if file_format is None:
+        file_format = (file.filename or "").rsplit(".", 1)[-1].lower()
+
+    # the upload is already spooled to disk, read it back line by line
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+
+    try:
+        summary = await import_service.import_transactions(
+            file_format=file_format,
+            lines=lines,
+            user_id=current_user.id,
+            account_id=account_id,
+            income_category_id=income_category_id,
+            expense_category_id=expense_category_id,
+        )
+    except ValueError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
+        elif "invalid category" in error.lower():
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    finally:
+        # leave the underlying file to UploadFile
+        lines.detach()
+
+    return ImportResponse(
+        imported_count=summary.income_count + summary.expense_count,
+        income_count=summary.income_count,
+        expense_count=summary.expense_count,
+        error_count=summary.error_count,
+        errors=[
+            ImportRowError(line=line, error=error) for line, error in summary.errors
+        ],
+    )
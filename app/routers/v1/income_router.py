@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from app.core.dependencies import UserAuthenticationDep, TransactionServiceDep
+from app.core.fast_json import json_rows_response
 from app.schemas.v1.income_schema import (
     IncomeCreateRequest,
     IncomeUpdateRequest,
@@ -7,26 +9,42 @@ from app.schemas.v1.income_schema import (
     IncomeDetailResponse,
     IncomeCreateResponse,
 )
+from app.schemas.v1.transaction_schema import TransactionListQuery
 
 router = APIRouter(prefix="/incomes", tags=["incomes"])
 
 
 @router.get("/", response_model=list[IncomeListResponse])
 async def get_incomes(
-    current_user: UserAuthenticationDep, transaction_service: TransactionServiceDep
-) -> list[IncomeListResponse]:
-    incomes = transaction_service.list_by_user("income", current_user.id)
-
-    return [
-        IncomeListResponse(
-            id=income.id,
-            amount=income.amount,
-            category_name=category_name if category_name else "Uncategorized",
-            account_name=account_name if account_name else "Cash",
-            date_time=income.date_time,
+    current_user: UserAuthenticationDep,
+    transaction_service: TransactionServiceDep,
+    query: Annotated[TransactionListQuery, Query()],
+) -> Response:
+    try:
+        incomes, next_cursor = await transaction_service.list_by_user(
+            "income", current_user.id, **query.model_dump()
         )
-        for income, category_name, account_name in incomes
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # body stays a plain list, the next page is advertised in a header
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+
+    # rows go straight to JSON in the IncomeListResponse shape (still the documented
+    # response_model), one model per row would be built and validated twice
+    return json_rows_response(
+        [
+            {
+                "id": income.public_id,
+                "amount": income.amount,
+                "category_name": category_name if category_name else "Uncategorized",
+                "account_name": account_name if account_name else "Cash",
+                "date_time": income.date_time,
+            }
+            for income, category_name, account_name in incomes
+        ],
+        headers,
+    )
 
 
 @router.get("/{income_id}", response_model=IncomeDetailResponse)
@@ -37,7 +55,7 @@ async def get_income(
 ) -> IncomeDetailResponse:
     try:
         income, category_name, account_name = (
-            transaction_service.get_detail_by_id_and_user(
+            await transaction_service.get_detail_by_id_and_user(
                 transaction_type="income",
                 transaction_id=income_id,
                 user_id=current_user.id,
@@ -47,7 +65,7 @@ async def get_income(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
     return IncomeDetailResponse(
-        id=income.id,
+        id=income.public_id,
         amount=income.amount,
         category_id=income.category_id or 0,
         category_name=category_name if category_name else "Uncategorized",
@@ -67,13 +85,14 @@ async def create_income(
     income_data: IncomeCreateRequest,
 ) -> IncomeCreateResponse:
     try:
-        created_income, category_name, account_name = transaction_service.create(
+        created_income, category_name, account_name = await transaction_service.create(
             transaction_type="income",
             amount=income_data.amount,
             category_id=income_data.category_id,
             account_id=income_data.account_id,
             description=income_data.description,
             user_id=current_user.id,
+            date_time=income_data.date_time,
         )
     except ValueError as e:
         error = str(e)
@@ -85,8 +104,8 @@ async def create_income(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
     return IncomeCreateResponse(
-        income=IncomeDetailResponse(
-            id=created_income.id,
+        created_item=IncomeDetailResponse(
+            id=created_income.public_id,
             amount=created_income.amount,
             category_id=created_income.category_id or 0,
             category_name=category_name if category_name else "Uncategorized",
@@ -108,10 +127,13 @@ async def update_income(
     try:
         update_data = income_data.model_dump(exclude_none=True)
 
-        updated_transaction, category_name, account_name = transaction_service.update(
-            transaction_id=income_id,
-            user_id=current_user.id,
-            **update_data,
+        updated_transaction, category_name, account_name = (
+            await transaction_service.update(
+                transaction_type="income",
+                transaction_id=income_id,
+                user_id=current_user.id,
+                **update_data,
+            )
         )
     except ValueError as e:
         error = str(e)
@@ -121,7 +143,7 @@ async def update_income(
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
 
     return IncomeDetailResponse(
-        id=updated_transaction.id,
+        id=updated_transaction.public_id,
         amount=updated_transaction.amount,
         category_id=updated_transaction.category_id,
         category_name=category_name if category_name else "Uncategorized",
@@ -139,7 +161,7 @@ async def delete_income(
     income_id: int,
 ) -> None:
     try:
-        transaction_service.delete(
+        await transaction_service.delete(
             transaction_type="income",
             transaction_id=income_id,
             user_id=current_user.id,
@@ -0,0 +1,107 @@
+from fastapi import APIRouter, HTTPException, status
+from app.core.dependencies import UserAuthenticationDep, RecurringServiceDep
+from app.schemas.v1.recurring_schema import (
+    RecurringRuleCreateRequest,
+    RecurringRuleResponse,
+    RecurringRuleCreateResponse,
+)
+
+router = APIRouter(prefix="/recurring-rules", tags=["recurring rules"])
+
+
+@router.get("/", response_model=list[RecurringRuleResponse])
+async def get_recurring_rules(
+    current_user: UserAuthenticationDep,
+    recurring_service: RecurringServiceDep,
+) -> list[RecurringRuleResponse]:
+    rules = await recurring_service.list_by_user(current_user.id)
+
+    return [
+        _rule_response(rule, category_name, account_name)
+        for rule, category_name, account_name in rules
+    ]
+
+
+@router.get("/{rule_id}", response_model=RecurringRuleResponse)
+async def get_recurring_rule(
+    current_user: UserAuthenticationDep,
+    recurring_service: RecurringServiceDep,
+    rule_id: int,
+) -> RecurringRuleResponse:
+    try:
+        rule, category_name, account_name = (
+            await recurring_service.get_detail_by_id_and_user(rule_id, current_user.id)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return _rule_response(rule, category_name, account_name)
+
+
+@router.post(
+    "/",
+    response_model=RecurringRuleCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_recurring_rule(
+    current_user: UserAuthenticationDep,
+    recurring_service: RecurringServiceDep,
+    rule_data: RecurringRuleCreateRequest,
+) -> RecurringRuleCreateResponse:
+    try:
+        rule, category_name, account_name = await recurring_service.create(
+            transaction_type=rule_data.kind,
+            amount=rule_data.amount,
+            category_id=rule_data.category_id,
+            account_id=rule_data.account_id,
+            description=rule_data.description,
+            frequency=rule_data.frequency,
+            interval=rule_data.interval,
+            starts_at=rule_data.starts_at,
+            until=rule_data.until,
+            user_id=current_user.id,
+        )
+    except ValueError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
+        elif "invalid category" in error.lower():
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    return RecurringRuleCreateResponse(
+        created_item=_rule_response(rule, category_name, account_name)
+    )
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_rule(
+    current_user: UserAuthenticationDep,
+    recurring_service: RecurringServiceDep,
+    rule_id: int,
+) -> None:
+    try:
+        await recurring_service.delete(rule_id=rule_id, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+def _rule_response(
+    rule, category_name: str | None, account_name: str | None
+) -> RecurringRuleResponse:
+    return RecurringRuleResponse(
+        id=rule.id,
+        kind=rule.kind,
+        amount=rule.amount,
+        category_id=rule.category_id,
+        category_name=category_name if category_name else "Uncategorized",
+        account_id=rule.account_id,
+        account_name=account_name if account_name else "Cash",
+        description=rule.description,
+        frequency=rule.frequency,
+        interval=rule.interval,
+        starts_at=rule.starts_at,
+        until=rule.until,
+        next_run=rule.next_run,
+    )
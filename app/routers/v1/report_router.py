@@ -0,0 +1,55 @@
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, status
+from app.core.dependencies import UserAuthenticationDep, ReportServiceDep
+from app.schemas.v1.report_schema import ReportSeriesPoint
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/transactions", response_model=list[ReportSeriesPoint])
+async def get_transaction_report(
+    current_user: UserAuthenticationDep,
+    report_service: ReportServiceDep,
+    bucket: Literal["day", "week", "month", "year"] = Query(default="month"),
+    kind: Literal["income", "expense"] | None = Query(default=None),
+    date_from: date | None = Query(default=None),
+    date_to: date | None = Query(default=None),
+    group_by: list[Literal["category", "account"]] = Query(default=[]),
+) -> list[ReportSeriesPoint]:
+    try:
+        rows = await report_service.transaction_series(
+            user_id=current_user.id,
+            bucket=bucket,
+            kind=kind,
+            date_from=date_from,
+            date_to=date_to,
+            group_by=group_by,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return [
+        ReportSeriesPoint(
+            bucket=bucket_start,
+            kind=row_kind,
+            category_id=category_id,
+            category_name=category_name,
+            account_id=account_id,
+            account_name=account_name,
+            total=total,
+            count=count,
+            average=average,
+        )
+        for (
+            bucket_start,
+            row_kind,
+            category_id,
+            category_name,
+            account_id,
+            account_name,
+            total,
+            count,
+            average,
+        ) in rows
+    ]
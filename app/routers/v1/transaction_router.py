@@ -0,0 +1,43 @@
+from typing import Annotated
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from app.core.dependencies import UserAuthenticationDep, TransactionServiceDep
+from app.core.fast_json import json_rows_response
+from app.schemas.v1.transaction_schema import (
+    TransactionSearchQuery,
+    TransactionSearchResponse,
+)
+
+router = APIRouter(prefix="/transactions", tags=["transactions"])
+
+
+@router.get("/search", response_model=list[TransactionSearchResponse])
+async def search_transactions(
+    current_user: UserAuthenticationDep,
+    transaction_service: TransactionServiceDep,
+    query: Annotated[TransactionSearchQuery, Query()],
+) -> Response:
+    try:
+        matches, next_cursor = await transaction_service.search(
+            current_user.id, **query.model_dump()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # best match first, the next page is advertised in a header like the lists
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+
+    return json_rows_response(
+        [
+            {
+                "id": transaction.public_id,
+                "kind": transaction.kind,
+                "amount": transaction.amount,
+                "category_name": category_name if category_name else "Uncategorized",
+                "account_name": account_name if account_name else "Cash",
+                "description": transaction.description,
+                "date_time": transaction.date_time,
+            }
+            for transaction, category_name, account_name, _ in matches
+        ],
+        headers,
+    )
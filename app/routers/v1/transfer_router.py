@@ -0,0 +1,147 @@
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from app.core.dependencies import UserAuthenticationDep, TransferServiceDep
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.schemas.v1.transfer_schema import (
+    TransferCreateRequest,
+    TransferPatchRequest,
+    TransferListResponse,
+    TransferDetailResponse,
+    TransferCreateResponse,
+)
+
+router = APIRouter(prefix="/transfers", tags=["transfers"])
+
+
+@router.get("/", response_model=list[TransferListResponse])
+async def get_transfers(
+    current_user: UserAuthenticationDep,
+    transfer_service: TransferServiceDep,
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+) -> list[TransferListResponse]:
+    try:
+        transfers, next_cursor = await transfer_service.list_by_user(
+            current_user.id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return [
+        TransferListResponse(
+            id=transfer.id,
+            amount=transfer.amount,
+            from_account_name=from_account_name,
+            to_account_name=to_account_name,
+            date_time=transfer.date_time,
+        )
+        for transfer, from_account_name, to_account_name in transfers
+    ]
+
+
+@router.get("/{transfer_id}", response_model=TransferDetailResponse)
+async def get_transfer(
+    current_user: UserAuthenticationDep,
+    transfer_service: TransferServiceDep,
+    transfer_id: int,
+) -> TransferDetailResponse:
+    try:
+        transfer, from_account_name, to_account_name = (
+            await transfer_service.get_detail_by_id_and_user(
+                transfer_id=transfer_id, user_id=current_user.id
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return _detail_response(transfer, from_account_name, to_account_name)
+
+
+@router.post(
+    "/", response_model=TransferCreateResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_transfer(
+    current_user: UserAuthenticationDep,
+    transfer_service: TransferServiceDep,
+    transfer_data: TransferCreateRequest,
+) -> TransferCreateResponse:
+    try:
+        created_transfer, from_account_name, to_account_name = (
+            await transfer_service.create(
+                amount=transfer_data.amount,
+                from_account_id=transfer_data.from_account_id,
+                to_account_id=transfer_data.to_account_id,
+                description=transfer_data.description,
+                user_id=current_user.id,
+                date_time=transfer_data.date_time,
+            )
+        )
+    except ValueError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    return TransferCreateResponse(
+        created_item=_detail_response(
+            created_transfer, from_account_name, to_account_name
+        ),
+    )
+
+
+@router.patch("/{transfer_id}", response_model=TransferDetailResponse)
+async def update_transfer(
+    current_user: UserAuthenticationDep,
+    transfer_service: TransferServiceDep,
+    transfer_id: int,
+    transfer_data: TransferPatchRequest,
+) -> TransferDetailResponse:
+    try:
+        update_data = transfer_data.model_dump(exclude_none=True)
+
+        updated_transfer, from_account_name, to_account_name = (
+            await transfer_service.update(
+                transfer_id=transfer_id,
+                user_id=current_user.id,
+                **update_data,
+            )
+        )
+    except ValueError as e:
+        error = str(e)
+        if "not found" in error.lower():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=error)
+        else:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+
+    return _detail_response(updated_transfer, from_account_name, to_account_name)
+
+
+@router.delete("/{transfer_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_transfer(
+    current_user: UserAuthenticationDep,
+    transfer_service: TransferServiceDep,
+    transfer_id: int,
+) -> None:
+    try:
+        await transfer_service.delete(transfer_id=transfer_id, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+def _detail_response(
+    transfer, from_account_name: str, to_account_name: str
+) -> TransferDetailResponse:
+    return TransferDetailResponse(
+        id=transfer.id,
+        amount=transfer.amount,
+        from_account_id=transfer.from_account_id,
+        from_account_name=from_account_name,
+        to_account_id=transfer.to_account_id,
+        to_account_name=to_account_name,
+        description=transfer.description,
+        date_time=transfer.date_time,
+    )
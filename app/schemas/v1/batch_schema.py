@@ -0,0 +1,32 @@
+from typing import Any, Literal
+from pydantic import BaseModel
+
+BatchMethod = Literal["POST", "PATCH", "DELETE"]
+BatchResource = Literal[
+    "incomes", "expenses", "transfers", "categories", "accounts", "budgets"
+]
+
+
+class BatchOperation(BaseModel):
+    method: BatchMethod
+    resource: BatchResource
+    # required for PATCH/DELETE
+    id: int | None = None
+    # same fields as the resource's own POST/PATCH request body
+    body: dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation]
+
+
+class BatchResult(BaseModel):
+    index: int
+    method: BatchMethod
+    resource: BatchResource
+    id: int | None
+
+
+class BatchResponse(BaseModel):
+    message: str = "Batch applied successfully"
+    results: list[BatchResult]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResponse(BaseModel):
+    message: str = "Import finished"
+    imported_count: int
+    income_count: int
+    expense_count: int
+    error_count: int
+    # capped at IMPORT_MAX_ERRORS, error_count has the full number
+    errors: list[ImportRowError]
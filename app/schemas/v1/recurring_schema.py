@@ -0,0 +1,39 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+
+
+class RecurringRuleCreateRequest(BaseModel):
+    kind: Literal["income", "expense"]
+    amount: Decimal
+    category_id: int
+    account_id: int
+    description: str | None = None
+    # RRULE FREQ and INTERVAL, every `interval` days/weeks/months/years from starts_at
+    frequency: Literal["daily", "weekly", "monthly", "yearly"]
+    interval: int = Field(default=1, ge=1)
+    starts_at: datetime
+    until: datetime | None = None
+
+
+class RecurringRuleResponse(BaseModel):
+    id: int
+    kind: str
+    amount: Decimal
+    category_id: int | None
+    category_name: str
+    account_id: int
+    account_name: str
+    description: str | None
+    frequency: str
+    interval: int
+    starts_at: datetime
+    until: datetime | None
+    # None once the rule is past until
+    next_run: datetime | None
+
+
+class RecurringRuleCreateResponse(BaseModel):
+    message: str = "Recurring rule created successfully"
+    created_item: RecurringRuleResponse
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import date
+from decimal import Decimal
+
+
+class ReportSeriesPoint(BaseModel):
+    bucket: date
+    kind: str
+    # only set when grouped by category (None = uncategorised) / account
+    category_id: int | None = None
+    category_name: str | None = None
+    account_id: int | None = None
+    account_name: str | None = None
+    total: Decimal
+    count: int
+    average: Decimal
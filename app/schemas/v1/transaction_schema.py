@@ -0,0 +1,33 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+# query string for GET /incomes and GET /expenses, date range is [date_from, date_to)
+class TransactionListQuery(BaseModel):
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    account_id: int | None = None
+    category_id: int | None = None
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+
+
+# query string for GET /transactions/search, the list filters plus the words to look for
+class TransactionSearchQuery(TransactionListQuery):
+    q: str = Field(min_length=1, max_length=200)
+    kind: Literal["income", "expense"] | None = None
+
+
+class TransactionSearchResponse(BaseModel):
+    id: int
+    kind: str
+    amount: Decimal
+    category_name: str
+    account_name: str
+    description: str | None
+    date_time: datetime
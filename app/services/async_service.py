@@ -0,0 +1,48 @@
+from typing import Generic, TypeVar
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.database import run_in_session, iterate_in_session, release_connection
+from app.repositories.unit_of_work import unit_of_work
+
+ServiceT = TypeVar("ServiceT")
+
+
+class AsyncService(Generic[ServiceT]):
+    """awaitable variant of a sync service, every public method becomes a coroutine
+
+    the service (and its repositories) are built on the sync side of the session so the
+    same code runs on psycopg2 in the threadpool or on asyncpg/aiosqlite via run_sync
+    """
+
+    def __init__(self, service_class: type[ServiceT], session: Session | AsyncSession):
+        self._service_class = service_class
+        self._session = session
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            # one unit of work per call: every write the method stages is committed once,
+            # inside the same hop, before the router builds the response
+            def invoke(sync_session: Session):
+                with unit_of_work(sync_session):
+                    service = self._service_class(sync_session)
+                    return getattr(service, name)(*args, **kwargs)
+
+            return await run_in_session(self._session, invoke)
+
+        return call
+
+    async def release_connection(self) -> None:
+        """hand the session's connection back between two calls, see release_connection"""
+        await release_connection(self._session)
+
+    def stream(self, name: str, *args, **kwargs):
+        """async iterator over a generator method, for responses that stream from the db"""
+
+        def invoke(sync_session: Session):
+            service = self._service_class(sync_session)
+            return getattr(service, name)(*args, **kwargs)
+
+        return iterate_in_session(self._session, invoke)
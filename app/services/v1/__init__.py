@@ -2,5 +2,13 @@ from .auth_service import AuthService
 from .category_service import CategoryService
 from .account_service import AccountService
 from .transaction_service import TransactionService
+from .transfer_service import TransferService
+from .budget_service import BudgetService
+from .import_service import ImportService
+from .export_service import ExportService
+from .batch_service import BatchService
+from .report_service import ReportService
+from .partition_service import PartitionService
+from .recurring_service import RecurringService
 
 # expose v1 services at package level for clean imports
@@ -2,15 +2,23 @@ from sqlmodel import Session
 from app.models import Account
 from decimal import Decimal
 from app.repositories.account_repository import AccountRepository
-from app.repositories.income_repository import IncomeRepository
-from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.transfer_repository import TransferRepository
+from app.repositories.recurring_repository import RecurringRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.unit_of_work import unit_of_work
 
 
 class AccountService:
     def __init__(self, session: Session):
+        self.session = session
         self.account_repo = AccountRepository(session)
-        self.income_repo = IncomeRepository(session)
-        self.expense_repo = ExpenseRepository(session)
+        self.transaction_repo = TransactionRepository(session)
+        self.transfer_repo = TransferRepository(session)
+        self.recurring_repo = RecurringRepository(session)
+        self.report_repo = ReportRepository(session)
+        self.user_repo = UserRepository(session)
 
     def list_by_user(self, user_id: int) -> list[Account]:
         return self.account_repo.get_all_by_user(user_id)
@@ -28,28 +36,73 @@ class AccountService:
         if account is None:
             raise ValueError("Account not found")
 
-        total_income = self.income_repo.get_total_balance_by_account(account_id)
-        total_expense = self.expense_repo.get_total_balance_by_account(account_id)
+        return account.current_balance
 
-        return account.initial_balance + total_income - total_expense
+    def income_and_expense_totals(self, user_id: int) -> tuple[Decimal, Decimal]:
+        return self.account_repo.get_income_and_expense_totals_by_user(user_id)
 
     def total_balance_on_all_accounts(self, user_id: int) -> Decimal:
-        total_income = self.income_repo.get_total_balance_across_accounts_by_user(
-            user_id
-        )
-        total_expense = self.expense_repo.get_total_balance_across_accounts_by_user(
-            user_id
-        )
-        total_initial_balance = self.account_repo.get_total_initial_balance_by_user(
-            user_id
-        )
-
-        return total_initial_balance + total_income - total_expense
+        return self.account_repo.get_total_current_balance_by_user(user_id)
+
+    def reconcile_balances(
+        self, fix: bool = False
+    ) -> list[tuple[Account, Decimal, Decimal]]:
+        """recompute every account from its transactions, returns (account, stored, expected) for drifted ones
+
+        --fix adds the difference (expected - stored, read in the same statement) like
+        any write does, a transaction written meanwhile keeps its own delta
+        """
+        drifted = []
+
+        # --fix writes every drifted account in one commit, the users are bumped last
+        with unit_of_work(self.session), self.user_repo.deferred_data_versions():
+            for (
+                account,
+                total_income,
+                total_expense,
+                transfers_in,
+                transfers_out,
+            ) in self.account_repo.get_recomputed_balances():
+                expected = (
+                    account.initial_balance
+                    + total_income
+                    - total_expense
+                    + transfers_in
+                    - transfers_out
+                )
+                stored = account.current_balance
+
+                if (stored, account.total_income, account.total_expense) == (
+                    expected,
+                    total_income,
+                    total_expense,
+                ):
+                    continue
+
+                drifted.append((account, stored, expected))
+
+                if fix:
+                    income_delta = total_income - account.total_income
+                    expense_delta = total_expense - account.total_expense
+                    self.account_repo.apply_balance_delta(
+                        account.id,
+                        income_delta=income_delta,
+                        expense_delta=expense_delta,
+                        # whatever is left of the balance's drift
+                        transfer_delta=expected - stored - income_delta + expense_delta,
+                    )
+                    self.user_repo.bump_data_version(account.user_id)
+
+        return drifted
 
     def create(self, name: str, initial_balance: Decimal, user_id: int) -> Account:
         new_account = Account(
-            name=name, initial_balance=initial_balance, user_id=user_id
+            name=name,
+            initial_balance=initial_balance,
+            current_balance=initial_balance,
+            user_id=user_id,
         )
+        self.user_repo.bump_data_version(user_id)
 
         return self.account_repo.save(new_account)
 
@@ -62,7 +115,12 @@ class AccountService:
         if name is not None:
             account.name = name
 
-        return self.account_repo.save(account)
+        # accounts before users, the order every transaction write locks them in
+        with unit_of_work(self.session):
+            saved = self.account_repo.save(account)
+            self.user_repo.bump_data_version(user_id)
+
+        return saved
 
     def delete(self, account_id: int, user_id: int) -> None:
         account = self.account_repo.get_by_id_and_user(account_id, user_id)
@@ -70,9 +128,16 @@ class AccountService:
         if account is None:
             raise ValueError("Account not found")
 
-        if self.income_repo.exists_by_account(
-            account_id
-        ) or self.expense_repo.exists_by_account(account_id):
+        if (
+            self.transaction_repo.exists_by_account(account_id)
+            or self.transfer_repo.exists_by_account(account_id)
+            or self.recurring_repo.exists_by_account(account_id)
+        ):
             raise ValueError("Cannot delete account that is in use")
 
-        self.account_repo.delete(account)
+        # only zeroed report rows can be left at this point, drop them with the account
+        with unit_of_work(self.session):
+            self.report_repo.delete_by_account(account_id, user_id)
+            self.account_repo.delete(account)
+            # last, accounts before users as every transaction write locks them
+            self.user_repo.bump_data_version(user_id)
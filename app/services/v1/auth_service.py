@@ -2,20 +2,20 @@ from sqlmodel import Session
 from app.models import User, Account
 from app.repositories.user_repository import UserRepository
 from app.repositories.account_repository import AccountRepository
-from app.core.auth_core import create_access_token
 
 
+# bcrypt runs in the router (see password_core.hash_password_async), these only ever get
+# hashes, so no session is open while a password is hashed or checked
 class AuthService:
     def __init__(self, session: Session):
         self.user_repo = UserRepository(session)
         self.account_repo = AccountRepository(session)
 
-    def register_user(self, username: str, password: str) -> User:
+    def register_user(self, username: str, password_hash: str) -> User:
         if self.user_repo.get_by_username(username):
             raise ValueError("Username already exists")
 
-        new_user = User(username=username)
-        new_user.set_password(password)
+        new_user = User(username=username, password_hash=password_hash)
         self.user_repo.save(new_user)
 
         # default transaction account for new user
@@ -24,12 +24,16 @@ class AuthService:
 
         return new_user
 
-    def login(self, username: str, password: str) -> str:
+    def get_login_user(self, username: str) -> User:
         user = self.user_repo.get_by_username(username)
-
-        if not user or not user.verify_password(password):
+        if user is None:
             raise ValueError("Invalid username or password")
 
-        access_token = create_access_token(username=user.username)
+        return user
 
-        return access_token
+    def update_password_hash(self, user_id: int, password_hash: str) -> None:
+        """store a hash made with the current cost factor"""
+        user = self.user_repo.get_by_id(user_id)
+        if user is not None:
+            user.password_hash = password_hash
+            self.user_repo.save(user)
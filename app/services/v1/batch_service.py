@@ -0,0 +1,179 @@
+from decouple import config
+from sqlmodel import Session
+from app.repositories.account_repository import AccountRepository
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.income_repository import IncomeRepository
+from app.repositories.transfer_repository import TransferRepository
+from app.repositories.unit_of_work import unit_of_work
+from app.repositories.user_repository import UserRepository
+from app.services.v1.account_service import AccountService
+from app.services.v1.budget_service import BudgetService
+from app.services.v1.category_service import CategoryService
+from app.services.v1.transaction_service import TransactionService
+from app.services.v1.transfer_service import TransferService
+
+# operations accepted in one POST /batch
+BATCH_MAX_OPERATIONS = config("BATCH_MAX_OPERATIONS", default=100, cast=int)
+
+# body fields that point at an account
+_ACCOUNT_FIELDS = ("account_id", "from_account_id", "to_account_id")
+
+
+class BatchOperationError(ValueError):
+    """an operation of the batch failed, nothing of the batch was written"""
+
+    def __init__(self, index: int, error: str):
+        super().__init__(error)
+        self.index = index
+
+
+class BatchService:
+    def __init__(self, session: Session):
+        self.session = session
+        self.category_service = CategoryService(session)
+        self.account_service = AccountService(session)
+        self.transaction_service = TransactionService(session)
+        self.transfer_service = TransferService(session)
+        self.budget_service = BudgetService(session)
+        self.account_repo = AccountRepository(session)
+        self.income_repo = IncomeRepository(session)
+        self.expense_repo = ExpenseRepository(session)
+        self.transfer_repo = TransferRepository(session)
+        self.user_repo = UserRepository(session)
+
+    def apply(
+        self, user_id: int, operations: list[tuple[str, str, int | None, dict]]
+    ) -> list[int | None]:
+        """run (method, resource, id, body) operations in order, all or nothing
+
+        every write is staged in a single unit of work, so the whole batch costs one
+        commit. returns the id of the row each operation touched (None for deletes)
+
+        locks go in the order of a single write: the rows addressed, every account the
+        batch touches (in id order) and the users row last, bumped once for the batch
+        """
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            raise ValueError(
+                f"Too many operations, at most {BATCH_MAX_OPERATIONS} per batch"
+            )
+
+        results = []
+        with unit_of_work(self.session), self.user_repo.deferred_data_versions():
+            self._lock_accounts(user_id, operations)
+            for index, (method, resource, item_id, body) in enumerate(operations):
+                try:
+                    results.append(
+                        self._apply_one(user_id, method, resource, item_id, body)
+                    )
+                except ValueError as e:
+                    raise BatchOperationError(index, str(e)) from e
+
+        return results
+
+    # PRIVATE helper methods
+    def _lock_accounts(
+        self, user_id: int, operations: list[tuple[str, str, int | None, dict]]
+    ) -> None:
+        """row lock the accounts of every operation before the first one runs
+
+        the incomes, expenses and transfers a PATCH/DELETE addresses are locked first
+        (ordered too) to find the accounts they are on now. ids that do not exist are
+        left for the operation itself to report
+        """
+        account_ids = set()
+        addressed = set()
+        for method, resource, item_id, body in operations:
+            account_ids.update(
+                body[field] for field in _ACCOUNT_FIELDS if body.get(field) is not None
+            )
+            if method == "POST":
+                continue
+            if resource == "accounts":
+                account_ids.add(item_id)
+            elif resource in ("incomes", "expenses", "transfers"):
+                addressed.add((resource, item_id))
+
+        for resource, item_id in sorted(addressed):
+            if resource == "transfers":
+                transfer = self.transfer_repo.lock_by_id_and_user(item_id, user_id)
+                if transfer is not None:
+                    account_ids.update(
+                        (transfer.from_account_id, transfer.to_account_id)
+                    )
+                continue
+            repo = self.income_repo if resource == "incomes" else self.expense_repo
+            transaction = repo.lock_by_id_and_user(item_id, user_id)
+            if transaction is not None:
+                account_ids.add(transaction.account_id)
+
+        if account_ids:
+            self.account_repo.lock_by_ids_and_user(sorted(account_ids), user_id)
+
+    def _apply_one(
+        self, user_id: int, method: str, resource: str, item_id: int | None, body: dict
+    ) -> int | None:
+        if resource in ("incomes", "expenses"):
+            transaction_type = "income" if resource == "incomes" else "expense"
+            if method == "POST":
+                transaction, _, _ = self.transaction_service.create(
+                    transaction_type=transaction_type, user_id=user_id, **body
+                )
+                return transaction.public_id
+            if method == "PATCH":
+                transaction, _, _ = self.transaction_service.update(
+                    transaction_type=transaction_type,
+                    transaction_id=item_id,
+                    user_id=user_id,
+                    **body,
+                )
+                return transaction.public_id
+            self.transaction_service.delete(transaction_type, item_id, user_id)
+            return None
+
+        if resource == "transfers":
+            if method == "POST":
+                transfer, _, _ = self.transfer_service.create(user_id=user_id, **body)
+                return transfer.id
+            if method == "PATCH":
+                transfer, _, _ = self.transfer_service.update(
+                    transfer_id=item_id, user_id=user_id, **body
+                )
+                return transfer.id
+            self.transfer_service.delete(item_id, user_id)
+            return None
+
+        if resource == "categories":
+            if method == "POST":
+                return self.category_service.create(user_id=user_id, **body).id
+            if method == "PATCH":
+                return self.category_service.update(
+                    item_id, user_id, name=body.get("name"), type=body.get("type")
+                ).id
+            self.category_service.delete(item_id, user_id)
+            return None
+
+        if resource == "accounts":
+            if method == "POST":
+                return self.account_service.create(user_id=user_id, **body).id
+            if method == "PATCH":
+                return self.account_service.update(
+                    item_id, user_id, name=body.get("name")
+                ).id
+            self.account_service.delete(item_id, user_id)
+            return None
+
+        if resource == "budgets":
+            if method == "POST":
+                budget, _, _ = self.budget_service.create(user_id=user_id, **body)
+                return budget.id
+            if method == "PATCH":
+                budget, _, _ = self.budget_service.update(
+                    budget_id=item_id,
+                    user_id=user_id,
+                    limit_amount=body.get("limit_amount"),
+                )
+                return budget.id
+            self.budget_service.delete(item_id, user_id)
+            return None
+
+        raise ValueError(f"Unknown resource {resource!r}")
@@ -0,0 +1,100 @@
+from sqlmodel import Session
+from decimal import Decimal
+from app.models import Budget
+from app.repositories.budget_repository import BudgetRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.spend_rollup_repository import SpendRollupRepository
+from app.repositories.user_repository import UserRepository
+
+
+class BudgetService:
+    def __init__(self, session: Session):
+        self.budget_repo = BudgetRepository(session)
+        self.category_repo = CategoryRepository(session)
+        self.spend_repo = SpendRollupRepository(session)
+        self.user_repo = UserRepository(session)
+
+    def list_by_user(
+        self, user_id: int, year: int, month: int
+    ) -> list[tuple[Budget, str, Decimal]]:
+        return self.budget_repo.get_all_by_user_and_month_with_spent(
+            user_id, year, month
+        )
+
+    def get_detail_by_id_and_user(
+        self, budget_id: int, user_id: int
+    ) -> tuple[Budget, str, Decimal]:
+        budget = self.budget_repo.get_by_id_and_user_with_spent(budget_id, user_id)
+
+        if budget is None:
+            raise ValueError("Budget not found")
+
+        return budget
+
+    def create(
+        self,
+        category_id: int,
+        limit_amount: Decimal,
+        month: int,
+        year: int,
+        user_id: int,
+    ) -> tuple[Budget, str, Decimal]:
+        if limit_amount <= 0:
+            raise ValueError("Limit amount must be positive")
+
+        if not 1 <= month <= 12:
+            raise ValueError("Month must be between 1 and 12")
+
+        if not 2000 <= year <= 2100:
+            raise ValueError("Year must be between 2000 and 2100")
+
+        category = self.category_repo.get_by_id_and_user(category_id, user_id)
+        if category is None:
+            raise ValueError("Category not found")
+
+        if category.type != "expense":
+            raise ValueError("Invalid category, use a expense category")
+
+        if self.budget_repo.exists_for_month(user_id, category_id, year, month):
+            raise ValueError("Budget already exists for this category and month")
+
+        new_budget = Budget(
+            category_id=category_id,
+            limit_amount=limit_amount,
+            month=month,
+            year=year,
+            user_id=user_id,
+        )
+        self.user_repo.bump_data_version(user_id)
+        self.budget_repo.save(new_budget)
+
+        spent = self.spend_repo.get_spent(user_id, category_id, year, month)
+
+        return new_budget, category.name, spent
+
+    def update(
+        self, budget_id: int, user_id: int, limit_amount: Decimal | None
+    ) -> tuple[Budget, str, Decimal]:
+        budget = self.budget_repo.get_by_id_and_user(budget_id, user_id)
+
+        if budget is None:
+            raise ValueError("Budget not found")
+
+        if limit_amount is not None:
+            if limit_amount <= 0:
+                raise ValueError("Limit amount must be positive")
+            budget.limit_amount = limit_amount
+
+        self.user_repo.bump_data_version(user_id)
+        self.budget_repo.save(budget)
+
+        return self.get_detail_by_id_and_user(budget_id, user_id)
+
+    def delete(self, budget_id: int, user_id: int) -> None:
+        budget = self.budget_repo.get_by_id_and_user(budget_id, user_id)
+
+        if budget is None:
+            raise ValueError("Budget not found")
+
+        self.user_repo.bump_data_version(user_id)
+        self.budget_repo.delete(budget)
@@ -1,15 +1,23 @@
 from sqlmodel import Session
 from app.models import Category
 from app.repositories.category_repository import CategoryRepository
-from app.repositories.income_repository import IncomeRepository
-from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.budget_repository import BudgetRepository
+from app.repositories.recurring_repository import RecurringRepository
+from app.repositories.spend_rollup_repository import SpendRollupRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
 
 
 class CategoryService:
     def __init__(self, session: Session):
         self.category_repo = CategoryRepository(session)
-        self.income_repo = IncomeRepository(session)
-        self.expense_repo = ExpenseRepository(session)
+        self.transaction_repo = TransactionRepository(session)
+        self.budget_repo = BudgetRepository(session)
+        self.recurring_repo = RecurringRepository(session)
+        self.spend_repo = SpendRollupRepository(session)
+        self.report_repo = ReportRepository(session)
+        self.user_repo = UserRepository(session)
 
     def list_by_user(self, user_id: int) -> list[Category]:
         return self.category_repo.get_all_by_user(user_id)
@@ -28,6 +36,7 @@ class CategoryService:
             type=type,
             user_id=user_id,
         )
+        self.user_repo.bump_data_version(user_id)
 
         return self.category_repo.save(new_category)
 
@@ -40,12 +49,14 @@ class CategoryService:
             raise ValueError("Category not found")
 
         if type is not None and type != category.type:
-            if self.income_repo.exists_by_category(
-                category_id
-            ) or self.expense_repo.exists_by_category(category_id):
+            if self.transaction_repo.exists_by_category(category_id):
                 raise ValueError(
                     "Cannot change category type as it is already used by existing transactions"
                 )
+            if self.recurring_repo.exists_by_category(category_id):
+                raise ValueError(
+                    "Cannot change category type as it is already used by recurring rules"
+                )
 
         if name is not None:
             category.name = name
@@ -53,6 +64,7 @@ class CategoryService:
         if type is not None:
             category.type = type
 
+        self.user_repo.bump_data_version(user_id)
         return self.category_repo.save(category)
 
     def delete(self, category_id: int, user_id: int) -> None:
@@ -61,9 +73,15 @@ class CategoryService:
         if category is None:
             raise ValueError("Category not found")
 
-        if self.income_repo.exists_by_category(
-            category_id
-        ) or self.expense_repo.exists_by_category(category_id):
+        if (
+            self.transaction_repo.exists_by_category(category_id)
+            or self.budget_repo.exists_by_category(category_id)
+            or self.recurring_repo.exists_by_category(category_id)
+        ):
             raise ValueError("Cannot delete category that is in use")
 
+        # only zeroed rollup rows can be left at this point, drop them with the category
+        self.spend_repo.delete_by_category(category_id, user_id)
+        self.report_repo.delete_by_category(category_id, user_id)
+        self.user_repo.bump_data_version(user_id)
         self.category_repo.delete(category)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Iterator
+from decouple import config
+from sqlmodel import Session
+from app.core.export_formats import EXPORT_FORMATS
+from app.repositories.ledger_repository import LedgerRepository, LEDGER_COLUMNS
+
+# rows fetched from the cursor and encoded per chunk
+EXPORT_BATCH_SIZE = config("EXPORT_BATCH_SIZE", default=1000, cast=int)
+
+
+class ExportService:
+    def __init__(self, session: Session):
+        self.ledger_repo = LedgerRepository(session)
+
+    def export_ledger(
+        self,
+        file_format: str,
+        user_id: int,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> Iterator[bytes]:
+        """incomes, expenses and transfers oldest first, encoded chunk by chunk"""
+        writer, _ = EXPORT_FORMATS[file_format]
+        batches = self.ledger_repo.stream_by_user(
+            user_id, EXPORT_BATCH_SIZE, date_from, date_to
+        )
+
+        yield from writer(LEDGER_COLUMNS, batches, self.ledger_repo.column_types())
@@ -0,0 +1,237 @@
+import csv
+from collections import defaultdict
+from datetime import timezone
+from decimal import Decimal
+from typing import Iterable, Iterator, NamedTuple
+from decouple import config
+from sqlmodel import Session
+from app.core.statement_parsers import PARSERS, ParsedRow
+from app.database import iterate_off_loop
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.account_repository import AccountRepository
+from app.repositories.spend_rollup_repository import SpendRollupRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.unit_of_work import unit_of_work
+
+# rows per multi row INSERT
+IMPORT_BATCH_SIZE = config("IMPORT_BATCH_SIZE", default=1000, cast=int)
+# row errors echoed back, the rest are only counted
+IMPORT_MAX_ERRORS = config("IMPORT_MAX_ERRORS", default=100, cast=int)
+
+
+class ImportSummary(NamedTuple):
+    income_count: int
+    expense_count: int
+    error_count: int
+    errors: list[tuple[int, str]]
+
+
+class ImportService:
+    def __init__(self, session: Session):
+        self.session = session
+        self.transaction_repo = TransactionRepository(session)
+        self.category_repo = CategoryRepository(session)
+        self.account_repo = AccountRepository(session)
+        self.spend_repo = SpendRollupRepository(session)
+        self.report_repo = ReportRepository(session)
+        self.user_repo = UserRepository(session)
+
+    def import_transactions(
+        self,
+        file_format: str,
+        lines: Iterable[str],
+        user_id: int,
+        account_id: int | None = None,
+        income_category_id: int | None = None,
+        expense_category_id: int | None = None,
+    ) -> ImportSummary:
+        """stream a statement into incomes/expenses, all in one transaction
+
+        bad rows are skipped and reported by line, the good ones are inserted in
+        batches and their balance/budget effects are applied once per account/month
+        """
+        parser = PARSERS.get(file_format)
+        if parser is None:
+            raise ValueError(f"Unsupported file format {file_format!r}")
+
+        # two queries for the whole file instead of two per row
+        accounts = {
+            account.id for account in self.account_repo.get_all_by_user(user_id)
+        }
+        category_types = {
+            category.id: category.type
+            for category in self.category_repo.get_all_by_user(user_id)
+        }
+
+        if account_id is not None and account_id not in accounts:
+            raise ValueError("Account not found")
+
+        default_categories = {
+            "income": income_category_id,
+            "expense": expense_category_id,
+        }
+        for transaction_type, category_id in default_categories.items():
+            if category_id is None:
+                continue
+            if category_id not in category_types:
+                raise ValueError("Category not found")
+            if category_types[category_id] != transaction_type:
+                raise ValueError(f"Invalid category, use a {transaction_type} category")
+
+        totals = _ImportTotals(
+            user_id, account_id, accounts, category_types, default_categories
+        )
+        try:
+            # parsing (and reading the upload) runs on a worker thread one batch at a
+            # time, only the INSERTs run here, on the event loop in async mode
+            for batch in iterate_off_loop(totals.batches(parser(lines))):
+                self.transaction_repo.bulk_insert(batch)
+        except UnicodeDecodeError:
+            raise ValueError("File must be UTF-8 encoded")
+        except csv.Error as e:
+            raise ValueError(f"Malformed CSV file: {e}")
+
+        # the batches were only flushed above, this commits them with the totals
+        with unit_of_work(self.session):
+            # one UPDATE per account, one upsert per category month and report day
+            income_by_account = totals.income_by_account
+            expense_by_account = totals.expense_by_account
+            for row_account_id in sorted(
+                set(income_by_account) | set(expense_by_account)
+            ):
+                self.account_repo.apply_balance_delta(
+                    row_account_id,
+                    income_delta=income_by_account.get(row_account_id, Decimal("0")),
+                    expense_delta=expense_by_account.get(row_account_id, Decimal("0")),
+                )
+            for (category_id, year, month), amount in sorted(
+                totals.spend_by_month.items()
+            ):
+                self.spend_repo.add_spend(user_id, category_id, year, month, amount)
+            for key, (amount, count) in sorted(totals.report_by_day.items()):
+                self.report_repo.add(user_id, *key, amount, count)
+            if totals.counts["income"] or totals.counts["expense"]:
+                self.user_repo.bump_data_version(user_id)
+
+        return ImportSummary(
+            totals.counts["income"],
+            totals.counts["expense"],
+            totals.error_count,
+            totals.errors,
+        )
+
+
+class _ImportTotals:
+    """checks parsed rows and adds up their effects, no database involved
+
+    batches() turns the rows into INSERT batches, the counts, errors and per account,
+    month and day totals are complete once it is exhausted
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        account_id: int | None,
+        accounts: set[int],
+        category_types: dict[int, str],
+        default_categories: dict[str, int | None],
+    ):
+        self.user_id = user_id
+        self.account_id = account_id
+        self.accounts = accounts
+        self.category_types = category_types
+        self.default_categories = default_categories
+
+        self.counts = {"income": 0, "expense": 0}
+        self.income_by_account = defaultdict(Decimal)
+        self.expense_by_account = defaultdict(Decimal)
+        self.spend_by_month = defaultdict(Decimal)
+        # (kind, day, category_id, account_id) -> [total, count]
+        self.report_by_day = defaultdict(lambda: [Decimal("0"), 0])
+        self.errors = []
+        self.error_count = 0
+
+    def batches(self, parsed_rows: Iterable[ParsedRow]) -> Iterator[list[dict]]:
+        """IMPORT_BATCH_SIZE rows at a time (the last one shorter), incomes and
+        expenses go out together, each row carries its kind"""
+        batch = []
+        for parsed in parsed_rows:
+            row = self._add(parsed)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    # PRIVATE helper methods
+    def _add(self, parsed: ParsedRow) -> dict | None:
+        """the row to insert, None (and the error noted) when the row is bad"""
+        error = parsed.error
+        if error is None:
+            data = parsed.data
+            transaction_type = data["type"]
+            row_account_id = data.get("account_id") or self.account_id
+            row_category_id = (
+                data.get("category_id") or self.default_categories[transaction_type]
+            )
+
+            if data["amount"] <= 0:
+                error = "Amount must be positive"
+            elif row_account_id is None:
+                error = "Account is required"
+            elif row_account_id not in self.accounts:
+                error = "Account not found"
+            elif row_category_id is not None and (
+                row_category_id not in self.category_types
+            ):
+                error = "Category not found"
+            elif row_category_id is not None and (
+                self.category_types[row_category_id] != transaction_type
+            ):
+                error = f"Invalid category, use a {transaction_type} category"
+
+        if error is not None:
+            self.error_count += 1
+            if len(self.errors) < IMPORT_MAX_ERRORS:
+                self.errors.append((parsed.line, error))
+            return None
+
+        amount = data["amount"]
+        date_time = data["date_time"]
+        row = {
+            "kind": transaction_type,
+            "amount": amount,
+            "category_id": row_category_id,
+            "account_id": row_account_id,
+            "description": data.get("description"),
+            "date_time": date_time,
+            "user_id": self.user_id,
+        }
+        self.counts[transaction_type] += 1
+
+        # same UTC day/month bucketing as TransactionService._apply_effects
+        if date_time.tzinfo is not None:
+            date_time = date_time.astimezone(timezone.utc)
+
+        report = self.report_by_day[
+            (transaction_type, date_time.date(), row_category_id or 0, row_account_id)
+        ]
+        report[0] += amount
+        report[1] += 1
+
+        if transaction_type == "income":
+            self.income_by_account[row_account_id] += amount
+        else:
+            self.expense_by_account[row_account_id] += amount
+            if row_category_id is not None:
+                self.spend_by_month[
+                    (row_category_id, date_time.year, date_time.month)
+                ] += amount
+
+        return row
@@ -0,0 +1,84 @@
+from datetime import date, datetime, timezone
+from decouple import config
+from sqlmodel import Session
+from app.repositories.partition_repository import (
+    PartitionRepository,
+    month_partition,
+    month_start,
+    months_to_cover,
+)
+from app.repositories.unit_of_work import unit_of_work
+
+# future months that should always have a partition waiting
+PARTITION_MONTHS_AHEAD = config("PARTITION_MONTHS_AHEAD", default=3, cast=int)
+
+
+class PartitionService:
+    def __init__(self, session: Session):
+        self.session = session
+        self.partition_repo = PartitionRepository(session)
+
+    def convert(
+        self,
+        partitioned: bool = True,
+        months_ahead: int = PARTITION_MONTHS_AHEAD,
+        today: date | None = None,
+    ) -> list[str]:
+        """rebuild transactions partitioned by month (or plain again), nothing if it already is
+
+        the partitions cover every existing row and months_ahead months from today, the
+        DEFAULT partition takes anything else. returns the names of the created ones, the
+        copy is one commit and writes to transactions wait for it
+        """
+        if not self.partition_repo.supports_partitioning():
+            raise ValueError("partitioning transactions needs PostgreSQL")
+
+        if self.partition_repo.is_partitioned() == partitioned:
+            return []
+
+        if today is None:
+            today = datetime.now(timezone.utc).date()
+
+        partitions = None
+        if partitioned:
+            first, last = self.partition_repo.get_date_range()
+            months = months_to_cover(
+                first and first.date(), last and last.date(), today, months_ahead
+            )
+            partitions = [month_partition(month) for month in months]
+
+        with unit_of_work(self.session):
+            self.partition_repo.rebuild(partitions)
+
+        return [name for name, _, _ in partitions or []]
+
+    def ensure_months_ahead(
+        self, months_ahead: int = PARTITION_MONTHS_AHEAD, today: date | None = None
+    ) -> list[str]:
+        """create the missing partitions from this month to months_ahead months out
+
+        returns the names of the created ones, all of them in one commit
+        """
+        if not self.partition_repo.is_partitioned():
+            raise ValueError(
+                "transactions is not partitioned (PostgreSQL only, convert it with --convert)"
+            )
+
+        if today is None:
+            today = datetime.now(timezone.utc).date()
+
+        existing = self.partition_repo.get_partition_names()
+        created = []
+        with unit_of_work(self.session):
+            for offset in range(months_ahead + 1):
+                name, date_from, date_to = month_partition(month_start(today, offset))
+                if name in existing:
+                    continue
+                self.partition_repo.create_month(name, date_from, date_to)
+                created.append(name)
+
+        return created
+
+    def count_unpartitioned_rows(self) -> int:
+        """rows in the DEFAULT partition, dated before/after every monthly partition"""
+        return self.partition_repo.count_default_rows()
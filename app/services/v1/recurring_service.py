@@ -0,0 +1,187 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+from decouple import config
+from sqlmodel import Session
+from app.core.recurrence import FREQUENCIES, due_occurrences, occurrence, utc_naive
+from app.models import RecurringRule
+from app.repositories.recurring_repository import RecurringRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.account_repository import AccountRepository
+from app.repositories.spend_rollup_repository import SpendRollupRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.unit_of_work import unit_of_work
+
+# rules taken per tick, across all users
+RECURRING_BATCH_SIZE = config("RECURRING_BATCH_SIZE", default=500, cast=int)
+# occurrences one rule may post per tick, a rule further behind catches up over the next ticks
+RECURRING_MAX_CATCH_UP = config("RECURRING_MAX_CATCH_UP", default=1000, cast=int)
+
+
+class RecurringService:
+    def __init__(self, session: Session):
+        self.session = session
+        self.recurring_repo = RecurringRepository(session)
+        self.transaction_repo = TransactionRepository(session)
+        self.category_repo = CategoryRepository(session)
+        self.account_repo = AccountRepository(session)
+        self.spend_repo = SpendRollupRepository(session)
+        self.report_repo = ReportRepository(session)
+        self.user_repo = UserRepository(session)
+
+    def list_by_user(
+        self, user_id: int
+    ) -> list[tuple[RecurringRule, str | None, str | None]]:
+        return self.recurring_repo.get_all_by_user_with_category_and_account(user_id)
+
+    def get_detail_by_id_and_user(
+        self, rule_id: int, user_id: int
+    ) -> tuple[RecurringRule, str | None, str | None]:
+        rule = self.recurring_repo.get_by_id_and_user_with_category_and_account(
+            rule_id, user_id
+        )
+        if rule is None:
+            raise ValueError("Recurring rule not found")
+
+        return rule
+
+    def create(
+        self,
+        transaction_type: str,
+        amount: Decimal,
+        category_id: int,
+        account_id: int,
+        description: str | None,
+        frequency: str,
+        starts_at: datetime,
+        user_id: int,
+        interval: int = 1,
+        until: datetime | None = None,
+    ) -> tuple[RecurringRule, str, str]:
+        """occurrences from starts_at on are posted by the scheduler, past ones included"""
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Frequency must be one of {', '.join(FREQUENCIES)}")
+
+        if interval < 1:
+            raise ValueError("Interval must be at least 1")
+
+        starts_at = utc_naive(starts_at)
+        until = utc_naive(until) if until is not None else None
+        if until is not None and until < starts_at:
+            raise ValueError("Until must not be before starts_at")
+
+        category = self.category_repo.get_by_id_and_user(category_id, user_id)
+        if category is None:
+            raise ValueError("Category not found")
+
+        account = self.account_repo.get_by_id_and_user(account_id, user_id)
+        if account is None:
+            raise ValueError("Account not found")
+
+        if category.type != transaction_type:
+            raise ValueError(f"Invalid category, use a {transaction_type} category")
+
+        rule = RecurringRule(
+            kind=transaction_type,
+            amount=amount,
+            category_id=category_id,
+            account_id=account_id,
+            description=description,
+            frequency=frequency,
+            interval=interval,
+            starts_at=starts_at,
+            until=until,
+            next_index=0,
+            next_run=starts_at,
+            user_id=user_id,
+        )
+        self.recurring_repo.save(rule)
+
+        return rule, category.name, account.name
+
+    def delete(self, rule_id: int, user_id: int) -> None:
+        """stops the rule, the transactions it already posted are kept"""
+        rule = self.recurring_repo.get_by_id_and_user(rule_id, user_id)
+        if rule is None:
+            raise ValueError("Recurring rule not found")
+
+        self.recurring_repo.delete(rule)
+
+    def materialize_due(
+        self,
+        now: datetime | None = None,
+        batch_size: int = RECURRING_BATCH_SIZE,
+        max_catch_up: int = RECURRING_MAX_CATCH_UP,
+    ) -> tuple[int, int]:
+        """one scheduler tick: post the due occurrences of up to batch_size rules
+
+        a fixed number of statements whatever the number of users and rules: the due
+        rules are locked, their occurrences claimed in one INSERT (ON CONFLICT DO NOTHING,
+        so occurrences already posted by an earlier run or another worker are skipped),
+        then the transactions, balances, budget spend, report rollup and data versions
+        are all written from the claimed rows with one INSERT ... SELECT / UPDATE each.
+        returns (rules taken, transactions posted), as many rules as batch_size means
+        there may be more due
+        """
+        now = utc_naive(now or datetime.now(timezone.utc))
+        tick = uuid4().hex
+
+        with unit_of_work(self.session):
+            rules = self.recurring_repo.lock_due(now, batch_size)
+
+            occurrences = []
+            positions = []
+            for rule in rules:
+                due = list(
+                    due_occurrences(
+                        rule.starts_at,
+                        rule.frequency,
+                        rule.interval,
+                        rule.next_index,
+                        now,
+                        rule.until,
+                        max_catch_up,
+                    )
+                )
+                occurrences += [
+                    {"rule_id": rule.id, "date_time": date_time, "tick": tick}
+                    for _, date_time in due
+                ]
+
+                next_index = due[-1][0] + 1 if due else rule.next_index
+                next_run = occurrence(
+                    rule.starts_at, rule.frequency, rule.interval, next_index
+                )
+                if rule.until is not None and next_run > rule.until:
+                    next_run = None
+                positions.append(
+                    {"id": rule.id, "next_index": next_index, "next_run": next_run}
+                )
+
+            self.recurring_repo.claim(occurrences)
+            posted = 0
+            if occurrences:
+                posted = self._post_claimed(tick)
+            self.recurring_repo.advance(positions)
+
+        return len(rules), posted
+
+    # PRIVATE helper methods
+    def _post_claimed(self, tick: str) -> int:
+        """every write a single transaction makes (see TransactionService), set based"""
+        posted = self.transaction_repo.insert_from_select(
+            self.recurring_repo.claimed_transactions(tick)
+        )
+        self.account_repo.apply_balance_deltas(
+            self.recurring_repo.claimed_balance_deltas(tick)
+        )
+        self.spend_repo.add_spend_from(self.recurring_repo.claimed_spend(tick))
+        self.report_repo.add_from(self.recurring_repo.claimed_report(tick))
+        self.user_repo.bump_data_versions(self.recurring_repo.claimed_user_ids(tick))
+
+        return posted
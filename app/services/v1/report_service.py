@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+from sqlmodel import Session
+from app.repositories.report_repository import ReportRepository
+
+BUCKETS = ("day", "week", "month", "year")
+GROUP_BY = ("category", "account")
+
+
+class ReportService:
+    def __init__(self, session: Session):
+        self.report_repo = ReportRepository(session)
+
+    def transaction_series(
+        self,
+        user_id: int,
+        bucket: str = "month",
+        kind: str | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        group_by: list[str] | None = None,
+    ) -> list[tuple]:
+        """(bucket, kind, category_id, category_name, account_id, account_name, total, count, average)
+
+        read from the daily rollup, so the cost follows the number of days in the range
+        (times categories/accounts used) and not the number of transactions
+        """
+        group_by = group_by or []
+
+        if bucket not in BUCKETS:
+            raise ValueError(f"Bucket must be one of {', '.join(BUCKETS)}")
+
+        if any(group not in GROUP_BY for group in group_by):
+            raise ValueError(f"Group by must be one of {', '.join(GROUP_BY)}")
+
+        if date_from is not None and date_to is not None and date_from >= date_to:
+            raise ValueError("date_from must be before date_to")
+
+        rows = self.report_repo.get_series_by_user(
+            user_id,
+            bucket,
+            kind,
+            date_from,
+            date_to,
+            by_category="category" in group_by,
+            by_account="account" in group_by,
+        )
+
+        return [
+            (*row, total, count, (Decimal(total) / count).quantize(Decimal("0.01")))
+            for *row, total, count in rows
+        ]
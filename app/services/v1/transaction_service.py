@@ -1,41 +1,95 @@
+import re
+from collections import defaultdict
 from sqlmodel import Session
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
-from app.models import Income, Expense
+from app.models import Transaction
+from app.repositories.transaction_repository import TransactionRepository
 from app.repositories.income_repository import IncomeRepository
 from app.repositories.expense_repository import ExpenseRepository
 from app.repositories.category_repository import CategoryRepository
 from app.repositories.account_repository import AccountRepository
+from app.repositories.spend_rollup_repository import SpendRollupRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+from app.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor,
+    encode_search_cursor,
+    decode_search_cursor,
+)
 
 
 class TransactionService:
     def __init__(self, session: Session):
+        self.transaction_repo = TransactionRepository(session)
         self.income_repo = IncomeRepository(session)
         self.expense_repo = ExpenseRepository(session)
         self.category_repo = CategoryRepository(session)
         self.account_repo = AccountRepository(session)
+        self.spend_repo = SpendRollupRepository(session)
+        self.report_repo = ReportRepository(session)
+        self.user_repo = UserRepository(session)
 
     def list_by_user(
-        self, transaction_type: str, user_id: int
-    ) -> list[tuple[Income | Expense, str | None, str | None]]:
-        if transaction_type == "income":
-            return self.income_repo.get_all_by_user_with_category_and_account(user_id)
-        else:
-            return self.expense_repo.get_all_by_user_with_category_and_account(user_id)
+        self,
+        transaction_type: str,
+        user_id: int,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        **filters,
+    ) -> tuple[list[tuple[Transaction, str | None, str | None]], str | None]:
+        """one page (newest first) plus the cursor for the next page, None on the last page"""
+        after = decode_cursor(cursor) if cursor else None
+
+        # fetch one extra row to know if there is a next page without a COUNT
+        rows = self._repo(transaction_type).get_page_by_user_with_category_and_account(
+            user_id, limit + 1, after, **filters
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_transaction = rows[-1][0]
+            next_cursor = encode_cursor(last_transaction.date_time, last_transaction.id)
+
+        return rows, next_cursor
+
+    def search(
+        self,
+        user_id: int,
+        q: str,
+        kind: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        **filters,
+    ) -> tuple[list[tuple[Transaction, str | None, str | None, float]], str | None]:
+        """one page of description matches (best first) plus the next page cursor"""
+        # punctuation alone matches nothing on either database
+        if not re.search(r"\w", q):
+            raise ValueError("Search query has no words")
+        after = decode_search_cursor(cursor) if cursor else None
+        repo = self._repo(kind) if kind is not None else self.transaction_repo
+
+        rows = repo.search_page_by_user(user_id, q, limit + 1, after, **filters)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_transaction, _, _, rank = rows[-1]
+            next_cursor = encode_search_cursor(
+                rank, last_transaction.date_time, last_transaction.id
+            )
+
+        return rows, next_cursor
 
     def get_detail_by_id_and_user(
         self, transaction_type: str, transaction_id: int, user_id: int
-    ) -> tuple[Income | Expense, str | None, str | None]:
-        if transaction_type == "income":
-            transaction = self.income_repo.get_by_id_and_user_with_category_and_account(
-                transaction_id, user_id
-            )
-        else:
-            transaction = (
-                self.expense_repo.get_by_id_and_user_with_category_and_account(
-                    transaction_id, user_id
-                )
-            )
+    ) -> tuple[Transaction, str | None, str | None]:
+        transaction = self._repo(
+            transaction_type
+        ).get_by_id_and_user_with_category_and_account(transaction_id, user_id)
         if transaction is None:
             raise ValueError(f"{transaction_type} not found")
 
@@ -50,7 +104,7 @@ class TransactionService:
         description: str,
         user_id: int,
         date_time: datetime | None = None,
-    ) -> tuple[Income | Expense, str, str]:
+    ) -> tuple[Transaction, str, str]:
         if amount <= 0:
             raise ValueError("Amount must be positive")
 
@@ -65,152 +119,160 @@ class TransactionService:
         if category.type != transaction_type:
             raise ValueError(f"Invalid category, use a {transaction_type} category")
 
-        if transaction_type == "income":
-            new_transaction = Income(
-                amount=amount,
-                category_id=category_id,
-                account_id=account_id,
-                description=description,
-                user_id=user_id,
-                date_time=date_time,
-            )
-            self.income_repo.save(new_transaction)
-        else:
-            new_transaction = Expense(
-                amount=amount,
-                category_id=category_id,
-                account_id=account_id,
-                description=description,
-                user_id=user_id,
-                date_time=date_time,
-            )
-            self.expense_repo.save(new_transaction)
-
-        return new_transaction, category.name, account.name
+        # resolve the default now, the month rollup needs it before the insert
+        if date_time is None:
+            date_time = datetime.now(timezone.utc)
 
-    def update(
-        self, transaction_id: int, user_id: int, **kwargs
-    ) -> tuple[Income | Expense, str | None, str | None]:
-        result = self.income_repo.get_by_id_and_user_with_category_and_account(
-            transaction_id, user_id
+        new_transaction = Transaction(
+            kind=transaction_type,
+            amount=amount,
+            category_id=category_id,
+            account_id=account_id,
+            description=description,
+            user_id=user_id,
+            date_time=date_time,
         )
-        is_income = True
+        self._apply_effects(new_transaction, 1)
+        self.user_repo.bump_data_version(user_id)
+        self._repo(transaction_type).save(new_transaction)
 
-        if result is None:
-            result = self.expense_repo.get_by_id_and_user_with_category_and_account(
-                transaction_id, user_id
-            )
-            is_income = False
-
-        if result is None:
-            raise ValueError("Transaction not found")
+        return new_transaction, category.name, account.name
 
+    def update(
+        self, transaction_type: str, transaction_id: int, user_id: int, **kwargs
+    ) -> tuple[Transaction, str | None, str | None]:
         amount = kwargs.get("amount")
         if amount is not None and amount <= 0:
             raise ValueError("Amount must be positive")
 
-        # unpack tuple result
-        transaction, category_name, account_name = result
-
-        # check if category type is changing
+        repo = self._repo(transaction_type)
         new_category_id = kwargs.get("category_id")
+        new_account_id = kwargs.get("account_id")
+
+        # statement 1: the row (locked) with its names plus the new category/account it should point to
+        target = repo.get_update_target(
+            transaction_id, user_id, new_category_id, new_account_id
+        )
+        if target is None:
+            raise ValueError(f"{transaction_type.capitalize()} not found")
+
+        (
+            transaction,
+            category_name,
+            account_name,
+            new_category_type,
+            new_category_name,
+            new_account_name,
+        ) = target
+
         if new_category_id is not None:
-            new_category = self.category_repo.get_by_id_and_user(
-                new_category_id, user_id
-            )
-            if new_category is None:
+            if new_category_type is None:
                 raise ValueError("Category not found")
+            category_name = new_category_name
 
-            expected_type = "income" if is_income else "expense"
-
-            if new_category.type != expected_type:
-                # if transaction type detected change by its new update category, delete old create new on opposite transaction type
-                return self._convert_transaction(
-                    transaction, new_category, user_id, **kwargs
-                )
+        if new_account_id is not None:
+            if new_account_name is None:
+                raise ValueError("Account not found")
+            account_name = new_account_name
 
-        # for normal update (if category that will update is just same type)
+        # old values out, new values in. targets that did not change cancel out, so a
+        # description only edit writes nothing besides the row
+        old_effects = self._effect_deltas(transaction, -1)
+        if new_category_id is not None and new_category_type != transaction_type:
+            # a category of the other type converts it in place, same row. its old per
+            # kind id may be taken in the other kind, it gets its own id there
+            transaction.kind = new_category_type
+            transaction.legacy_id = None
         for key, value in kwargs.items():
             if value is not None:
                 setattr(transaction, key, value)
+        self._apply_deltas(user_id, old_effects, self._effect_deltas(transaction, 1))
+        # statement 2: the user's data version, their cached responses go stale
+        self.user_repo.bump_data_version(user_id)
 
-        if is_income:
-            saved = self.income_repo.save(transaction)
-        else:
-            saved = self.expense_repo.save(transaction)
+        # statement 3: the UPDATE (no refresh inside the request's unit of work)
+        saved = repo.save(transaction)
 
         return saved, category_name, account_name
 
     def delete(self, transaction_type: str, transaction_id: int, user_id: int) -> None:
-        if transaction_type == "income":
-            transaction = self.income_repo.get_by_id_and_user(transaction_id, user_id)
-            if transaction is None:
-                raise ValueError("Income not found")
-            self.income_repo.delete(transaction)
-        else:
-            transaction = self.expense_repo.get_by_id_and_user(transaction_id, user_id)
-            if transaction is None:
-                raise ValueError("Expense not found")
-            self.expense_repo.delete(transaction)
+        repo = self._repo(transaction_type)
+        # locked, a concurrent delete of the same row waits and then finds nothing
+        transaction = repo.lock_by_id_and_user(transaction_id, user_id)
+        if transaction is None:
+            raise ValueError(f"{transaction_type.capitalize()} not found")
+        self._apply_effects(transaction, -1)
+        self.user_repo.bump_data_version(user_id)
+        repo.delete(transaction)
 
     # PRIVATE helper methods
-    def _convert_transaction(
-        self, old_transaction, new_category, user_id, **kwargs
-    ) -> tuple[Income | Expense, str | None, str | None]:
-        """convert transaction to opposite type"""
-        # NOTE: ignore the unhighlighted words as my linter is dumb
-        # extract data (new category already validated)
-        amount = kwargs.get("amount", old_transaction.amount)
-        account_id = kwargs.get("account_id", old_transaction.account_id)
-        description = kwargs.get("description", old_transaction.description)
-        date_time = kwargs.get("date_time", old_transaction.date_time)
-
-        # delete old
-        if isinstance(old_transaction, Income):
-            self.income_repo.delete(old_transaction)
-            new_type = "expense"
-        else:
-            self.expense_repo.delete(old_transaction)
-            new_type = "income"
-
-        # create new
-        if new_type == "income":
-            new_transaction = Income(
-                amount=amount,
-                category_id=new_category.id,
-                account_id=account_id,
-                description=description,
-                date_time=date_time,
-                user_id=user_id,
-            )
-            self.income_repo.save(new_transaction)
+    def _repo(self, transaction_type: str) -> IncomeRepository | ExpenseRepository:
+        return self.income_repo if transaction_type == "income" else self.expense_repo
 
-            result = self.income_repo.get_by_id_and_user_with_category_and_account(
-                new_transaction.id, user_id
-            )
-            if result is not None:
-                new_transaction, category_name, account_name = result
-            else:
-                category_name = None
-                account_name = None
-        else:
-            new_transaction = Expense(
-                amount=amount,
-                category_id=new_category.id,
-                account_id=account_id,
-                description=description,
-                date_time=date_time,
-                user_id=user_id,
-            )
-            self.expense_repo.save(new_transaction)
+    def _apply_effects(self, transaction: Transaction, sign: int) -> None:
+        """add (sign=1) or take back (sign=-1) a transaction on everything derived from it"""
+        self._apply_deltas(transaction.user_id, self._effect_deltas(transaction, sign))
 
-            result = self.expense_repo.get_by_id_and_user_with_category_and_account(
-                new_transaction.id, user_id
-            )
-            if result is not None:
-                new_transaction, category_name, account_name = result
-            else:
-                category_name = None
-                account_name = None
+    def _effect_deltas(self, transaction: Transaction, sign: int) -> dict[tuple, list]:
+        """what a transaction adds (sign=1) or takes back (sign=-1), keyed by target row
+
+        the account balance, the daily report rollup and, for categorised expenses, the
+        monthly category spend. values are [amount, count]
+        """
+        amount = Decimal(transaction.amount) * sign
+        kind = transaction.kind
+
+        # bucket by the UTC day/month, that is what ends up stored in the column
+        date_time = transaction.date_time
+        if date_time.tzinfo is not None:
+            date_time = date_time.astimezone(timezone.utc)
+
+        deltas = {
+            ("balance", transaction.account_id, kind): [amount, 0],
+            (
+                "report",
+                kind,
+                date_time.date(),
+                transaction.category_id or 0,
+                transaction.account_id,
+            ): [amount, sign],
+        }
+        if kind == "expense" and transaction.category_id is not None:
+            deltas[
+                ("spend", transaction.category_id, date_time.year, date_time.month)
+            ] = [amount, 0]
 
-        return new_transaction, category_name, account_name
+        return deltas
+
+    def _apply_deltas(self, user_id: int, *deltas: dict[tuple, list]) -> None:
+        """write one or more _effect_deltas, one statement per target row
+
+        deltas on the same target are merged first and targets that net to zero are
+        skipped. nothing is committed here, the caller's save/delete commits it together
+        with the row
+        """
+        merged = defaultdict(lambda: [Decimal("0"), 0])
+        for delta in deltas:
+            for key, (amount, count) in delta.items():
+                merged[key][0] += amount
+                merged[key][1] += count
+
+        # sorted, so accounts are always written in id order (same reason as the transfer locks)
+        for (target, *key), (amount, count) in sorted(merged.items()):
+            if amount == 0 and count == 0:
+                continue
+
+            if target == "balance":
+                account_id, kind = key
+                if kind == "income":
+                    self.account_repo.apply_balance_delta(
+                        account_id, income_delta=amount
+                    )
+                else:
+                    self.account_repo.apply_balance_delta(
+                        account_id, expense_delta=amount
+                    )
+            elif target == "report":
+                self.report_repo.add(user_id, *key, amount, count)
+            else:
+                self.spend_repo.add_spend(user_id, *key, amount)
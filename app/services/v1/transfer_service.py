@@ -0,0 +1,149 @@
+from sqlmodel import Session
+from datetime import datetime
+from decimal import Decimal
+from app.models import Transfer, Account
+from app.repositories.transfer_repository import TransferRepository
+from app.repositories.account_repository import AccountRepository
+from app.repositories.user_repository import UserRepository
+from app.core.pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor
+
+
+class TransferService:
+    def __init__(self, session: Session):
+        self.transfer_repo = TransferRepository(session)
+        self.account_repo = AccountRepository(session)
+        self.user_repo = UserRepository(session)
+
+    def list_by_user(
+        self, user_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+    ) -> tuple[list[tuple[Transfer, str | None, str | None]], str | None]:
+        """one page (newest first) plus the cursor for the next page, None on the last page"""
+        after = decode_cursor(cursor) if cursor else None
+        rows = self.transfer_repo.get_page_by_user_with_accounts(
+            user_id, limit + 1, after
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_transfer = rows[-1][0]
+            next_cursor = encode_cursor(last_transfer.date_time, last_transfer.id)
+
+        return rows, next_cursor
+
+    def get_detail_by_id_and_user(
+        self, transfer_id: int, user_id: int
+    ) -> tuple[Transfer, str | None, str | None]:
+        transfer = self.transfer_repo.get_by_id_and_user_with_accounts(
+            transfer_id, user_id
+        )
+        if transfer is None:
+            raise ValueError("Transfer not found")
+
+        return transfer
+
+    def create(
+        self,
+        amount: Decimal,
+        from_account_id: int,
+        to_account_id: int,
+        description: str | None,
+        user_id: int,
+        date_time: datetime | None = None,
+    ) -> tuple[Transfer, str, str]:
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+
+        if from_account_id == to_account_id:
+            raise ValueError("Cannot transfer to the same account")
+
+        accounts = self._lock_accounts(user_id, from_account_id, to_account_id)
+
+        new_transfer = Transfer(
+            amount=amount,
+            from_account_id=from_account_id,
+            to_account_id=to_account_id,
+            description=description,
+            user_id=user_id,
+        )
+        if date_time is not None:
+            new_transfer.date_time = date_time
+
+        self._apply_to_balances(new_transfer, 1)
+        self.user_repo.bump_data_version(user_id)
+        self.transfer_repo.save(new_transfer)
+
+        return (
+            new_transfer,
+            accounts[from_account_id].name,
+            accounts[to_account_id].name,
+        )
+
+    def update(
+        self, transfer_id: int, user_id: int, **kwargs
+    ) -> tuple[Transfer, str, str]:
+        # locked before the accounts, two updates/deletes of one transfer would both
+        # reverse its old amounts otherwise
+        transfer = self.transfer_repo.lock_by_id_and_user(transfer_id, user_id)
+        if transfer is None:
+            raise ValueError("Transfer not found")
+
+        amount = kwargs.get("amount")
+        if amount is not None and amount <= 0:
+            raise ValueError("Amount must be positive")
+
+        from_account_id = kwargs.get("from_account_id") or transfer.from_account_id
+        to_account_id = kwargs.get("to_account_id") or transfer.to_account_id
+        if from_account_id == to_account_id:
+            raise ValueError("Cannot transfer to the same account")
+
+        # lock old and new accounts together (still in id order)
+        accounts = self._lock_accounts(
+            user_id,
+            transfer.from_account_id,
+            transfer.to_account_id,
+            from_account_id,
+            to_account_id,
+        )
+
+        self._apply_to_balances(transfer, -1)
+        for key, value in kwargs.items():
+            if value is not None:
+                setattr(transfer, key, value)
+        self._apply_to_balances(transfer, 1)
+        self.user_repo.bump_data_version(user_id)
+
+        saved = self.transfer_repo.save(transfer)
+
+        return saved, accounts[from_account_id].name, accounts[to_account_id].name
+
+    def delete(self, transfer_id: int, user_id: int) -> None:
+        transfer = self.transfer_repo.lock_by_id_and_user(transfer_id, user_id)
+        if transfer is None:
+            raise ValueError("Transfer not found")
+
+        self._lock_accounts(user_id, transfer.from_account_id, transfer.to_account_id)
+        self._apply_to_balances(transfer, -1)
+        self.user_repo.bump_data_version(user_id)
+        self.transfer_repo.delete(transfer)
+
+    # PRIVATE helper methods
+    def _lock_accounts(self, user_id: int, *account_ids: int) -> dict[int, Account]:
+        """row lock every account involved, also checks they all belong to the user"""
+        wanted = sorted(set(account_ids))
+        accounts = self.account_repo.lock_by_ids_and_user(wanted, user_id)
+
+        if len(accounts) != len(wanted):
+            raise ValueError("Account not found")
+
+        return accounts
+
+    def _apply_to_balances(self, transfer: Transfer, sign: int) -> None:
+        """move (sign=1) or move back (sign=-1) the amount between the two accounts"""
+        amount = Decimal(transfer.amount) * sign
+
+        # apply in id order too, same reason as the lock
+        for account_id, delta in sorted(
+            [(transfer.from_account_id, -amount), (transfer.to_account_id, amount)]
+        ):
+            self.account_repo.apply_balance_delta(account_id, transfer_delta=delta)
@@ -1,9 +1,15 @@
+from contextlib import contextmanager
+from decimal import Decimal
 import pytest
+from sqlalchemy import event
 from fastapi.testclient import TestClient
 from sqlmodel import Session, create_engine
 from decouple import config
 from app.main import app
 from app.database import get_session
+from app.core.auth_core import principal_cache
+from app.repositories.user_repository import UserRepository
+from app.repositories.account_repository import AccountRepository
 
 TEST_DATABASE_URL = config("TEST_DATABASE_URL")
 TEST_USERNAME = "testuser"
@@ -19,12 +25,66 @@ test_engine = create_engine(TEST_DATABASE_URL)
 def session():
     with test_engine.connect() as connection:
         transaction = connection.begin()
-        with Session(bind=connection) as session:
+        # commits/rollbacks from a unit of work only touch a savepoint inside this transaction,
+        # expire_on_commit off like get_session
+        with Session(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        ) as session:
             yield session
         # undo/cleanup all DB writes after each test
         transaction.rollback()
 
 
+@contextmanager
+def count_statements(session):
+    """SQL statements sent while the block runs (savepoint bookkeeping not counted)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if "SAVEPOINT" not in statement.upper():
+            statements.append(statement)
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def account_balance(client, headers, account) -> Decimal:
+    response = client.get(f"/api/v1/accounts/{account['id']}/balance", headers=headers)
+    assert response.status_code == 200
+    return Decimal(str(response.json()["balance"]))
+
+
+def create_expense(
+    client, headers, category, account, amount="10", date_time="2025-03-01T10:00:00"
+):
+    response = client.post(
+        "/api/v1/expenses/",
+        json={
+            "amount": amount,
+            "category_id": category["id"],
+            "account_id": account["id"],
+            "date_time": date_time,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["created_item"]
+
+
+# principals are cached per process, dont let one test see users from another
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
 # for testing api endpoints
 @pytest.fixture()
 def client(session):
@@ -58,3 +118,29 @@ def headers(token):
 def created_category(client, headers):
     response = client.post("/api/v1/categories/", json=TEST_CATEGORY, headers=headers)
     return response.json()["created_item"]
+
+
+@pytest.fixture()
+def created_expense_category(client, headers):
+    response = client.post(
+        "/api/v1/categories/", json=TEST_CATEGORY_EXPENSE, headers=headers
+    )
+    return response.json()["created_item"]
+
+
+# the "Cash" account every user gets on register
+@pytest.fixture()
+def default_account(session, token):
+    user = UserRepository(session).get_by_username(TEST_USERNAME)
+    account = AccountRepository(session).get_all_by_user(user.id)[0]
+    return {"id": account.id, "name": account.name}
+
+
+@pytest.fixture()
+def created_account(client, headers):
+    response = client.post(
+        "/api/v1/accounts/",
+        json={"name": "Bank", "initial_balance": "0"},
+        headers=headers,
+    )
+    return response.json()["created_item"]
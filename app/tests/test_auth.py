@@ -0,0 +1,69 @@
+from jose import jwt
+from app.core.auth_core import SECRET_JWT_KEY, ALGORITHM, principal_cache
+from app.core.cache import TTLCache
+from app.repositories.user_repository import UserRepository
+from app.tests.conftest import TEST_USERNAME
+
+
+class TestAccessToken:
+    def test_token_carries_user_id(self, client, token):
+        payload = jwt.decode(token, SECRET_JWT_KEY, algorithms=[ALGORITHM])
+        assert payload["sub"].isdigit()
+        assert payload["username"] == TEST_USERNAME
+
+    def test_username_subject_is_rejected(self, client):
+        old_token = jwt.encode({"sub": TEST_USERNAME}, SECRET_JWT_KEY, ALGORITHM)
+        response = client.get(
+            "/api/v1/categories/", headers={"Authorization": f"Bearer {old_token}"}
+        )
+        assert response.status_code == 401
+
+
+class TestPrincipalCache:
+    def test_principal_is_cached_after_first_request(self, client, headers, token):
+        user_id = int(jwt.decode(token, SECRET_JWT_KEY, algorithms=[ALGORITHM])["sub"])
+        assert principal_cache.get(user_id) is None
+
+        client.get("/api/v1/categories/", headers=headers)
+        assert principal_cache.get(user_id).username == TEST_USERNAME
+
+    def test_cached_principal_skips_users_table(
+        self, client, headers, token, monkeypatch
+    ):
+        client.get("/api/v1/categories/", headers=headers)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("users table should not be queried")
+
+        monkeypatch.setattr(UserRepository, "get_by_id", fail)
+        response = client.get("/api/v1/categories/", headers=headers)
+        assert response.status_code == 200
+
+    def test_deleted_user_is_invalidated(self, client, session, headers):
+        client.get("/api/v1/categories/", headers=headers)
+
+        user = UserRepository(session).get_by_username(TEST_USERNAME)
+        session.delete(user.accounts[0])
+        session.delete(user)
+        session.flush()
+
+        response = client.get("/api/v1/categories/", headers=headers)
+        assert response.status_code == 401
+
+    def test_expired_entry_is_dropped(self, monkeypatch):
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set(1, "value")
+
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: 1e12)
+        assert cache.get(1) is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set(1, "a")
+        cache.set(2, "b")
+        cache.get(1)
+        cache.set(3, "c")
+
+        assert cache.get(2) is None
+        assert cache.get(1) == "a"
+        assert cache.get(3) == "c"
@@ -0,0 +1,188 @@
+from decimal import Decimal
+from sqlmodel import select, update
+from app.models import Account, Transaction
+from app.repositories.account_repository import AccountRepository
+from app.repositories.user_repository import UserRepository
+from app.services.v1 import AccountService, TransactionService
+from app.tests.conftest import TEST_USERNAME, account_balance
+
+
+def create_transaction(client, headers, kind, amount, category, account):
+    response = client.post(
+        f"/api/v1/{kind}/",
+        json={
+            "amount": amount,
+            "category_id": category["id"],
+            "account_id": account["id"],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["created_item"]
+
+
+class TestMaintainedBalance:
+    def test_create_updates_balance(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        create_transaction(
+            client, headers, "incomes", "100", created_category, default_account
+        )
+        create_transaction(
+            client, headers, "expenses", "30", created_expense_category, default_account
+        )
+
+        assert account_balance(client, headers, default_account) == Decimal("70")
+
+        totals = client.get("/api/v1/balance/", headers=headers).json()
+        assert Decimal(str(totals["total_income"])) == Decimal("100")
+        assert Decimal(str(totals["total_expenses"])) == Decimal("30")
+
+        accounts = client.get("/api/v1/accounts/", headers=headers).json()
+        assert Decimal(accounts[0]["total_balance"]) == Decimal("70")
+
+    def test_update_and_delete_adjust_balance(
+        self, client, headers, created_category, default_account
+    ):
+        income = create_transaction(
+            client, headers, "incomes", "100", created_category, default_account
+        )
+
+        client.patch(
+            f"/api/v1/incomes/{income['id']}", json={"amount": "40"}, headers=headers
+        )
+        assert account_balance(client, headers, default_account) == Decimal("40")
+
+        client.delete(f"/api/v1/incomes/{income['id']}", headers=headers)
+        assert account_balance(client, headers, default_account) == Decimal("0")
+
+    def test_convert_moves_amount_to_other_side(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        income = create_transaction(
+            client, headers, "incomes", "25", created_category, default_account
+        )
+
+        client.patch(
+            f"/api/v1/incomes/{income['id']}",
+            json={"category_id": created_expense_category["id"]},
+            headers=headers,
+        )
+        assert account_balance(client, headers, default_account) == Decimal("-25")
+
+    def test_update_and_delete_take_back_the_locked_row(
+        self, client, headers, session, created_category, default_account
+    ):
+        income = create_transaction(
+            client, headers, "incomes", "100", created_category, default_account
+        )
+        # the session still holds the income at 100 while another request moves it
+        # down to 40 and commits before this one takes its lock
+        stale = session.get(Transaction, income["id"])
+        assert stale.amount == Decimal("100")
+
+        def move_to(amount, delta):
+            session.exec(
+                update(Transaction)
+                .where(Transaction.id == income["id"])
+                .values(amount=Decimal(amount))
+                .execution_options(synchronize_session=False)
+            )
+            AccountRepository(session).apply_balance_delta(
+                default_account["id"], income_delta=Decimal(delta)
+            )
+
+        user = UserRepository(session).get_by_username(TEST_USERNAME)
+        service = TransactionService(session)
+
+        move_to("40", "-60")
+        service.update("income", income["id"], user.id, amount=Decimal("10"))
+        assert account_balance(client, headers, default_account) == Decimal("10")
+
+        move_to("5", "-5")
+        service.delete("income", income["id"], user.id)
+        assert account_balance(client, headers, default_account) == Decimal("0")
+
+
+class TestReconcileBalances:
+    def test_no_drift_after_writes(
+        self, client, session, headers, created_category, default_account
+    ):
+        create_transaction(
+            client, headers, "incomes", "10", created_category, default_account
+        )
+
+        assert AccountService(session).reconcile_balances() == []
+
+    def test_drift_is_reported_and_fixed(
+        self, client, session, headers, created_category, default_account
+    ):
+        create_transaction(
+            client, headers, "incomes", "10", created_category, default_account
+        )
+        account = session.get(Account, default_account["id"])
+        account.current_balance = Decimal("999")
+        session.add(account)
+        session.flush()
+
+        drifted = AccountService(session).reconcile_balances(fix=True)
+        assert [(a.id, stored, expected) for a, stored, expected in drifted] == [
+            (default_account["id"], Decimal("999"), Decimal("10"))
+        ]
+        assert AccountService(session).reconcile_balances() == []
+
+    def test_fix_keeps_a_write_made_after_the_recompute(
+        self, client, session, headers, created_category, default_account, monkeypatch
+    ):
+        income = create_transaction(
+            client, headers, "incomes", "10", created_category, default_account
+        )
+        account = session.get(Account, default_account["id"])
+        account.current_balance = Decimal("999")
+        session.add(account)
+        session.flush()
+        recompute = AccountRepository.get_recomputed_balances
+
+        # another request moves the income to 15 and commits right after the sums are read
+        def recompute_then_write(self):
+            rows = recompute(self)
+            session.exec(
+                update(Transaction)
+                .where(Transaction.id == income["id"])
+                .values(amount=Decimal("15"))
+                .execution_options(synchronize_session=False)
+            )
+            session.exec(
+                update(Account)
+                .where(Account.id == default_account["id"])
+                .values(
+                    total_income=Account.total_income + 5,
+                    current_balance=Account.current_balance + 5,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return rows
+
+        monkeypatch.setattr(
+            AccountRepository, "get_recomputed_balances", recompute_then_write
+        )
+        AccountService(session).reconcile_balances(fix=True)
+        monkeypatch.undo()
+
+        # read back from the table, the other request's update never reached this
+        # session's copy of the account
+        stored = session.exec(
+            select(Account.current_balance).where(Account.id == default_account["id"])
+        ).one()
+        assert stored == Decimal("15")
+        assert AccountService(session).reconcile_balances() == []
@@ -0,0 +1,192 @@
+from decimal import Decimal
+from sqlalchemy import event
+from app.tests.conftest import account_balance, count_statements
+
+
+def expense_operation(category, account, amount):
+    return {
+        "method": "POST",
+        "resource": "expenses",
+        "body": {
+            "amount": amount,
+            "category_id": category["id"],
+            "account_id": account["id"],
+            "date_time": "2025-03-01T10:00:00",
+        },
+    }
+
+
+class TestBatch:
+    def test_batch_commits_once(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        commits = []
+
+        def count_commit(session):
+            commits.append(session)
+
+        event.listen(session, "after_commit", count_commit)
+
+        response = client.post(
+            "/api/v1/batch/",
+            json={
+                "operations": [
+                    expense_operation(created_expense_category, default_account, "10"),
+                    expense_operation(created_expense_category, default_account, "5"),
+                    {
+                        "method": "POST",
+                        "resource": "categories",
+                        "body": {"name": "Rent", "type": "expense"},
+                    },
+                ]
+            },
+            headers=headers,
+        )
+        event.remove(session, "after_commit", count_commit)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["resource"] for result in results] == [
+            "expenses",
+            "expenses",
+            "categories",
+        ]
+        assert all(result["id"] for result in results)
+        assert len(commits) == 1
+        assert account_balance(client, headers, default_account) == Decimal("-15")
+
+    def test_reads_do_not_commit(self, client, headers, session, default_account):
+        commits = []
+
+        def count_commit(session):
+            commits.append(session)
+
+        event.listen(session, "after_commit", count_commit)
+        for path in (
+            "/api/v1/expenses/",
+            "/api/v1/categories/",
+            f"/api/v1/accounts/{default_account['id']}/balance",
+            "/api/v1/reports/transactions",
+        ):
+            assert client.get(path, headers=headers).status_code == 200
+        reads = len(commits)
+        client.post(
+            "/api/v1/categories/",
+            json={"name": "Rent", "type": "expense"},
+            headers=headers,
+        )
+        event.remove(session, "after_commit", count_commit)
+
+        assert reads == 0
+        assert len(commits) == 1
+
+    def test_batch_update_and_delete(
+        self, client, headers, created_expense_category, default_account
+    ):
+        created = client.post(
+            "/api/v1/batch/",
+            json={
+                "operations": [
+                    expense_operation(created_expense_category, default_account, "10")
+                ]
+            },
+            headers=headers,
+        ).json()["results"][0]
+
+        response = client.post(
+            "/api/v1/batch/",
+            json={
+                "operations": [
+                    {
+                        "method": "PATCH",
+                        "resource": "expenses",
+                        "id": created["id"],
+                        "body": {"amount": "30"},
+                    },
+                    {"method": "DELETE", "resource": "expenses", "id": created["id"]},
+                ]
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"][1]["id"] is None
+        assert account_balance(client, headers, default_account) == Decimal("0")
+
+    def test_accounts_are_locked_first_and_the_user_last(
+        self,
+        client,
+        headers,
+        session,
+        created_expense_category,
+        default_account,
+        created_account,
+    ):
+        operations = [
+            expense_operation(created_expense_category, account, "10")
+            for account in (created_account, default_account, created_account)
+        ]
+
+        with count_statements(session) as statements:
+            response = client.post(
+                "/api/v1/batch/", json={"operations": operations}, headers=headers
+            )
+
+        assert response.status_code == 200
+        lock = next(
+            i
+            for i, statement in enumerate(statements)
+            if statement.startswith("SELECT accounts.id")
+            and statement.rstrip().endswith("ORDER BY accounts.id")
+        )
+        writes = [
+            (i, statement.split()[1])
+            for i, statement in enumerate(statements)
+            if statement.startswith("UPDATE")
+        ]
+        assert lock < writes[0][0]
+        # one bump for the whole batch, after every account
+        assert [table for _, table in writes if table == "users"] == ["users"]
+        assert writes[-1][1] == "users"
+
+    def test_batch_is_atomic(
+        self, client, headers, created_expense_category, default_account
+    ):
+        response = client.post(
+            "/api/v1/batch/",
+            json={
+                "operations": [
+                    expense_operation(created_expense_category, default_account, "10"),
+                    expense_operation(created_expense_category, {"id": 999999}, "5"),
+                ]
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == {"index": 1, "error": "Account not found"}
+        assert client.get("/api/v1/expenses/", headers=headers).json() == []
+        assert account_balance(client, headers, default_account) == Decimal("0")
+
+    def test_batch_invalid_body(self, client, headers):
+        response = client.post(
+            "/api/v1/batch/",
+            json={
+                "operations": [
+                    {"method": "POST", "resource": "accounts", "body": {"name": "x"}},
+                ]
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["index"] == 0
+
+    def test_batch_delete_requires_id(self, client, headers):
+        response = client.post(
+            "/api/v1/batch/",
+            json={"operations": [{"method": "DELETE", "resource": "budgets"}]},
+            headers=headers,
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,31 @@
+from app.core.statement_parsers import parse_csv
+from benchmarks.ledger import CSV_HEADER, ledger_lines
+from benchmarks.run import regressions
+
+BASELINE = {"expenses page": {"p50_ms": 4.0, "queries": 1.0, "peak_kib": 100.0}}
+
+
+class TestSyntheticLedger:
+    def test_rows_are_importable_and_repeatable(self):
+        category_ids = {"income": [1], "expense": [2, 3]}
+        lines = list(ledger_lines(200, category_ids, [7, 8]))
+
+        parsed = list(parse_csv([CSV_HEADER, *lines]))
+
+        assert all(row.error is None for row in parsed)
+        assert {row.data["type"] for row in parsed} == {"income", "expense"}
+        assert lines == list(ledger_lines(200, category_ids, [7, 8]))
+
+
+class TestRegressions:
+    def test_extra_query_is_a_regression(self):
+        result = {"expenses page": {"p50_ms": 4.0, "queries": 2.0, "peak_kib": 100.0}}
+
+        assert len(regressions(result, BASELINE, 0.5)) == 1
+
+    def test_latency_within_tolerance_or_noise_passes(self):
+        within = {"expenses page": {"p50_ms": 5.9, "queries": 1.0, "peak_kib": 140.0}}
+        slower = {"expenses page": {"p50_ms": 6.5, "queries": 1.0, "peak_kib": 100.0}}
+
+        assert regressions(within, BASELINE, 0.5) == []
+        assert len(regressions(slower, BASELINE, 0.5)) == 1
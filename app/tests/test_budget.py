@@ -0,0 +1,136 @@
+from decimal import Decimal
+from app.tests.conftest import create_expense
+
+
+def create_budget(client, headers, category, limit="100", year=2025, month=3):
+    return client.post(
+        "/api/v1/budgets/",
+        json={
+            "category_id": category["id"],
+            "limit_amount": limit,
+            "year": year,
+            "month": month,
+        },
+        headers=headers,
+    )
+
+
+class TestCreateBudget:
+    def test_create_budget(self, client, headers, created_expense_category):
+        response = create_budget(client, headers, created_expense_category)
+        assert response.status_code == 201
+        created = response.json()["created_item"]
+        assert Decimal(created["spent_amount"]) == 0
+        assert Decimal(created["remaining"]) == Decimal("100")
+
+    def test_create_budget_income_category(self, client, headers, created_category):
+        response = create_budget(client, headers, created_category)
+        assert response.status_code == 409
+
+    def test_create_budget_duplicate(self, client, headers, created_expense_category):
+        create_budget(client, headers, created_expense_category)
+        response = create_budget(client, headers, created_expense_category)
+        assert response.status_code == 409
+
+    def test_create_budget_invalid_limit(
+        self, client, headers, created_expense_category
+    ):
+        response = create_budget(client, headers, created_expense_category, limit="0")
+        assert response.status_code == 400
+
+
+class TestBudgetSpent:
+    def test_spent_follows_expense_writes(
+        self, client, headers, created_expense_category, default_account
+    ):
+        budget = create_budget(client, headers, created_expense_category).json()[
+            "created_item"
+        ]
+        expense = create_expense(
+            client,
+            headers,
+            created_expense_category,
+            default_account,
+            "30",
+            "2025-03-10T10:00:00",
+        )
+        # other month, must not count
+        create_expense(
+            client,
+            headers,
+            created_expense_category,
+            default_account,
+            "500",
+            "2025-04-01T10:00:00",
+        )
+
+        listed = client.get("/api/v1/budgets/?year=2025&month=3", headers=headers)
+        assert Decimal(listed.json()[0]["spent_amount"]) == Decimal("30")
+        assert Decimal(listed.json()[0]["remaining"]) == Decimal("70")
+
+        client.patch(
+            f"/api/v1/expenses/{expense['id']}", json={"amount": "45"}, headers=headers
+        )
+        detail = client.get(f"/api/v1/budgets/{budget['id']}", headers=headers)
+        assert Decimal(detail.json()["spent_amount"]) == Decimal("45")
+
+        # moving the expense to another month takes it out of this budget
+        client.patch(
+            f"/api/v1/expenses/{expense['id']}",
+            json={"date_time": "2025-02-28T10:00:00"},
+            headers=headers,
+        )
+        detail = client.get(f"/api/v1/budgets/{budget['id']}", headers=headers)
+        assert Decimal(detail.json()["spent_amount"]) == 0
+
+    def test_delete_expense_reduces_spent(
+        self, client, headers, created_expense_category, default_account
+    ):
+        budget = create_budget(client, headers, created_expense_category).json()[
+            "created_item"
+        ]
+        expense = create_expense(
+            client,
+            headers,
+            created_expense_category,
+            default_account,
+            "30",
+            "2025-03-10T10:00:00",
+        )
+        client.delete(f"/api/v1/expenses/{expense['id']}", headers=headers)
+
+        detail = client.get(f"/api/v1/budgets/{budget['id']}", headers=headers)
+        assert Decimal(detail.json()["spent_amount"]) == 0
+
+
+class TestUpdateDeleteBudget:
+    def test_update_limit(self, client, headers, created_expense_category):
+        budget = create_budget(client, headers, created_expense_category).json()[
+            "created_item"
+        ]
+        response = client.patch(
+            f"/api/v1/budgets/{budget['id']}",
+            json={"limit_amount": "250"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert Decimal(response.json()["limit_amount"]) == Decimal("250")
+
+    def test_delete_budget(self, client, headers, created_expense_category):
+        budget = create_budget(client, headers, created_expense_category).json()[
+            "created_item"
+        ]
+        response = client.delete(f"/api/v1/budgets/{budget['id']}", headers=headers)
+        assert response.status_code == 204
+
+        response = client.get(f"/api/v1/budgets/{budget['id']}", headers=headers)
+        assert response.status_code == 404
+
+    def test_category_with_budget_cannot_be_deleted(
+        self, client, headers, created_expense_category
+    ):
+        create_budget(client, headers, created_expense_category)
+        response = client.delete(
+            f"/api/v1/categories/{created_expense_category['id']}", headers=headers
+        )
+        assert response.status_code == 409
@@ -0,0 +1,177 @@
+from app.core import etag
+from app.core.cache import TTLCache
+from app.core.etag import etag_matches
+from app.repositories.user_repository import UserRepository
+from app.tests.conftest import TEST_USERNAME, count_statements
+
+CACHED_PATHS = [
+    "/api/v1/accounts/",
+    "/api/v1/accounts/balance",
+    "/api/v1/categories/",
+    "/api/v1/balance/",
+]
+
+
+def data_version(session):
+    return UserRepository(session).get_by_username(TEST_USERNAME).data_version
+
+
+class TestEtagMatches:
+    def test_exact_and_listed_tags(self):
+        assert etag_matches('"1-4"', '"1-4"')
+        assert etag_matches('"1-3", "1-4"', '"1-4"')
+        assert not etag_matches('"1-3"', '"1-4"')
+        assert not etag_matches(None, '"1-4"')
+
+    def test_weak_tag_and_star_match(self):
+        assert etag_matches('W/"1-4"', '"1-4"')
+        assert etag_matches("*", '"1-4"')
+
+
+class TestConditionalGet:
+    def test_unchanged_data_is_not_modified(self, client, headers):
+        for path in CACHED_PATHS:
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200
+            assert response.headers["Cache-Control"] == "private, no-cache"
+
+            again = client.get(
+                path, headers=headers | {"If-None-Match": response.headers["ETag"]}
+            )
+            assert again.status_code == 304, path
+            assert again.content == b""
+            assert again.headers["ETag"] == response.headers["ETag"]
+
+    def test_missing_account_is_not_found_whatever_the_etag(
+        self, client, headers, created_account
+    ):
+        path = f"/api/v1/accounts/{created_account['id']}/balance"
+        etag = client.get(path, headers=headers).headers["ETag"]
+
+        for if_none_match in (etag, "*"):
+            response = client.get(
+                "/api/v1/accounts/999999/balance",
+                headers=headers | {"If-None-Match": if_none_match},
+            )
+            assert response.status_code == 404
+
+        client.delete(f"/api/v1/accounts/{created_account['id']}", headers=headers)
+        response = client.get(path, headers=headers | {"If-None-Match": "*"})
+        assert response.status_code == 404
+
+    def test_not_modified_skips_the_query(self, client, headers, session):
+        response = client.get("/api/v1/accounts/", headers=headers)
+
+        with count_statements(session) as statements:
+            again = client.get(
+                "/api/v1/accounts/",
+                headers=headers | {"If-None-Match": response.headers["ETag"]},
+            )
+
+        assert again.status_code == 304
+        # only the data version lookup
+        assert len(statements) == 1
+        assert "FROM users" in statements[0]
+
+    def test_write_changes_the_etag(self, client, headers, created_category):
+        response = client.get("/api/v1/categories/", headers=headers)
+
+        client.patch(
+            f"/api/v1/categories/{created_category['id']}",
+            json={"name": "Wages"},
+            headers=headers,
+        )
+        again = client.get(
+            "/api/v1/categories/",
+            headers=headers | {"If-None-Match": response.headers["ETag"]},
+        )
+
+        assert again.status_code == 200
+        assert again.headers["ETag"] != response.headers["ETag"]
+        assert again.json()[0]["name"] == "Wages"
+
+    def test_every_write_bumps_the_version(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        before = data_version(session)
+
+        response = client.post(
+            "/api/v1/expenses/",
+            json={
+                "amount": "10",
+                "category_id": created_expense_category["id"],
+                "account_id": default_account["id"],
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+        client.post(
+            "/api/v1/accounts/",
+            json={"name": "Bank", "initial_balance": "0"},
+            headers=headers,
+        )
+
+        assert data_version(session) == before + 2
+
+    def test_account_writes_bump_the_version_last(
+        self, client, headers, session, created_account
+    ):
+        # transaction writes lock the account row before the users row, account
+        # writes taking them the other way round could deadlock with them
+        path = f"/api/v1/accounts/{created_account['id']}"
+        with count_statements(session) as statements:
+            client.patch(path, json={"name": "Savings"}, headers=headers)
+            client.delete(path, headers=headers)
+
+        writes = [
+            statement.split()[:3]
+            for statement in statements
+            if statement.startswith(("UPDATE", "DELETE FROM"))
+        ]
+        assert writes == [
+            ["UPDATE", "accounts", "SET"],
+            ["UPDATE", "users", "SET"],
+            ["DELETE", "FROM", "daily_transaction_rollup"],
+            ["DELETE", "FROM", "accounts"],
+            ["UPDATE", "users", "SET"],
+        ]
+
+    def test_failed_write_keeps_the_version(self, client, headers, session):
+        before = data_version(session)
+
+        response = client.delete("/api/v1/categories/999999", headers=headers)
+
+        assert response.status_code == 404
+        assert data_version(session) == before
+
+
+class TestResponseCache:
+    def test_body_served_from_cache(self, client, headers, session, monkeypatch):
+        monkeypatch.setattr(etag, "response_cache", TTLCache(maxsize=10, ttl=60))
+        response = client.get("/api/v1/accounts/", headers=headers)
+
+        with count_statements(session) as statements:
+            again = client.get("/api/v1/accounts/", headers=headers)
+
+        assert again.status_code == 200
+        assert again.content == response.content
+        assert again.headers["ETag"] == response.headers["ETag"]
+        assert not [s for s in statements if "FROM accounts" in s]
+
+    def test_write_misses_the_cache(
+        self, client, headers, monkeypatch, created_account
+    ):
+        monkeypatch.setattr(etag, "response_cache", TTLCache(maxsize=10, ttl=60))
+        client.get("/api/v1/accounts/", headers=headers)
+
+        client.patch(
+            f"/api/v1/accounts/{created_account['id']}",
+            json={"name": "Savings"},
+            headers=headers,
+        )
+        names = [
+            account["name"]
+            for account in client.get("/api/v1/accounts/", headers=headers).json()
+        ]
+
+        assert "Savings" in names
@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from decimal import Decimal
+import pytest
+from sqlalchemy import Numeric
+from app.core.export_formats import decimal_digits, write_parquet
+from app.repositories.ledger_repository import LedgerRepository
+
+
+@pytest.fixture()
+def ledger(
+    client,
+    headers,
+    created_category,
+    created_expense_category,
+    default_account,
+    created_account,
+):
+    account_id = default_account["id"]
+
+    for path, category, amount, date_time in (
+        ("incomes", created_category, "1000", "2025-03-01T09:00:00"),
+        ("expenses", created_expense_category, "25.50", "2025-03-03T12:00:00"),
+        ("expenses", created_expense_category, "4", "2025-04-01T08:00:00"),
+    ):
+        response = client.post(
+            f"/api/v1/{path}/",
+            json={
+                "amount": amount,
+                "category_id": category["id"],
+                "account_id": account_id,
+                "date_time": date_time,
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+    response = client.post(
+        "/api/v1/transfers/",
+        json={
+            "amount": "300",
+            "from_account_id": account_id,
+            "to_account_id": created_account["id"],
+            "date_time": "2025-03-02T10:00:00",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+
+
+class TestExportLedger:
+    def test_export_csv(self, client, headers, ledger):
+        response = client.get("/api/v1/exports/ledger", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["kind"] for row in rows] == [
+            "income",
+            "transfer",
+            "expense",
+            "expense",
+        ]
+        assert rows[1]["account_name"] == "Cash"
+        assert rows[1]["to_account_name"] == "Bank"
+        assert rows[2]["category_name"] == "Food"
+        assert Decimal(rows[2]["amount"]) == Decimal("25.50")
+
+    def test_export_ndjson_date_range(self, client, headers, ledger):
+        response = client.get(
+            "/api/v1/exports/ledger?format=ndjson"
+            "&date_from=2025-03-02T00:00:00&date_to=2025-04-01T00:00:00",
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["kind"] for row in rows] == ["transfer", "expense"]
+
+    def test_export_empty_csv_has_header(self, client, headers):
+        response = client.get("/api/v1/exports/ledger", headers=headers)
+
+        assert response.status_code == 200
+        assert response.text.splitlines()[0].startswith("kind,id,date_time,amount")
+
+    def test_export_parquet(self, client, headers, ledger):
+        parquet = pytest.importorskip("pyarrow.parquet")
+        response = client.get("/api/v1/exports/ledger?format=parquet", headers=headers)
+
+        assert response.status_code == 200
+        table = parquet.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 4
+        assert table.column("kind").to_pylist()[0] == "income"
+
+
+class TestParquetTypes:
+    def test_decimal_digits_follow_the_column(self):
+        assert decimal_digits(Numeric(12, 2)) == (12, 2)
+        assert decimal_digits(Numeric(50, 4)) == (50, 4)
+        assert decimal_digits(Numeric(decimal_return_scale=4)) == (38, 4)
+        # unbounded, as read back by SQLAlchemy
+        assert decimal_digits(Numeric()) == (38, 10)
+
+    def test_ledger_amount_is_the_model_numeric(self, session):
+        column_types = LedgerRepository(session).column_types()
+
+        assert isinstance(column_types["amount"], Numeric)
+        assert decimal_digits(column_types["amount"]) == (38, 10)
+
+    def test_amounts_past_the_scale_are_rounded(self):
+        parquet = pytest.importorskip("pyarrow.parquet")
+        amounts = [Decimal("0.123456789012"), Decimal("2.00000000005"), None]
+
+        chunks = write_parquet(
+            ("amount",), [[(amount,) for amount in amounts]], {"amount": Numeric()}
+        )
+
+        table = parquet.read_table(io.BytesIO(b"".join(chunks)))
+        assert table.column("amount").to_pylist() == [
+            Decimal("0.1234567890"),
+            Decimal("2.0000000000"),
+            None,
+        ]
@@ -0,0 +1,200 @@
+from decimal import Decimal
+from app.services.v1 import import_service
+from app.tests.conftest import account_balance
+
+
+def import_file(client, headers, name, content, **params):
+    return client.post(
+        "/api/v1/imports/transactions",
+        params=params,
+        files={"file": (name, content.encode("utf-8"), "text/plain")},
+        headers=headers,
+    )
+
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250305120000[0:GMT]
+<TRNAMT>-12.50
+<NAME>Coffee shop
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250301<TRNAMT>1000.00<NAME>Payroll</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF = """!Type:Bank
+D03/05/2025
+T-20.00
+PGrocery
+^
+D03/06'25
+T150.00
+PRefund
+^
+Dnot a date
+T5.00
+^
+"""
+
+
+class TestImportCsv:
+    def test_import_csv(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+        monkeypatch,
+    ):
+        # three INSERT batches, the last one short
+        monkeypatch.setattr(import_service, "IMPORT_BATCH_SIZE", 8)
+        rows = ["type,amount,date_time,description,category_id,account_id"]
+        for day in range(1, 21):
+            rows.append(
+                f"expense,2.50,2025-03-{day:02d}T10:00:00,lunch,"
+                f"{created_expense_category['id']},{default_account['id']}"
+            )
+        rows.append(
+            f"income,500,2025-03-01T09:00:00,salary,"
+            f"{created_category['id']},{default_account['id']}"
+        )
+        response = import_file(client, headers, "march.csv", "\n".join(rows))
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported_count"] == 21
+        assert body["expense_count"] == 20
+        assert body["error_count"] == 0
+
+        assert account_balance(client, headers, default_account) == Decimal("450")
+
+        listed = client.get("/api/v1/expenses/?limit=100", headers=headers).json()
+        assert len(listed) == 20
+
+        budget = client.post(
+            "/api/v1/budgets/",
+            json={
+                "category_id": created_expense_category["id"],
+                "limit_amount": "100",
+                "year": 2025,
+                "month": 3,
+            },
+            headers=headers,
+        ).json()["created_item"]
+        assert Decimal(budget["spent_amount"]) == Decimal("50")
+
+        report = client.get(
+            "/api/v1/reports/transactions?bucket=month&kind=expense", headers=headers
+        ).json()
+        assert report[0]["count"] == 20
+
+    def test_import_csv_reports_bad_rows(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        account_id = default_account["id"]
+        content = "\n".join(
+            [
+                "amount,date_time,category_id,account_id",
+                "-10,2025-03-01T10:00:00,,",
+                f"abc,2025-03-01T10:00:00,,{account_id}",
+                f"-10,yesterday,,{account_id}",
+                f"-10,2025-03-01T10:00:00,{created_category['id']},{account_id}",
+                f"-10,2025-03-01T10:00:00,999999,{account_id}",
+            ]
+        )
+        response = import_file(client, headers, "rows.csv", content)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported_count"] == 0
+        assert body["error_count"] == 5
+        assert [error["line"] for error in body["errors"]] == [2, 3, 4, 5, 6]
+        assert body["errors"][0]["error"] == "Account is required"
+        assert body["errors"][3]["error"] == "Invalid category, use a expense category"
+        assert body["errors"][4]["error"] == "Category not found"
+
+    def test_import_csv_rejects_non_finite_amounts(
+        self, client, headers, created_expense_category, default_account
+    ):
+        content = "\n".join(
+            [
+                "amount,date_time",
+                "NaN,2025-03-01T10:00:00",
+                "-Infinity,2025-03-01T10:00:00",
+            ]
+        )
+        response = import_file(
+            client, headers, "rows.csv", content, account_id=default_account["id"]
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported_count"] == 0
+        assert [error["error"] for error in body["errors"]] == [
+            "Invalid amount 'NaN'",
+            "Invalid amount '-Infinity'",
+        ]
+
+    def test_import_malformed_csv(self, client, headers, default_account):
+        # a field over the csv module's field_size_limit
+        content = 'amount,date_time\n"' + "x" * 200_000 + '",2025-03-01T10:00:00\n'
+        response = import_file(
+            client, headers, "rows.csv", content, account_id=default_account["id"]
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Malformed CSV file")
+
+    def test_import_unknown_account(self, client, headers):
+        response = import_file(
+            client, headers, "rows.csv", "amount,date_time\n", account_id=999999
+        )
+        assert response.status_code == 404
+
+    def test_import_unsupported_format(self, client, headers):
+        response = import_file(client, headers, "rows.xlsx", "whatever")
+        assert response.status_code == 400
+
+
+class TestImportStatements:
+    def test_import_ofx(
+        self, client, headers, created_expense_category, default_account
+    ):
+        response = import_file(
+            client,
+            headers,
+            "statement.ofx",
+            OFX,
+            account_id=default_account["id"],
+            expense_category_id=created_expense_category["id"],
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["income_count"] == 1
+        assert body["expense_count"] == 1
+        assert account_balance(client, headers, default_account) == Decimal("987.50")
+
+    def test_import_qif(self, client, headers, default_account):
+        response = import_file(
+            client,
+            headers,
+            "statement.qif",
+            QIF,
+            account_id=default_account["id"],
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["imported_count"] == 2
+        assert body["errors"] == [{"line": 10, "error": "Invalid date 'notadate'"}]
+        assert account_balance(client, headers, default_account) == Decimal("130")
@@ -0,0 +1,155 @@
+import asyncio
+import re
+import time
+from prometheus_client import REGISTRY
+from app.core import metrics
+from app.core.metrics import RouteHistogram, monitor_event_loop_lag
+from app.database import RequestQueries
+from app.tests.conftest import create_expense
+
+EXPENSE_ROUTE = "/api/v1/expenses/{expense_id}"
+
+
+class TestRequestQueries:
+    def test_counts_time_and_slowest(self):
+        queries = RequestQueries()
+        queries.record("SELECT 1", 0.002)
+        queries.record("SELECT 2", 0.005)
+
+        assert queries.count == 2
+        assert round(queries.seconds, 3) == 0.007
+        assert queries.slowest_statement == "SELECT 2"
+
+    def test_repeated_statements(self):
+        queries = RequestQueries()
+        for _ in range(3):
+            queries.record("SELECT * FROM categories WHERE id = ?", 0.001)
+        queries.record("SELECT 1", 0.001)
+
+        assert queries.repeated(3) == [("SELECT * FROM categories WHERE id = ?", 3)]
+        assert queries.repeated(4) == []
+
+
+class TestRouteHistogram:
+    def test_cumulative_buckets(self):
+        histogram = RouteHistogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        # a value equal to a bound falls in that bucket (le)
+        assert histogram.cumulative() == [("1.0", 2), ("5.0", 3), ("+Inf", 4)]
+        assert histogram.sum == 14.5
+
+
+class TestMetricsMiddleware:
+    def test_server_timing_header(
+        self, client, headers, created_expense_category, default_account
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        response = client.patch(
+            f"/api/v1/expenses/{expense['id']}",
+            json={"description": "lunch"},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        # lookup, data version and the UPDATE, plus the test session's savepoints
+        statements = int(re.search(r'desc="(\d+) statements"', timing).group(1))
+        assert statements >= 3
+        assert "db-slowest;dur=" in timing
+
+    def test_histograms_by_route_template(
+        self, client, headers, created_expense_category, default_account
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+        labels = {"method": "GET", "route": EXPENSE_ROUTE}
+        before = (
+            REGISTRY.get_sample_value("http_request_db_statements_count", labels) or 0
+        )
+
+        client.get(f"/api/v1/expenses/{expense['id']}", headers=headers)
+
+        assert (
+            REGISTRY.get_sample_value("http_request_db_statements_count", labels)
+            == before + 1
+        )
+
+    def test_repeated_statement_reported(
+        self,
+        client,
+        headers,
+        created_expense_category,
+        default_account,
+        monkeypatch,
+        capsys,
+    ):
+        monkeypatch.setattr(metrics, "DB_N_PLUS_ONE_THRESHOLD", 3)
+        operation = {
+            "method": "POST",
+            "resource": "expenses",
+            "body": {
+                "amount": "1",
+                "category_id": created_expense_category["id"],
+                "account_id": default_account["id"],
+            },
+        }
+
+        response = client.post(
+            "/api/v1/batch/", json={"operations": [operation] * 3}, headers=headers
+        )
+
+        assert response.status_code == 200
+        assert "SQL - probable N+1 on POST /api/v1/batch/" in capsys.readouterr().out
+
+    def test_latency_and_size_by_route_template(self, client, headers):
+        labels = {"method": "GET", "route": "/api/v1/categories/"}
+        before = REGISTRY.get_sample_value("http_response_size_bytes_sum", labels) or 0
+
+        response = client.get("/api/v1/categories/", headers=headers)
+
+        assert REGISTRY.get_sample_value(
+            "http_response_size_bytes_sum", labels
+        ) == before + len(response.content)
+        assert REGISTRY.get_sample_value("http_request_duration_seconds_count", labels)
+        assert REGISTRY.get_sample_value("http_requests_in_flight") == 0
+
+
+class TestMetricsEndpoint:
+    def test_exposition(self, client, headers):
+        client.get("/api/v1/accounts/", headers=headers)
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert (
+            'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/v1/accounts/"}'
+            in body
+        )
+        assert "db_pool_checkouts_total" in body
+        assert "password_hash_queue_depth" in body
+        assert "event_loop_lag_seconds_bucket" in body
+
+
+class TestEventLoopLag:
+    def test_blocking_call_shows_as_lag(self):
+        async def block_the_loop():
+            monitor = asyncio.create_task(monitor_event_loop_lag(0.01))
+            await asyncio.sleep(0.001)
+            # what a sync DB call inside an async def handler does
+            time.sleep(0.1)
+            await asyncio.sleep(0.03)
+            monitor.cancel()
+
+        before = REGISTRY.get_sample_value("event_loop_lag_seconds_sum") or 0
+        asyncio.run(block_the_loop())
+
+        assert REGISTRY.get_sample_value("event_loop_lag_seconds_sum") - before >= 0.05
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+import pytest
+from sqlmodel import select
+from app.commands import partition_transactions
+from app.models import Transaction
+from app.repositories.partition_repository import (
+    month_partition,
+    month_start,
+    months_to_cover,
+)
+from app.repositories.transaction_query import keyset_page
+from app.services.v1 import PartitionService
+
+
+class TestMonthPartition:
+    def test_month_start_crosses_years(self):
+        assert month_start(date(2025, 11, 20)) == date(2025, 11, 1)
+        assert month_start(date(2025, 11, 20), 2) == date(2026, 1, 1)
+        assert month_start(date(2026, 1, 31), -1) == date(2025, 12, 1)
+
+    def test_partition_bounds(self):
+        assert month_partition(date(2025, 12, 1)) == (
+            "transactions_y2025m12",
+            date(2025, 12, 1),
+            date(2026, 1, 1),
+        )
+
+    def test_months_cover_the_rows_and_the_months_ahead(self):
+        today = date(2025, 3, 10)
+
+        assert months_to_cover(date(2024, 12, 31), date(2025, 1, 2), today, 1) == [
+            date(2024, 12, 1),
+            date(2025, 1, 1),
+            date(2025, 2, 1),
+            date(2025, 3, 1),
+            date(2025, 4, 1),
+        ]
+        # an empty table, or rows dated past the months ahead
+        assert months_to_cover(None, None, today, 0) == [date(2025, 3, 1)]
+        assert months_to_cover(today, date(2025, 5, 1), today, 0)[-1] == date(
+            2025, 5, 1
+        )
+
+
+class TestPartitionService:
+    def test_plain_table_is_rejected(self, session):
+        if session.get_bind().dialect.name == "postgresql":
+            pytest.skip("the test database may have been partitioned")
+
+        with pytest.raises(ValueError, match="not partitioned"):
+            PartitionService(session).ensure_months_ahead()
+
+    def test_command_fails_without_partitioning(self, session, capsys, monkeypatch):
+        if session.get_bind().dialect.name == "postgresql":
+            pytest.skip("the test database may have been partitioned")
+        monkeypatch.setattr(partition_transactions, "engine", session.get_bind())
+
+        assert partition_transactions.main([]) == 1
+        assert "not partitioned" in capsys.readouterr().out
+
+    def test_convert_needs_postgresql(self, session, capsys, monkeypatch):
+        if session.get_bind().dialect.name == "postgresql":
+            pytest.skip("converting would rebuild the test database")
+        monkeypatch.setattr(partition_transactions, "engine", session.get_bind())
+
+        with pytest.raises(ValueError, match="needs PostgreSQL"):
+            PartitionService(session).convert()
+        assert partition_transactions.main(["--convert"]) == 1
+        assert "needs PostgreSQL" in capsys.readouterr().out
+
+
+class TestPartitionPruning:
+    def test_cursor_bounds_date_time(self):
+        after = (datetime(2025, 3, 1, 10), 42)
+        statement = keyset_page(select(Transaction), Transaction, 10, after)
+
+        # a plain date_time bound next to the row comparison, the one pruning can use
+        assert "transactions.date_time <= " in str(statement)
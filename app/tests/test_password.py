@@ -0,0 +1,77 @@
+import pytest
+from app.core import password_core
+from app.core.password_core import (
+    PasswordHasherBusyError,
+    hash_password,
+    verify_password,
+    needs_rehash,
+)
+from app.repositories.user_repository import UserRepository
+from app.tests.conftest import TEST_USERNAME, TEST_PASSWORD
+
+
+class TestPasswordHashing:
+    def test_hash_and_verify(self):
+        password_hash = hash_password("secret")
+        assert verify_password("secret", password_hash)
+        assert not verify_password("wrong", password_hash)
+
+    def test_needs_rehash_on_cost_change(self, monkeypatch):
+        password_hash = hash_password("secret")
+        assert not needs_rehash(password_hash)
+
+        monkeypatch.setattr(password_core, "BCRYPT_ROUNDS", 5)
+        assert needs_rehash(password_hash)
+
+    def test_rejects_when_queue_is_full(self, monkeypatch):
+        monkeypatch.setattr(password_core, "PASSWORD_POOL_SIZE", 0)
+        monkeypatch.setattr(password_core, "PASSWORD_QUEUE_LIMIT", 0)
+
+        with pytest.raises(PasswordHasherBusyError):
+            hash_password("secret")
+
+
+class TestLoginBackPressure:
+    def test_login_busy_returns_503(self, client, token, monkeypatch):
+        monkeypatch.setattr(password_core, "PASSWORD_POOL_SIZE", 0)
+        monkeypatch.setattr(password_core, "PASSWORD_QUEUE_LIMIT", 0)
+
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": TEST_USERNAME, "password": TEST_PASSWORD},
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_no_transaction_is_open_while_hashing(
+        self, client, session, token, monkeypatch
+    ):
+        submit = password_core._submit
+        in_transaction = []
+
+        def spy(fn, *args):
+            in_transaction.append(session.in_transaction())
+            return submit(fn, *args)
+
+        monkeypatch.setattr(password_core, "_submit", spy)
+        monkeypatch.setattr(password_core, "BCRYPT_ROUNDS", 5)
+
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": TEST_USERNAME, "password": TEST_PASSWORD},
+        )
+        assert response.status_code == 200
+        # the check and the rehash of the old cost
+        assert in_transaction == [False, False]
+
+    def test_login_rehashes_old_cost(self, client, session, token, monkeypatch):
+        monkeypatch.setattr(password_core, "BCRYPT_ROUNDS", 5)
+
+        response = client.post(
+            "/api/v1/auth/login",
+            data={"username": TEST_USERNAME, "password": TEST_PASSWORD},
+        )
+        assert response.status_code == 200
+
+        user = UserRepository(session).get_by_username(TEST_USERNAME)
+        assert user.password_hash.startswith("$2b$05$")
@@ -0,0 +1,295 @@
+import json
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import pytest
+from sqlalchemy import event
+from app.models import (
+    Account,
+    Budget,
+    Category,
+    DailyTransactionRollup,
+    MonthlyCategorySpend,
+    Transfer,
+    User,
+)
+from app.repositories.account_repository import AccountRepository
+from app.repositories.budget_repository import BudgetRepository
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.income_repository import IncomeRepository
+from app.repositories.ledger_repository import LedgerRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.spend_rollup_repository import SpendRollupRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.repositories.transfer_repository import TransferRepository
+from app.repositories.user_repository import UserRepository
+
+SEED_USERS = 3
+SEED_TRANSACTIONS_PER_USER = 200
+START = datetime(2025, 1, 1)
+# tables that grow with every write, a full read of one of these is what hurts. the
+# per user ones (categories, accounts) may still be joined through a full index walk
+GROWING_TABLES = {
+    "transactions",
+    "transfers",
+    "budgets",
+    "monthly_category_spend",
+    "daily_transaction_rollup",
+}
+
+
+@contextmanager
+def captured_queries(session):
+    """(statement, parameters) of every SELECT/UPDATE/DELETE sent while the block runs"""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.lstrip().split()[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            queries.append((statement, parameters))
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(session, statement, parameters) -> list[str]:
+    """growing tables the plan reads from start to end instead of through an index"""
+    connection = session.connection()
+
+    if connection.dialect.name == "postgresql":
+        # the seed is small enough that a seq scan would be cheaper, forbid it so the
+        # planner only falls back to one when no index fits
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        scans = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get("Plans", []))
+            if node.get("Relation Name") not in GROWING_TABLES:
+                continue
+            if node["Node Type"] == "Seq Scan" or (
+                node["Node Type"] in ("Index Scan", "Index Only Scan")
+                and "Index Cond" not in node
+            ):
+                scans.append(node["Relation Name"])
+        return scans
+
+    rows = connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    ).all()
+    # SEARCH is an index lookup/range, SCAN <table> reads all of it (even USING INDEX)
+    return [
+        match.group(1)
+        for match in (re.match(r"SCAN (\w+)", row[-1]) for row in rows)
+        if match is not None and match.group(1) in GROWING_TABLES
+    ]
+
+
+@pytest.fixture()
+def seed(session):
+    """a few users with accounts, categories, transactions, transfers, budgets and rollups"""
+    for index in range(SEED_USERS):
+        user = User(username=f"plan-user-{index}", password_hash="x")
+        session.add(user)
+        session.flush()
+
+        income_category = Category(name="Salary", type="income", user_id=user.id)
+        expense_category = Category(name="Food", type="expense", user_id=user.id)
+        cash = Account(name="Cash", user_id=user.id)
+        bank = Account(name="Bank", user_id=user.id)
+        session.add_all([income_category, expense_category, cash, bank])
+        session.flush()
+
+        rows = []
+        for offset in range(SEED_TRANSACTIONS_PER_USER):
+            kind = "income" if offset % 4 == 0 else "expense"
+            rows.append(
+                {
+                    "kind": kind,
+                    "amount": Decimal(offset + 1),
+                    "category_id": (
+                        income_category.id if kind == "income" else expense_category.id
+                    ),
+                    "account_id": cash.id if offset % 2 else bank.id,
+                    "description": None,
+                    "date_time": START + timedelta(hours=offset * 7),
+                    "user_id": user.id,
+                }
+            )
+        TransactionRepository(session).bulk_insert(rows)
+
+        session.add_all(
+            [
+                Transfer(
+                    amount=Decimal("5"),
+                    from_account_id=bank.id,
+                    to_account_id=cash.id,
+                    date_time=START + timedelta(days=offset),
+                    user_id=user.id,
+                )
+                for offset in range(20)
+            ]
+        )
+        session.add(
+            Budget(
+                limit_amount=Decimal("100"),
+                month=1,
+                year=2025,
+                user_id=user.id,
+                category_id=expense_category.id,
+            )
+        )
+        session.add(
+            MonthlyCategorySpend(
+                user_id=user.id,
+                year=2025,
+                month=1,
+                category_id=expense_category.id,
+                spent_amount=Decimal("10"),
+            )
+        )
+        session.add(
+            DailyTransactionRollup(
+                user_id=user.id,
+                day=date(2025, 1, 1),
+                kind="expense",
+                category_id=expense_category.id,
+                account_id=cash.id,
+                total_amount=Decimal("10"),
+                transaction_count=1,
+            )
+        )
+        session.flush()
+
+        seeded = {
+            "user_id": user.id,
+            "username": user.username,
+            "income_category_id": income_category.id,
+            "expense_category_id": expense_category.id,
+            "account_id": cash.id,
+            "other_account_id": bank.id,
+        }
+
+    return seeded
+
+
+def some_transaction_id(session, seed):
+    page = ExpenseRepository(session).get_page_by_user_with_category_and_account(
+        seed["user_id"], 1
+    )
+    return page[0][0].id
+
+
+# every read on a request path, plus the writes that filter (category/account delete)
+HOT_PATHS = {
+    "income page": lambda session, seed: IncomeRepository(
+        session
+    ).get_page_by_user_with_category_and_account(seed["user_id"], 50),
+    "expense page after cursor": lambda session, seed: ExpenseRepository(
+        session
+    ).get_page_by_user_with_category_and_account(
+        seed["user_id"], 50, (START + timedelta(days=30), 10**6)
+    ),
+    "expense page filtered": lambda session, seed: ExpenseRepository(
+        session
+    ).get_page_by_user_with_category_and_account(
+        seed["user_id"],
+        50,
+        date_from=START,
+        date_to=START + timedelta(days=30),
+        account_id=seed["account_id"],
+        category_id=seed["expense_category_id"],
+        min_amount=Decimal("2"),
+    ),
+    "transaction detail": lambda session, seed: ExpenseRepository(
+        session
+    ).get_by_id_and_user_with_category_and_account(
+        some_transaction_id(session, seed), seed["user_id"]
+    ),
+    "transaction update target": lambda session, seed: ExpenseRepository(
+        session
+    ).get_update_target(
+        some_transaction_id(session, seed),
+        seed["user_id"],
+        seed["income_category_id"],
+        seed["other_account_id"],
+    ),
+    "transaction category in use": lambda session, seed: TransactionRepository(
+        session
+    ).exists_by_category(seed["expense_category_id"]),
+    "transaction account in use": lambda session, seed: TransactionRepository(
+        session
+    ).exists_by_account(seed["account_id"]),
+    "account net balance": lambda session, seed: TransactionRepository(
+        session
+    ).get_total_balance_by_account(seed["account_id"]),
+    "ledger export": lambda session, seed: list(
+        LedgerRepository(session).stream_by_user(
+            seed["user_id"], 100, START, START + timedelta(days=30)
+        )
+    ),
+    "transfer page": lambda session, seed: TransferRepository(
+        session
+    ).get_page_by_user_with_accounts(seed["user_id"], 50),
+    "transfer account in use": lambda session, seed: TransferRepository(
+        session
+    ).exists_by_account(seed["account_id"]),
+    "budgets of month": lambda session, seed: BudgetRepository(
+        session
+    ).get_all_by_user_and_month_with_spent(seed["user_id"], 2025, 1),
+    "budget category in use": lambda session, seed: BudgetRepository(
+        session
+    ).exists_by_category(seed["expense_category_id"]),
+    "spent of month": lambda session, seed: SpendRollupRepository(session).get_spent(
+        seed["user_id"], seed["expense_category_id"], 2025, 1
+    ),
+    "spend rollup category delete": lambda session, seed: SpendRollupRepository(
+        session
+    ).delete_by_category(seed["expense_category_id"], seed["user_id"]),
+    "report series": lambda session, seed: ReportRepository(session).get_series_by_user(
+        seed["user_id"],
+        "month",
+        "expense",
+        START,
+        START + timedelta(days=90),
+        True,
+        True,
+    ),
+    "report category delete": lambda session, seed: ReportRepository(
+        session
+    ).delete_by_category(seed["expense_category_id"], seed["user_id"]),
+    "report account delete": lambda session, seed: ReportRepository(
+        session
+    ).delete_by_account(seed["account_id"], seed["user_id"]),
+    "categories of user": lambda session, seed: CategoryRepository(
+        session
+    ).get_all_by_user(seed["user_id"]),
+    "accounts of user": lambda session, seed: AccountRepository(
+        session
+    ).get_all_by_user(seed["user_id"]),
+    "user by username": lambda session, seed: UserRepository(session).get_by_username(
+        seed["username"]
+    ),
+}
+
+
+class TestQueryPlans:
+    @pytest.mark.parametrize("name", HOT_PATHS)
+    def test_hot_path_uses_indexes(self, session, seed, name):
+        with captured_queries(session) as queries:
+            HOT_PATHS[name](session, seed)
+
+        assert queries
+        for statement, parameters in queries:
+            assert full_scans(session, statement, parameters) == [], statement
@@ -0,0 +1,269 @@
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from sqlmodel import select
+from app.core import recurring_scheduler
+from app.core.recurrence import due_occurrences, occurrence
+from app.models import RecurringRule
+from app.services.v1.recurring_service import RecurringService
+from app.tests.conftest import account_balance, count_statements
+
+
+def create_rule(client, headers, category, account, **overrides):
+    body = {
+        "kind": "expense",
+        "amount": "100",
+        "category_id": category["id"],
+        "account_id": account["id"],
+        "description": "Rent",
+        "frequency": "monthly",
+        "starts_at": "2025-01-31T09:00:00",
+        **overrides,
+    }
+    response = client.post("/api/v1/recurring-rules/", json=body, headers=headers)
+    assert response.status_code == 201
+    return response.json()["created_item"]
+
+
+def expense_dates(client, headers):
+    response = client.get("/api/v1/expenses/", headers=headers)
+    return sorted(item["date_time"] for item in response.json())
+
+
+class TestRecurrence:
+    def test_monthly_clamps_to_the_last_day_and_comes_back(self):
+        starts_at = datetime(2025, 1, 31, 9)
+
+        dates = [occurrence(starts_at, "monthly", 1, index) for index in range(3)]
+
+        assert dates == [
+            datetime(2025, 1, 31, 9),
+            datetime(2025, 2, 28, 9),
+            datetime(2025, 3, 31, 9),
+        ]
+
+    def test_due_occurrences_stop_at_now_until_and_limit(self):
+        starts_at = datetime(2025, 1, 1)
+        now = datetime(2025, 1, 10)
+
+        assert len(list(due_occurrences(starts_at, "daily", 2, 0, now))) == 5
+        assert len(list(due_occurrences(starts_at, "daily", 1, 3, now, limit=4))) == 4
+        until = datetime(2025, 1, 15)
+        weekly = list(
+            due_occurrences(starts_at, "weekly", 1, 0, datetime(2026, 1, 1), until)
+        )
+        assert [index for index, _ in weekly] == [0, 1, 2]
+
+
+class TestRecurringRules:
+    def test_create_list_get_and_delete(
+        self, client, headers, created_expense_category, default_account
+    ):
+        rule = create_rule(client, headers, created_expense_category, default_account)
+        assert rule["category_name"] == created_expense_category["name"]
+        assert rule["next_run"] == "2025-01-31T09:00:00"
+
+        listed = client.get("/api/v1/recurring-rules/", headers=headers).json()
+        assert [item["id"] for item in listed] == [rule["id"]]
+
+        url = f"/api/v1/recurring-rules/{rule['id']}"
+        assert client.get(url, headers=headers).json()["frequency"] == "monthly"
+        assert client.delete(url, headers=headers).status_code == 204
+        assert client.get(url, headers=headers).status_code == 404
+
+    def test_category_of_the_other_type_is_a_conflict(
+        self, client, headers, created_category, default_account
+    ):
+        response = client.post(
+            "/api/v1/recurring-rules/",
+            json={
+                "kind": "expense",
+                "amount": "100",
+                "category_id": created_category["id"],
+                "account_id": default_account["id"],
+                "frequency": "monthly",
+                "starts_at": "2025-01-31T09:00:00",
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 409
+
+    def test_used_account_and_category_cannot_be_deleted(
+        self, client, headers, created_expense_category, created_account
+    ):
+        create_rule(client, headers, created_expense_category, created_account)
+
+        account_url = f"/api/v1/accounts/{created_account['id']}"
+        category_url = f"/api/v1/categories/{created_expense_category['id']}"
+        assert client.delete(account_url, headers=headers).status_code == 409
+        assert client.delete(category_url, headers=headers).status_code == 409
+
+
+class TestMaterializeDue:
+    def test_catches_up_and_posts_every_effect(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        rule = create_rule(client, headers, created_expense_category, default_account)
+
+        taken, posted = RecurringService(session).materialize_due(
+            now=datetime(2025, 4, 15)
+        )
+
+        assert (taken, posted) == (1, 3)
+        assert expense_dates(client, headers) == [
+            "2025-01-31T09:00:00",
+            "2025-02-28T09:00:00",
+            "2025-03-31T09:00:00",
+        ]
+        assert account_balance(client, headers, default_account) == Decimal("-300")
+        report = client.get(
+            "/api/v1/reports/transactions",
+            params={"bucket": "month", "kind": "expense"},
+            headers=headers,
+        ).json()
+        assert [(point["bucket"], point["count"]) for point in report] == [
+            ("2025-01-01", 1),
+            ("2025-02-01", 1),
+            ("2025-03-01", 1),
+        ]
+        detail = client.get(f"/api/v1/recurring-rules/{rule['id']}", headers=headers)
+        assert detail.json()["next_run"] == "2025-04-30T09:00:00"
+
+    def test_posting_twice_is_a_no_op(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        rule = create_rule(client, headers, created_expense_category, default_account)
+        service = RecurringService(session)
+        service.materialize_due(now=datetime(2025, 3, 1))
+
+        # a worker that crashed after posting, before moving the rule on
+        stored = session.get(RecurringRule, rule["id"])
+        stored.next_index = 0
+        stored.next_run = stored.starts_at
+        session.add(stored)
+        session.commit()
+
+        assert service.materialize_due(now=datetime(2025, 3, 1)) == (1, 0)
+        assert len(expense_dates(client, headers)) == 2
+        assert account_balance(client, headers, default_account) == Decimal("-200")
+
+    def test_until_finishes_the_rule_and_catch_up_is_capped(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        rule = create_rule(
+            client,
+            headers,
+            created_expense_category,
+            default_account,
+            frequency="daily",
+            starts_at="2025-01-01T00:00:00",
+            until="2025-01-05T00:00:00",
+        )
+        service = RecurringService(session)
+
+        assert service.materialize_due(now=datetime(2025, 2, 1), max_catch_up=3) == (
+            1,
+            3,
+        )
+        assert service.materialize_due(now=datetime(2025, 2, 1), max_catch_up=3) == (
+            1,
+            2,
+        )
+        assert service.materialize_due(now=datetime(2025, 2, 1)) == (0, 0)
+
+        stored = session.exec(
+            select(RecurringRule.next_run).where(RecurringRule.id == rule["id"])
+        ).one()
+        assert stored is None
+        assert len(expense_dates(client, headers)) == 5
+
+    def test_accounts_are_locked_in_id_order_first(
+        self,
+        client,
+        headers,
+        session,
+        created_expense_category,
+        default_account,
+        created_account,
+    ):
+        for account in (created_account, default_account):
+            create_rule(client, headers, created_expense_category, account)
+
+        with count_statements(session) as statements:
+            RecurringService(session).materialize_due(now=datetime(2025, 2, 1))
+
+        lock = next(
+            i
+            for i, statement in enumerate(statements)
+            if statement.startswith("SELECT accounts.id")
+        )
+        update = next(
+            i
+            for i, statement in enumerate(statements)
+            if statement.startswith("UPDATE accounts")
+        )
+        assert lock < update
+        assert statements[lock].rstrip().endswith("ORDER BY accounts.id")
+
+    def test_statements_do_not_grow_with_rules(
+        self,
+        client,
+        headers,
+        session,
+        created_expense_category,
+        created_category,
+        default_account,
+    ):
+        def statements_of_one_tick(now):
+            with count_statements(session) as statements:
+                RecurringService(session).materialize_due(now=now)
+            return len(statements)
+
+        create_rule(client, headers, created_expense_category, default_account)
+        one_rule = statements_of_one_tick(datetime(2025, 4, 15))
+
+        for category, kind in (
+            (created_expense_category, "expense"),
+            (created_category, "income"),
+        ):
+            for _ in range(3):
+                create_rule(
+                    client,
+                    headers,
+                    category,
+                    default_account,
+                    kind=kind,
+                    starts_at="2025-05-01T00:00:00",
+                    frequency="weekly",
+                )
+        many_rules = statements_of_one_tick(datetime(2025, 6, 15))
+
+        assert many_rules == one_rule
+
+
+class TestScheduler:
+    def test_keeps_running_after_a_failed_tick(self, monkeypatch, capsys):
+        ticks = []
+
+        def run_tick(batch_size):
+            ticks.append(batch_size)
+            if len(ticks) == 1:
+                raise ValueError("bad rule")
+            return 0, 0
+
+        monkeypatch.setattr(recurring_scheduler, "run_tick", run_tick)
+
+        async def run_a_while():
+            task = asyncio.create_task(
+                recurring_scheduler.run_recurring_scheduler(interval=0.01)
+            )
+            while len(ticks) < 3:
+                await asyncio.sleep(0.01)
+            task.cancel()
+
+        asyncio.run(asyncio.wait_for(run_a_while(), timeout=5))
+
+        assert (
+            "RECURRING - tick failed: ValueError: bad rule" in capsys.readouterr().out
+        )
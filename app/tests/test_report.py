@@ -0,0 +1,145 @@
+from decimal import Decimal
+
+
+def create_transaction(client, headers, path, category, account, amount, date_time):
+    response = client.post(
+        f"/api/v1/{path}/",
+        json={
+            "amount": amount,
+            "category_id": category["id"],
+            "account_id": account["id"],
+            "date_time": date_time,
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["created_item"]
+
+
+def get_report(client, headers, query):
+    response = client.get(f"/api/v1/reports/transactions?{query}", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestTransactionReport:
+    def test_monthly_by_category(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        for amount, date_time in (
+            ("10", "2025-03-01T10:00:00"),
+            ("20", "2025-03-15T10:00:00"),
+            ("5", "2025-04-02T10:00:00"),
+        ):
+            create_transaction(
+                client,
+                headers,
+                "expenses",
+                created_expense_category,
+                default_account,
+                amount,
+                date_time,
+            )
+        create_transaction(
+            client,
+            headers,
+            "incomes",
+            created_category,
+            default_account,
+            "100",
+            "2025-03-01T09:00:00",
+        )
+
+        report = get_report(
+            client, headers, "bucket=month&kind=expense&group_by=category"
+        )
+
+        assert [point["bucket"] for point in report] == ["2025-03-01", "2025-04-01"]
+        assert report[0]["category_name"] == "Food"
+        assert report[0]["account_id"] is None
+        assert Decimal(report[0]["total"]) == Decimal("30")
+        assert report[0]["count"] == 2
+        assert Decimal(report[0]["average"]) == Decimal("15")
+
+    def test_weekly_buckets_start_monday(
+        self, client, headers, created_expense_category, default_account
+    ):
+        # monday and sunday of one week, then the next monday
+        for date_time in (
+            "2025-03-03T10:00:00",
+            "2025-03-09T10:00:00",
+            "2025-03-10T10:00:00",
+        ):
+            create_transaction(
+                client,
+                headers,
+                "expenses",
+                created_expense_category,
+                default_account,
+                "1",
+                date_time,
+            )
+
+        report = get_report(client, headers, "bucket=week&group_by=account")
+
+        assert [(point["bucket"], point["count"]) for point in report] == [
+            ("2025-03-03", 2),
+            ("2025-03-10", 1),
+        ]
+        assert report[0]["account_name"] == "Cash"
+
+    def test_report_follows_updates_and_deletes(
+        self, client, headers, created_expense_category, default_account
+    ):
+        expense = create_transaction(
+            client,
+            headers,
+            "expenses",
+            created_expense_category,
+            default_account,
+            "10",
+            "2025-03-01T10:00:00",
+        )
+        client.patch(
+            f"/api/v1/expenses/{expense['id']}",
+            json={"date_time": "2025-03-02T10:00:00"},
+            headers=headers,
+        )
+
+        report = get_report(client, headers, "bucket=day")
+        assert [point["bucket"] for point in report] == ["2025-03-02"]
+
+        client.delete(f"/api/v1/expenses/{expense['id']}", headers=headers)
+        assert get_report(client, headers, "bucket=day") == []
+
+    def test_date_range(
+        self, client, headers, created_expense_category, default_account
+    ):
+        for date_time in ("2025-03-01T10:00:00", "2025-05-01T10:00:00"):
+            create_transaction(
+                client,
+                headers,
+                "expenses",
+                created_expense_category,
+                default_account,
+                "1",
+                date_time,
+            )
+
+        report = get_report(
+            client, headers, "bucket=year&date_from=2025-04-01&date_to=2026-01-01"
+        )
+        assert [(point["bucket"], point["count"]) for point in report] == [
+            ("2025-01-01", 1)
+        ]
+
+    def test_invalid_bucket(self, client, headers):
+        response = client.get(
+            "/api/v1/reports/transactions?bucket=hour", headers=headers
+        )
+        assert response.status_code == 422
@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+from app.models import Transaction
+from app.repositories.transaction_query import ranked_page, search_transactions
+
+SEARCH_URL = "/api/v1/transactions/search"
+
+
+def create_transactions(client, headers, kind, category, account, descriptions):
+    start = datetime(2025, 1, 1, 12, 0, 0)
+    for i, description in enumerate(descriptions):
+        response = client.post(
+            f"/api/v1/{kind}s/",
+            json={
+                "amount": "10",
+                "category_id": category["id"],
+                "account_id": account["id"],
+                "description": description,
+                "date_time": (start + timedelta(days=i)).isoformat(),
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+
+
+def descriptions(response):
+    return [row["description"] for row in response.json()]
+
+
+class TestSearch:
+    def test_matches_words_of_both_kinds(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        create_transactions(
+            client,
+            headers,
+            "expense",
+            created_expense_category,
+            default_account,
+            ["Monthly rent", "Groceries"],
+        )
+        create_transactions(
+            client,
+            headers,
+            "income",
+            created_category,
+            default_account,
+            ["Rent from lodger"],
+        )
+
+        response = client.get(SEARCH_URL, params={"q": "rent"}, headers=headers)
+
+        assert response.status_code == 200
+        assert sorted(descriptions(response)) == ["Monthly rent", "Rent from lodger"]
+        assert {row["kind"] for row in response.json()} == {"income", "expense"}
+
+    def test_kind_and_filters(
+        self,
+        client,
+        headers,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        create_transactions(
+            client,
+            headers,
+            "expense",
+            created_expense_category,
+            default_account,
+            ["rent january", "rent february"],
+        )
+        create_transactions(
+            client, headers, "income", created_category, default_account, ["rent"]
+        )
+
+        response = client.get(
+            SEARCH_URL,
+            params={"q": "rent", "kind": "expense", "date_from": "2025-01-02T00:00:00"},
+            headers=headers,
+        )
+
+        assert descriptions(response) == ["rent february"]
+
+    def test_updated_and_deleted_rows(
+        self, client, headers, created_expense_category, default_account
+    ):
+        create_transactions(
+            client,
+            headers,
+            "expense",
+            created_expense_category,
+            default_account,
+            ["coffee", "cinema"],
+        )
+        coffee, cinema = sorted(
+            client.get("/api/v1/expenses/", headers=headers).json(),
+            key=lambda row: row["date_time"],
+        )
+        client.patch(
+            f"/api/v1/expenses/{coffee['id']}",
+            json={"description": "espresso"},
+            headers=headers,
+        )
+        client.delete(f"/api/v1/expenses/{cinema['id']}", headers=headers)
+
+        assert (
+            client.get(SEARCH_URL, params={"q": "coffee"}, headers=headers).json() == []
+        )
+        assert (
+            client.get(SEARCH_URL, params={"q": "cinema"}, headers=headers).json() == []
+        )
+        assert descriptions(
+            client.get(SEARCH_URL, params={"q": "espresso"}, headers=headers)
+        ) == ["espresso"]
+
+    def test_pages_follow_cursor(
+        self, client, headers, created_expense_category, default_account
+    ):
+        create_transactions(
+            client,
+            headers,
+            "expense",
+            created_expense_category,
+            default_account,
+            [f"taxi {i}" for i in range(5)],
+        )
+
+        seen = []
+        params = {"q": "taxi", "limit": 2}
+        while True:
+            response = client.get(SEARCH_URL, params=params, headers=headers)
+            seen += descriptions(response)
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        # equal ranks, so newest first
+        assert seen == [f"taxi {i}" for i in reversed(range(5))]
+
+    def test_pages_through_equal_rank_and_date(
+        self, client, headers, created_expense_category, default_account
+    ):
+        for _ in range(5):
+            response = client.post(
+                "/api/v1/expenses/",
+                json={
+                    "amount": "10",
+                    "category_id": created_expense_category["id"],
+                    "account_id": default_account["id"],
+                    "description": "parking",
+                    "date_time": "2025-01-01T12:00:00",
+                },
+                headers=headers,
+            )
+            assert response.status_code == 201
+
+        seen = []
+        params = {"q": "parking", "limit": 2}
+        while True:
+            response = client.get(SEARCH_URL, params=params, headers=headers)
+            seen += [row["id"] for row in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        assert len(seen) == 5
+        assert seen == sorted(set(seen), reverse=True)
+
+    def test_postgresql_rank_is_double_precision(self):
+        statement, rank = search_transactions(
+            select(Transaction.id), "postgresql", "rent"
+        )
+        statement = ranked_page(
+            statement.add_columns(rank), rank, 2, (0.5, datetime(2025, 1, 1), 7)
+        )
+
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+
+        # the selected rank, the cursor comparison and ORDER BY all use the float8 one
+        assert sql.count("AS FLOAT(53))") == 4
+        assert "ts_rank" not in sql.replace("CAST(ts_rank", "")
+
+    def test_other_users_rows_not_found(
+        self, client, headers, created_expense_category, default_account
+    ):
+        create_transactions(
+            client,
+            headers,
+            "expense",
+            created_expense_category,
+            default_account,
+            ["secret"],
+        )
+        client.post(
+            "/api/v1/auth/register",
+            json={"username": "otheruser", "password": "password123"},
+        )
+        login = client.post(
+            "/api/v1/auth/login",
+            data={"username": "otheruser", "password": "password123"},
+        )
+        other = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        assert (
+            client.get(SEARCH_URL, params={"q": "secret"}, headers=other).json() == []
+        )
+
+    def test_query_without_words(self, client, headers):
+        response = client.get(SEARCH_URL, params={"q": "!!"}, headers=headers)
+        assert response.status_code == 400
+
+    def test_query_required(self, client, headers):
+        response = client.get(SEARCH_URL, headers=headers)
+        assert response.status_code == 422
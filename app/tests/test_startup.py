@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[2]
+# cumulative microseconds `import app.main` may take, fastapi and sqlmodel alone are
+# most of it. raise it on purpose, not to make a slow import pass
+IMPORT_TIME_BUDGET_US = int(os.environ.get("IMPORT_TIME_BUDGET_US", 2_500_000))
+# only needed once a request uses them, never at import
+LAZY_MODULES = ("jose", "pyarrow", "alembic")
+
+
+def import_times() -> dict[str, int]:
+    """module -> cumulative import microseconds of `import app.main` in a fresh process"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    # import time: self [us] | cumulative | imported package
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime:
+    def test_within_budget_without_lazy_modules(self):
+        times = import_times()
+
+        assert times["app.main"] < IMPORT_TIME_BUDGET_US
+        loaded = [module for module in times if module.split(".")[0] in LAZY_MODULES]
+        assert loaded == []
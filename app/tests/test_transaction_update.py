@@ -0,0 +1,268 @@
+from decimal import Decimal
+from sqlmodel import update
+from app.models import Transaction
+from app.repositories.expense_repository import ExpenseRepository
+from app.repositories.transaction_repository import TransactionRepository
+from app.tests.conftest import count_statements, create_expense
+
+
+def touching(statements, table):
+    return [statement for statement in statements if table in statement]
+
+
+class TestTransactionUpdateStatements:
+    def test_description_update_is_three_statements(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        with count_statements(session) as statements:
+            response = client.patch(
+                f"/api/v1/expenses/{expense['id']}",
+                json={"description": "lunch"},
+                headers=headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["category_name"] == "Food"
+        # the lookup/validation SELECT, the data version and the UPDATE, effects cancel out
+        assert len(statements) == 3
+
+    def test_amount_update_writes_each_effect_once(
+        self, client, headers, session, created_expense_category, default_account
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        with count_statements(session) as statements:
+            response = client.patch(
+                f"/api/v1/expenses/{expense['id']}",
+                json={"amount": "25"},
+                headers=headers,
+            )
+
+        assert response.status_code == 200
+        assert len(touching(statements, "transactions")) == 2
+        # balance, daily report rollup and monthly spend, one net delta each
+        assert len(statements) == 6
+
+        balance = client.get(
+            f"/api/v1/accounts/{default_account['id']}/balance", headers=headers
+        ).json()["balance"]
+        assert Decimal(str(balance)) == Decimal("-25")
+
+    def test_move_to_other_account_returns_new_name(
+        self,
+        client,
+        headers,
+        session,
+        created_expense_category,
+        default_account,
+        created_account,
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        with count_statements(session) as statements:
+            response = client.patch(
+                f"/api/v1/expenses/{expense['id']}",
+                json={"account_id": created_account["id"]},
+                headers=headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["account_name"] == "Bank"
+        # the account is validated in the same SELECT, no separate lookup
+        assert len(touching(statements, "FROM accounts")) == 0
+
+
+class TestTransactionUpdateValidation:
+    def test_update_other_type_not_found(
+        self, client, headers, created_expense_category, default_account
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        response = client.patch(
+            f"/api/v1/incomes/{expense['id']}",
+            json={"amount": "5"},
+            headers=headers,
+        )
+        assert response.status_code == 404
+
+    def test_update_unknown_account(
+        self, client, headers, created_expense_category, default_account
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        response = client.patch(
+            f"/api/v1/expenses/{expense['id']}",
+            json={"account_id": 999999},
+            headers=headers,
+        )
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Account not found"
+
+
+class TestTransactionConversion:
+    def test_convert_updates_the_row_in_place(
+        self,
+        client,
+        headers,
+        session,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        expense = create_expense(
+            client, headers, created_expense_category, default_account
+        )
+
+        with count_statements(session) as statements:
+            response = client.patch(
+                f"/api/v1/expenses/{expense['id']}",
+                json={"category_id": created_category["id"]},
+                headers=headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["id"] == expense["id"]
+        # no DELETE + INSERT, the kind is just another column
+        writes = [
+            statement.split()[0]
+            for statement in touching(statements, "transactions")
+            if not statement.startswith("SELECT")
+        ]
+        assert writes == ["UPDATE"]
+
+        assert (
+            client.get(f"/api/v1/incomes/{expense['id']}", headers=headers).status_code
+            == 200
+        )
+        assert (
+            client.get(f"/api/v1/expenses/{expense['id']}", headers=headers).status_code
+            == 404
+        )
+
+    def test_signed_amount_nets_both_kinds(
+        self,
+        client,
+        headers,
+        session,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        create_expense(
+            client, headers, created_expense_category, default_account, amount="30"
+        )
+        client.post(
+            "/api/v1/incomes/",
+            json={
+                "amount": "100",
+                "category_id": created_category["id"],
+                "account_id": default_account["id"],
+            },
+            headers=headers,
+        )
+
+        repo = TransactionRepository(session)
+        assert repo.get_total_balance_by_account(default_account["id"]) == Decimal("70")
+        assert ExpenseRepository(session).get_total_balance_by_account(
+            default_account["id"]
+        ) == Decimal("30")
+
+
+class TestLegacyIds:
+    def merged_pair(
+        self, client, headers, session, income_category, expense_category, account
+    ):
+        """an income and an expense that shared an id before the merge migration"""
+        income = client.post(
+            "/api/v1/incomes/",
+            json={
+                "amount": "100",
+                "category_id": income_category["id"],
+                "account_id": account["id"],
+            },
+            headers=headers,
+        ).json()["created_item"]
+        expense = create_expense(client, headers, expense_category, account)
+        session.exec(
+            update(Transaction)
+            .where(Transaction.id == expense["id"])
+            .values(legacy_id=income["id"])
+        )
+        session.commit()
+        return income, expense
+
+    def test_old_expense_ids_still_address_the_expense(
+        self,
+        client,
+        headers,
+        session,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        income, expense = self.merged_pair(
+            client,
+            headers,
+            session,
+            created_category,
+            created_expense_category,
+            default_account,
+        )
+        old_url = f"/api/v1/expenses/{income['id']}"
+
+        detail = client.get(old_url, headers=headers)
+        assert detail.status_code == 200
+        assert detail.json()["id"] == income["id"]
+        assert Decimal(detail.json()["amount"]) == Decimal("10")
+        listed = client.get("/api/v1/expenses/", headers=headers).json()
+        assert [item["id"] for item in listed] == [income["id"]]
+        # the row's own id is not an expense id anymore
+        row_url = f"/api/v1/expenses/{expense['id']}"
+        assert client.get(row_url, headers=headers).status_code == 404
+        assert client.delete(row_url, headers=headers).status_code == 404
+
+        assert client.delete(old_url, headers=headers).status_code == 204
+        remaining = client.get(f"/api/v1/incomes/{income['id']}", headers=headers)
+        assert Decimal(remaining.json()["amount"]) == Decimal("100")
+
+    def test_converted_row_gets_its_own_id(
+        self,
+        client,
+        headers,
+        session,
+        created_category,
+        created_expense_category,
+        default_account,
+    ):
+        income, expense = self.merged_pair(
+            client,
+            headers,
+            session,
+            created_category,
+            created_expense_category,
+            default_account,
+        )
+
+        response = client.patch(
+            f"/api/v1/expenses/{income['id']}",
+            json={"category_id": created_category["id"]},
+            headers=headers,
+        )
+
+        assert response.json()["id"] == expense["id"]
+        incomes = client.get("/api/v1/incomes/", headers=headers).json()
+        assert sorted(item["id"] for item in incomes) == sorted(
+            [income["id"], expense["id"]]
+        )
@@ -0,0 +1,141 @@
+from decimal import Decimal
+from sqlmodel import update
+from app.models import Transfer
+from app.repositories.account_repository import AccountRepository
+from app.repositories.user_repository import UserRepository
+from app.services.v1 import AccountService, TransferService
+from app.tests.conftest import TEST_USERNAME, account_balance
+
+
+def create_transfer(client, headers, from_account, to_account, amount):
+    return client.post(
+        "/api/v1/transfers/",
+        json={
+            "amount": amount,
+            "from_account_id": from_account["id"],
+            "to_account_id": to_account["id"],
+        },
+        headers=headers,
+    )
+
+
+class TestCreateTransfer:
+    def test_create_moves_balance(
+        self, client, headers, default_account, created_account
+    ):
+        response = create_transfer(
+            client, headers, default_account, created_account, "40"
+        )
+        assert response.status_code == 201
+        created = response.json()["created_item"]
+        assert created["from_account_name"] == default_account["name"]
+        assert created["to_account_name"] == created_account["name"]
+
+        assert account_balance(client, headers, default_account) == Decimal("-40")
+        assert account_balance(client, headers, created_account) == Decimal("40")
+
+    def test_create_same_account(self, client, headers, default_account):
+        response = create_transfer(
+            client, headers, default_account, default_account, "10"
+        )
+        assert response.status_code == 400
+
+    def test_create_unknown_account(self, client, headers, default_account):
+        response = create_transfer(client, headers, default_account, {"id": 999}, "10")
+        assert response.status_code == 404
+
+    def test_create_unauthorized(self, client):
+        response = client.post("/api/v1/transfers/", json={})
+        assert response.status_code == 401
+
+
+class TestUpdateDeleteTransfer:
+    def test_update_amount_and_direction(
+        self, client, headers, default_account, created_account
+    ):
+        transfer = create_transfer(
+            client, headers, default_account, created_account, "40"
+        ).json()["created_item"]
+
+        response = client.patch(
+            f"/api/v1/transfers/{transfer['id']}",
+            json={
+                "amount": "15",
+                "from_account_id": created_account["id"],
+                "to_account_id": default_account["id"],
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert account_balance(client, headers, default_account) == Decimal("15")
+        assert account_balance(client, headers, created_account) == Decimal("-15")
+
+    def test_delete_restores_balance(
+        self, client, headers, default_account, created_account
+    ):
+        transfer = create_transfer(
+            client, headers, default_account, created_account, "40"
+        ).json()["created_item"]
+
+        response = client.delete(f"/api/v1/transfers/{transfer['id']}", headers=headers)
+        assert response.status_code == 204
+        assert account_balance(client, headers, default_account) == Decimal("0")
+        assert account_balance(client, headers, created_account) == Decimal("0")
+
+    def test_delete_reverses_the_locked_row(
+        self, client, headers, session, default_account, created_account
+    ):
+        transfer = create_transfer(
+            client, headers, default_account, created_account, "40"
+        ).json()["created_item"]
+        # the session still holds the transfer at 40 while another request moves it
+        # down to 10 and commits before this delete takes its locks
+        stale = session.get(Transfer, transfer["id"])
+        assert stale.amount == Decimal("40")
+        session.exec(
+            update(Transfer)
+            .where(Transfer.id == transfer["id"])
+            .values(amount=Decimal("10"))
+            .execution_options(synchronize_session=False)
+        )
+        accounts = AccountRepository(session)
+        accounts.apply_balance_delta(
+            default_account["id"], transfer_delta=Decimal("30")
+        )
+        accounts.apply_balance_delta(
+            created_account["id"], transfer_delta=Decimal("-30")
+        )
+        user = UserRepository(session).get_by_username(TEST_USERNAME)
+
+        TransferService(session).delete(transfer["id"], user.id)
+
+        assert account_balance(client, headers, default_account) == Decimal("0")
+        assert account_balance(client, headers, created_account) == Decimal("0")
+
+    def test_account_with_transfers_cannot_be_deleted(
+        self, client, headers, default_account, created_account
+    ):
+        create_transfer(client, headers, default_account, created_account, "40")
+
+        response = client.delete(
+            f"/api/v1/accounts/{created_account['id']}", headers=headers
+        )
+        assert response.status_code == 409
+
+
+class TestListTransfers:
+    def test_list(self, client, headers, default_account, created_account):
+        create_transfer(client, headers, default_account, created_account, "1")
+        create_transfer(client, headers, default_account, created_account, "2")
+
+        response = client.get("/api/v1/transfers/?limit=1", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" in response.headers
+
+    def test_reconcile_includes_transfers(
+        self, client, session, headers, default_account, created_account
+    ):
+        create_transfer(client, headers, default_account, created_account, "5")
+
+        assert AccountService(session).reconcile_balances() == []
@@ -0,0 +1,140 @@
+"""synthetic ledgers, the same rows every time for a given size"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import islice
+from typing import Iterator
+from sqlmodel import Session
+from app.models import Transfer
+from app.repositories.user_repository import UserRepository
+from app.services.v1 import (
+    AccountService,
+    AuthService,
+    BudgetService,
+    CategoryService,
+    ImportService,
+)
+
+# transactions in the benchmarked user's ledger
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+PASSWORD = "benchmark-password"
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+# three years of history, spread evenly
+SPAN = timedelta(days=3 * 365)
+INCOME_CATEGORIES = ["Salary", "Freelance", "Interest"]
+EXPENSE_CATEGORIES = [
+    "Rent",
+    "Groceries",
+    "Restaurants",
+    "Transport",
+    "Utilities",
+    "Health",
+    "Travel",
+    "Shopping",
+]
+# besides the Cash account every user gets on register
+ACCOUNTS = ["Bank", "Card", "Savings"]
+# one transfer per this many transactions
+TRANSFER_RATIO = 50
+# rows per import call (one commit each), the import itself inserts in IMPORT_BATCH_SIZE
+IMPORT_CHUNK = 100_000
+CSV_HEADER = "type,amount,date_time,category_id,account_id,description\n"
+
+
+def username(size: str) -> str:
+    return f"bench-{size}"
+
+
+def ledger_lines(
+    count: int,
+    category_ids: dict[str, list[int]],
+    account_ids: list[int],
+    seed: int = 0,
+) -> Iterator[str]:
+    """count CSV rows (no header) oldest first, about one income for six expenses"""
+    rng = random.Random(seed)
+    step = SPAN / count
+
+    for index in range(count):
+        kind = "income" if rng.random() < 0.15 else "expense"
+        cents = (
+            rng.randint(10_000, 500_000)
+            if kind == "income"
+            else rng.randint(100, 50_000)
+        )
+        date_time = START + step * index
+        yield (
+            f"{kind},{Decimal(cents) / 100},{date_time.isoformat()},"
+            f"{rng.choice(category_ids[kind])},{rng.choice(account_ids)},row {index}\n"
+        )
+
+
+def seed_ledger(session: Session, size: str) -> int:
+    """the benchmark user of this size, created with its whole ledger on first use
+
+    goes through the services (import included) so balances, budget spend and the
+    report rollup match what the API would have written. returns the user id
+    """
+    user = UserRepository(session).get_by_username(username(size))
+    if user is not None:
+        return user.id
+
+    count = SIZES[size]
+    user_id = AuthService(session).register_user(username(size), PASSWORD).id
+
+    category_service = CategoryService(session)
+    category_ids = {
+        kind: [category_service.create(name, kind, user_id).id for name in names]
+        for kind, names in (
+            ("income", INCOME_CATEGORIES),
+            ("expense", EXPENSE_CATEGORIES),
+        )
+    }
+    account_service = AccountService(session)
+    for name in ACCOUNTS:
+        account_service.create(name, Decimal("0"), user_id)
+    account_ids = [account.id for account in account_service.list_by_user(user_id)]
+
+    lines = ledger_lines(count, category_ids, account_ids)
+    import_service = ImportService(session)
+    while chunk := list(islice(lines, IMPORT_CHUNK)):
+        import_service.import_transactions("csv", [CSV_HEADER, *chunk], user_id)
+
+    _seed_transfers(session, user_id, account_ids, count // TRANSFER_RATIO)
+    # transfers went in without touching the balances, recompute them in one pass
+    account_service.reconcile_balances(fix=True)
+
+    budget_service = BudgetService(session)
+    last_day = (START + SPAN).date()
+    for months_back in range(12):
+        month_index = last_day.year * 12 + last_day.month - 1 - months_back
+        month_date = date(month_index // 12, month_index % 12 + 1, 1)
+        for category_id in category_ids["expense"]:
+            budget_service.create(
+                category_id, Decimal("500"), month_date.month, month_date.year, user_id
+            )
+
+    return user_id
+
+
+def _seed_transfers(
+    session: Session, user_id: int, account_ids: list[int], count: int
+) -> None:
+    rng = random.Random(1)
+    step = SPAN / max(count, 1)
+
+    for offset in range(0, count, 1000):
+        for index in range(offset, min(offset + 1000, count)):
+            from_account_id, to_account_id = rng.sample(account_ids, 2)
+            session.add(
+                Transfer(
+                    amount=Decimal(rng.randint(1_000, 100_000)) / 100,
+                    from_account_id=from_account_id,
+                    to_account_id=to_account_id,
+                    description=f"transfer {index}",
+                    date_time=START + step * index,
+                    user_id=user_id,
+                )
+            )
+        session.commit()
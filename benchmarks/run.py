@@ -0,0 +1,215 @@
+"""benchmark every router in process against a seeded synthetic ledger
+
+usage:
+    DATABASE_URL=sqlite:////tmp/bench.db python -m benchmarks.run --size 1k
+    python -m benchmarks.run --size 100k --save                  # store as the baseline
+    python -m benchmarks.run --size 1k --compare                 # exit 1 on a regression
+    python -m benchmarks.run --size 1k -k expenses               # matching scenarios only
+
+DATABASE_URL must point at a throwaway database: the tables are created when missing
+and a ledger of the requested size is seeded once, later runs reuse it
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+import httpx
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel
+from app import database
+from app.main import app
+from benchmarks.ledger import PASSWORD, SIZES, seed_ledger, username
+from benchmarks.scenarios import SCENARIOS, prepare
+
+BASELINES = Path(__file__).parent / "baselines"
+# latency differences below this are noise on any machine
+NOISE_FLOOR_MS = 1.0
+
+
+class QueryCounter:
+    """statements sent by every engine serving requests"""
+
+    def __init__(self):
+        self.count = 0
+        engines = [database.engine]
+        if database.async_engine is not None:
+            engines.append(database.async_engine.sync_engine)
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        self.count += 1
+
+
+def percentile(cut_points: list[float], p: int) -> float:
+    return cut_points[p - 1]
+
+
+async def run_scenario(client, context, scenario, requests: int, warmup: int, counter):
+    for _ in range(warmup):
+        await scenario(client, context)
+
+    latencies = []
+    queries = 0
+    for _ in range(requests):
+        before = counter.count
+        started = time.perf_counter()
+        response = await scenario(client, context)
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries += counter.count - before
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{response.request.method} {response.request.url} answered"
+                f" {response.status_code}: {response.text[:200]}"
+            )
+
+    # peak memory allocated while serving one more request, traced apart from the timings
+    tracemalloc.start()
+    await scenario(client, context)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": round(percentile(cut_points, 50), 3),
+        "p95_ms": round(percentile(cut_points, 95), 3),
+        "p99_ms": round(percentile(cut_points, 99), 3),
+        "queries": round(queries / requests, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+async def run(size: str, requests: int, warmup: int, pattern: str | None) -> dict:
+    counter = QueryCounter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        login = await client.post(
+            "/api/v1/auth/login",
+            data={"username": username(size), "password": PASSWORD},
+        )
+        token = login.raise_for_status().json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+        context = await prepare(client)
+
+        results = {}
+        for name, scenario in SCENARIOS.items():
+            if pattern and pattern not in name:
+                continue
+            results[name] = await run_scenario(
+                client, context, scenario, requests, warmup, counter
+            )
+            print_row(name, results[name])
+
+    return results
+
+
+def print_row(name: str, result: dict) -> None:
+    print(
+        f"{name:<32} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f}"
+        f" {result['p99_ms']:>9.2f} {result['queries']:>8.2f} {result['peak_kib']:>10.1f}"
+    )
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """query counts may not grow at all, latency and memory only beyond the tolerance"""
+    found = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["queries"] > expected["queries"]:
+            found.append(
+                f"{name}: {result['queries']} queries per request,"
+                f" baseline {expected['queries']}"
+            )
+        # the median, tail latencies of a few dozen requests are too noisy to gate on
+        if (
+            result["p50_ms"] > expected["p50_ms"] * (1 + tolerance)
+            and result["p50_ms"] - expected["p50_ms"] > NOISE_FLOOR_MS
+        ):
+            found.append(
+                f"{name}: p50 {result['p50_ms']} ms, baseline {expected['p50_ms']} ms"
+            )
+        if result["peak_kib"] > expected["peak_kib"] * (1 + tolerance):
+            found.append(
+                f"{name}: peak {result['peak_kib']} KiB, baseline {expected['peak_kib']} KiB"
+            )
+    return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="1k")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="timed requests per scenario"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=5, help="untimed requests per scenario first"
+    )
+    parser.add_argument("-k", dest="pattern", help="only scenarios containing this")
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument(
+        "--compare", action="store_true", help="exit 1 when worse than the baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="allowed latency/memory growth over the baseline (0.5 = 50%%)",
+    )
+    args = parser.parse_args(argv)
+    if args.requests < 2:
+        parser.error("--requests must be at least 2")
+
+    SQLModel.metadata.create_all(database.engine)
+    started = time.perf_counter()
+    with Session(database.engine) as session:
+        seed_ledger(session, args.size)
+    print(
+        f"BENCHMARK - ledger {args.size} ready in {time.perf_counter() - started:.1f}s"
+    )
+
+    print(
+        f"{'scenario':<32} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+        f" {'queries':>8} {'peak KiB':>10}"
+    )
+    results = asyncio.run(run(args.size, args.requests, args.warmup, args.pattern))
+
+    dialect = database.engine.dialect.name
+    baseline_path = BASELINES / f"{dialect}-{args.size}.json"
+    if args.save:
+        baseline = {}
+        if baseline_path.exists():
+            baseline = json.loads(baseline_path.read_text())
+        baseline.update(results)
+        BASELINES.mkdir(exist_ok=True)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"BENCHMARK - baseline saved to {baseline_path}")
+
+    if args.compare:
+        if not baseline_path.exists():
+            print(f"BENCHMARK - no baseline at {baseline_path}")
+            return 1
+        found = regressions(
+            results, json.loads(baseline_path.read_text()), args.tolerance
+        )
+        for regression in found:
+            print(f"BENCHMARK - regression {regression}")
+        if found:
+            return 1
+        print("BENCHMARK - no regression against the baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
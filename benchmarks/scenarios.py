@@ -0,0 +1,136 @@
+"""one request per scenario, together they cover every router
+
+a scenario gets the authenticated client and the context built by prepare() and
+returns the response. they run in this order, the expense writes feed each other
+"""
+
+from datetime import timedelta
+from typing import Awaitable, Callable
+import httpx
+from benchmarks.ledger import SPAN, START
+
+Scenario = Callable[[httpx.AsyncClient, dict], Awaitable[httpx.Response]]
+
+LAST_MONTH_FROM = (START + SPAN - timedelta(days=30)).isoformat()
+LAST_MONTH_TO = (START + SPAN).isoformat()
+
+
+async def prepare(client: httpx.AsyncClient) -> dict:
+    """ids, a cursor and an ETag of the benchmark user, read through the API"""
+    categories = (await client.get("/api/v1/categories/")).raise_for_status()
+    accounts = (await client.get("/api/v1/accounts/")).json()
+    expenses = (await client.get("/api/v1/expenses/")).raise_for_status()
+    transfers = (await client.get("/api/v1/transfers/")).json()
+
+    expense_category = next(
+        category for category in categories.json() if category["type"] == "expense"
+    )
+    return {
+        "category_id": expense_category["id"],
+        "categories_etag": categories.headers["ETag"],
+        "account_id": accounts[0]["id"],
+        "expense_id": expenses.json()[0]["id"],
+        "expense_cursor": expenses.headers.get("X-Next-Cursor"),
+        "transfer_id": transfers[0]["id"] if transfers else None,
+        # the ledger's last month, it has budgets
+        "budget_month": (START + SPAN).month,
+        "budget_year": (START + SPAN).year,
+        # ids made by "expense create", updated and then deleted by the next two
+        "created": [],
+    }
+
+
+async def _create_expense(client: httpx.AsyncClient, context: dict):
+    response = await client.post(
+        "/api/v1/expenses/",
+        json={
+            "amount": "12.50",
+            "category_id": context["category_id"],
+            "account_id": context["account_id"],
+            "description": "benchmark",
+        },
+    )
+    if response.status_code == 201:
+        context["created"].append(response.json()["created_item"]["id"])
+    return response
+
+
+async def _update_expense(client: httpx.AsyncClient, context: dict):
+    # rotate so every created expense is updated in turn
+    expense_id = context["created"].pop(0)
+    context["created"].append(expense_id)
+    return await client.patch(
+        f"/api/v1/expenses/{expense_id}", json={"amount": "13.75"}
+    )
+
+
+async def _delete_expense(client: httpx.AsyncClient, context: dict):
+    return await client.delete(f"/api/v1/expenses/{context['created'].pop()}")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "incomes page": lambda client, context: client.get("/api/v1/incomes/"),
+    "expenses page": lambda client, context: client.get("/api/v1/expenses/"),
+    "expenses next page": lambda client, context: client.get(
+        "/api/v1/expenses/", params={"cursor": context["expense_cursor"]}
+    ),
+    "expenses filtered": lambda client, context: client.get(
+        "/api/v1/expenses/",
+        params={
+            "date_from": LAST_MONTH_FROM,
+            "date_to": LAST_MONTH_TO,
+            "category_id": context["category_id"],
+            "min_amount": "10",
+        },
+    ),
+    "expenses 500 rows": lambda client, context: client.get(
+        "/api/v1/expenses/", params={"limit": 500}
+    ),
+    "expense detail": lambda client, context: client.get(
+        f"/api/v1/expenses/{context['expense_id']}"
+    ),
+    "categories": lambda client, context: client.get("/api/v1/categories/"),
+    "categories not modified": lambda client, context: client.get(
+        "/api/v1/categories/", headers={"If-None-Match": context["categories_etag"]}
+    ),
+    "accounts": lambda client, context: client.get("/api/v1/accounts/"),
+    "account balance": lambda client, context: client.get(
+        f"/api/v1/accounts/{context['account_id']}/balance"
+    ),
+    "total balance": lambda client, context: client.get("/api/v1/accounts/balance"),
+    "income and expense totals": lambda client, context: client.get("/api/v1/balance/"),
+    "search descriptions": lambda client, context: client.get(
+        "/api/v1/transactions/search", params={"q": "row 42"}
+    ),
+    "transfers page": lambda client, context: client.get("/api/v1/transfers/"),
+    "transfer detail": lambda client, context: client.get(
+        f"/api/v1/transfers/{context['transfer_id']}"
+    ),
+    "budgets of month": lambda client, context: client.get(
+        "/api/v1/budgets/",
+        params={"year": context["budget_year"], "month": context["budget_month"]},
+    ),
+    "report by month and category": lambda client, context: client.get(
+        "/api/v1/reports/transactions",
+        params={"bucket": "month", "group_by": "category"},
+    ),
+    "report by day, last month": lambda client, context: client.get(
+        "/api/v1/reports/transactions",
+        params={
+            "bucket": "day",
+            "date_from": LAST_MONTH_FROM[:10],
+            "date_to": LAST_MONTH_TO[:10],
+        },
+    ),
+    "ledger export, last month": lambda client, context: client.get(
+        "/api/v1/exports/ledger",
+        params={
+            "format": "ndjson",
+            "date_from": LAST_MONTH_FROM,
+            "date_to": LAST_MONTH_TO,
+        },
+    ),
+    "expense create": _create_expense,
+    "expense update": _update_expense,
+    "expense delete": _delete_expense,
+}